@@ -1,8 +1,448 @@
+import os
 import sys
+import glob
 import pathlib
 import hashlib
+import shutil
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl  # type: ignore[attr-defined]
+except Exception:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
+
+HASH_SIZE = 32
+CHUNK_SIZE = 1 << 20
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _split(n: int) -> int:
+    """Largest power of two strictly below n (n > 1), as in RFC 6962."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+class MerkleLog:
+    """Append-only RFC 6962 Merkle tree persisted as one file per level.
+
+    `level-00.bin` holds the leaf hashes and `level-KK.bin` the roots of the
+    complete, aligned subtrees of 2**KK leaves, each as fixed 32-byte records.
+    Appending writes one leaf plus at most log2(N) parents; any subtree root,
+    and so any root, inclusion or consistency proof, needs O(log N) reads.
+    """
+
+    def __init__(self, root_dir: pathlib.Path) -> None:
+        self.root_dir = root_dir
+        self._handles: dict = {}
+
+    def __enter__(self) -> "MerkleLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+
+    def _handle(self, level: int):
+        handle = self._handles.get(level)
+        if handle is None:
+            self.root_dir.mkdir(parents=True, exist_ok=True)
+            handle = self._handles[level] = open(self.root_dir / f"level-{level:02d}.bin", "a+b")
+        return handle
+
+    def _count(self, level: int) -> int:
+        path = self.root_dir / f"level-{level:02d}.bin"
+        return path.stat().st_size // HASH_SIZE if path.exists() else 0
+
+    def _read(self, level: int, index: int) -> bytes:
+        handle = self._handle(level)
+        handle.seek(index * HASH_SIZE)
+        node = handle.read(HASH_SIZE)
+        if len(node) != HASH_SIZE:
+            raise IndexError(f"no node {index} at level {level}")
+        return node
+
+    def _write(self, level: int, node: bytes) -> None:
+        handle = self._handle(level)
+        handle.seek(0, os.SEEK_END)
+        handle.write(node)
+        handle.flush()
+
+    @property
+    def size(self) -> int:
+        return self._count(0)
+
+    def repair(self) -> None:
+        """Drop torn records and rebuild parents lost to an interrupted append."""
+        level = 0
+        while True:
+            path = self.root_dir / f"level-{level:02d}.bin"
+            if not path.exists():
+                break
+            handle = self._handle(level)
+            size = handle.seek(0, os.SEEK_END)
+            if size % HASH_SIZE:
+                handle.truncate(size - size % HASH_SIZE)
+            expected = self._count(level) // 2
+            have = self._count(level + 1)
+            if have > expected:
+                self._handle(level + 1).truncate(expected * HASH_SIZE)
+            for j in range(have, expected):
+                self._write(level + 1, node_hash(self._read(level, 2 * j), self._read(level, 2 * j + 1)))
+            if expected == 0:
+                break
+            level += 1
+
+    def append(self, leaf: bytes) -> int:
+        """Add a leaf hash; returns its index."""
+        index = self.size
+        self._write(0, leaf)
+        level, count = 0, index + 1
+        while count % 2 == 0:
+            parent = node_hash(self._read(level, count - 2), self._read(level, count - 1))
+            self._write(level + 1, parent)
+            level += 1
+            count = self._count(level)
+        return index
+
+    def leaf(self, index: int) -> bytes:
+        return self._read(0, index)
+
+    def find(self, leaf: bytes) -> Optional[int]:
+        """Index of the first occurrence of a leaf hash (linear scan of level 0)."""
+        handle = self._handle(0)
+        handle.seek(0)
+        base = 0
+        while True:
+            block = handle.read(HASH_SIZE * 4096)
+            if not block:
+                return None
+            for i in range(0, len(block) - HASH_SIZE + 1, HASH_SIZE):
+                if block[i:i + HASH_SIZE] == leaf:
+                    return base + i // HASH_SIZE
+            base += len(block) // HASH_SIZE
+
+    def subtree(self, start: int, end: int) -> bytes:
+        """MTH(D[start:end]) from stored complete subtrees."""
+        n = end - start
+        if n & (n - 1) == 0 and start % n == 0:
+            return self._read(n.bit_length() - 1, start // n)
+        k = _split(n)
+        return node_hash(self.subtree(start, start + k), self.subtree(start + k, end))
+
+    def root(self, size: Optional[int] = None) -> bytes:
+        size = self.size if size is None else size
+        if size == 0:
+            return hashlib.sha256(b"").digest()
+        return self.subtree(0, size)
+
+    def inclusion_proof(self, index: int, size: Optional[int] = None) -> List[bytes]:
+        size = self.size if size is None else size
+        if not 0 <= index < size <= self.size:
+            raise ValueError(f"leaf {index} is not in a tree of size {size}")
+        return self._path(index, 0, size)
+
+    def _path(self, m: int, start: int, end: int) -> List[bytes]:
+        n = end - start
+        if n == 1:
+            return []
+        k = _split(n)
+        if m < k:
+            return self._path(m, start, start + k) + [self.subtree(start + k, end)]
+        return self._path(m - k, start + k, end) + [self.subtree(start, start + k)]
+
+    def consistency_proof(self, old_size: int, new_size: Optional[int] = None) -> List[bytes]:
+        new_size = self.size if new_size is None else new_size
+        if not 0 < old_size <= new_size <= self.size:
+            raise ValueError(f"no consistency proof from size {old_size} to {new_size}")
+        return self._subproof(old_size, 0, new_size, True)
+
+    def _subproof(self, m: int, start: int, end: int, complete: bool) -> List[bytes]:
+        n = end - start
+        if m == n:
+            return [] if complete else [self.subtree(start, end)]
+        k = _split(n)
+        if m <= k:
+            return self._subproof(m, start, start + k, complete) + [self.subtree(start + k, end)]
+        return self._subproof(m - k, start + k, end, False) + [self.subtree(start, start + k)]
+
+
+def verify_inclusion(leaf: bytes, index: int, size: int, proof: List[bytes], root: bytes) -> bool:
+    """RFC 9162 section 2.1.3.2."""
+    if index >= size:
+        return False
+    fn, sn, r = index, size - 1, leaf
+    for p in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+
+def verify_consistency(old_size: int, new_size: int, old_root: bytes, new_root: bytes, proof: List[bytes]) -> bool:
+    """RFC 9162 section 2.1.4.2."""
+    if old_size == new_size:
+        return not proof and old_root == new_root
+    if old_size == 0 or old_size > new_size or not proof:
+        return False
+    if old_size & (old_size - 1) == 0:
+        proof = [old_root] + list(proof)
+    fn, sn = old_size - 1, new_size - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+    fr = sr = proof[0]
+    for c in proof[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(c, fr)
+            sr = node_hash(c, sr)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            sr = node_hash(sr, c)
+        fn >>= 1
+        sn >>= 1
+    return fr == old_root and sr == new_root and sn == 0
+
+
+class _Locked:
+    """Exclusive lock on the tree while a strike appends to it."""
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.handle = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.handle.close()
+
+
+def _load_index(index_path: pathlib.Path) -> dict:
+    try:
+        return json.loads(index_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _seed_legacy(tree: MerkleLog, index_path: pathlib.Path) -> None:
+    """Carry artifacts from a pre-Merkle index into an empty tree, in their sorted order.
+
+    Their receipts predate leaf indices, so each one is backfilled with the
+    leaf it was given and the root of the seeded tree.
+    """
+    if tree.size:
+        return
+    index = _load_index(index_path)
+    if "tree" in index:
+        return  # already a Merkle index; its leaves live in merkle/
+    legacy = sorted(set(index.get("artifacts", [])))
+    for artifact_hash in legacy:
+        tree.append(leaf_hash(bytes.fromhex(artifact_hash)))
+    if not legacy:
+        return
+    tree_size, merkle_root = tree.size, tree.root().hex()
+    for leaf_index, artifact_hash in enumerate(legacy):
+        receipt_path = index_path.parent / "receipts" / f"{artifact_hash[:16]}.json"
+        receipt = _read_receipt(receipt_path)
+        if receipt.get("artifact_hash") == artifact_hash and "leaf_index" not in receipt:
+            receipt.update(leaf_index=leaf_index, tree_size=tree_size, merkle_root=merkle_root)
+            receipt_path.write_text(json.dumps(receipt, indent=2))
+
+
+def _log_path(index_path: pathlib.Path) -> pathlib.Path:
+    return index_path.with_suffix(".log")
+
+
+def _ensure_log(index_path: pathlib.Path) -> None:
+    """Create the artifact log for a catalog that predates it, once.
+
+    Artifacts with receipts come first in leaf order; any other hash the old
+    JSON index listed follows in sorted order.
+    """
+    log_path = _log_path(index_path)
+    if log_path.exists():
+        return
+    by_leaf = {}
+    for receipt_path in sorted((index_path.parent / "receipts").glob("*.json")):
+        receipt = _read_receipt(receipt_path)
+        if isinstance(receipt.get("leaf_index"), int) and receipt.get("artifact_hash"):
+            by_leaf.setdefault(receipt["leaf_index"], receipt["artifact_hash"])
+    artifacts = list(dict.fromkeys(by_leaf[i] for i in sorted(by_leaf)))
+    seen = set(artifacts)
+    artifacts += sorted(set(_load_index(index_path).get("artifacts", [])) - seen)
+    tmp_path = log_path.with_suffix(".log.tmp")
+    tmp_path.write_text("".join(f"{artifact_hash}\n" for artifact_hash in artifacts))
+    os.replace(tmp_path, log_path)
+
+
+def hash_file(path: pathlib.Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 of a file's raw bytes, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb") as fh:
+        while True:
+            n = fh.readinto(buf)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def _copy_fd(src: int, dst: int, size: int) -> None:
+    """Copy `size` bytes in the kernel where possible: copy_file_range, then sendfile, then read/write."""
+    offset = 0
+    for zero_copy in ("copy_file_range", "sendfile"):
+        fn = getattr(os, zero_copy, None)
+        if fn is None:
+            continue
+        try:
+            while offset < size:
+                if zero_copy == "copy_file_range":
+                    sent = fn(src, dst, size - offset, offset_src=offset)
+                else:
+                    sent = fn(dst, src, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            if offset >= size:
+                return
+        except OSError:
+            pass  # unsupported for this pair of files; try the next method from the same offset
+    os.lseek(src, offset, os.SEEK_SET)
+    os.lseek(dst, offset, os.SEEK_SET)
+    with open(src, "rb", closefd=False) as fin, open(dst, "wb", closefd=False) as fout:
+        shutil.copyfileobj(fin, fout, CHUNK_SIZE)
+
+
+class ContentStore:
+    """Blobs named by the SHA-256 of their bytes, sharded as `ab/cd/<hash>.vmf`.
+
+    A blob that is already present is never rewritten, and new blobs appear
+    atomically via a temporary file renamed into place.
+    """
+
+    def __init__(self, root: pathlib.Path) -> None:
+        self.root = root
+
+    def path(self, digest: str) -> pathlib.Path:
+        return self.root / digest[:2] / digest[2:4] / f"{digest}.vmf"
+
+    def find(self, digest: str) -> Optional[pathlib.Path]:
+        """Stored blob for `digest`, including pre-sharding `<hash16>.vmf` files."""
+        for path in (self.path(digest), self.root / f"{digest[:16]}.vmf"):
+            if path.exists():
+                return path
+        return None
+
+    def put(self, src: pathlib.Path) -> tuple:
+        """Store a file; returns (digest, whether it was newly written)."""
+        digest = hash_file(src)
+        dest = self.path(digest)
+        if dest.exists():
+            return digest, False
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{digest}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            with open(src, "rb") as fin:
+                _copy_fd(fin.fileno(), fd, os.fstat(fin.fileno()).st_size)
+            os.close(fd)
+            fd = -1
+            os.replace(tmp, dest)
+        except BaseException:
+            if fd >= 0:
+                os.close(fd)
+            os.unlink(tmp)
+            raise
+        return digest, True
+
+
+def forge_artifact(ore_path: pathlib.Path, base_path: pathlib.Path) -> tuple:
+    """Archive an ORE in the content store; returns (content hash, newly stored)."""
+    return ContentStore(base_path / "archive").put(ore_path)
+
+
+def _leaf_for(tree: MerkleLog, artifact_hash: str, previous: dict) -> int:
+    """Index of the artifact's leaf, appending it unless it is already in the tree."""
+    leaf = leaf_hash(bytes.fromhex(artifact_hash))
+    if previous.get("artifact_hash") == artifact_hash:
+        leaf_index = previous.get("leaf_index")
+        if not (isinstance(leaf_index, int) and leaf_index < tree.size and tree.leaf(leaf_index) == leaf):
+            leaf_index = tree.find(leaf)  # receipt written before leaf indices were recorded
+        if leaf_index is not None:
+            return leaf_index
+    return tree.append(leaf)
+
+
+def _read_receipt(receipt_path: pathlib.Path) -> dict:
+    try:
+        return json.loads(receipt_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _receipt(artifact_hash: str, ore_path: pathlib.Path, base_path: pathlib.Path, timestamp: Optional[str],
+             leaf_index: int, tree_size: int, merkle_root: str) -> dict:
+    return {
+        "artifact_hash": artifact_hash,
+        "ore_path": str(ore_path.relative_to(base_path.parent)),
+        "timestamp_utc": timestamp or datetime.now(timezone.utc).isoformat(),
+        "signature_simulated": f"signed-by(simulated-key-for-{artifact_hash[:8]})",
+        "leaf_index": leaf_index,
+        "tree_size": tree_size,
+        "merkle_root": merkle_root,
+    }
+
+
+def _write_index(index_path: pathlib.Path, tree_size: int, merkle_root: str) -> None:
+    """Atomic update of the fixed-size index head.
+
+    The tree itself lives in merkle/, and the artifact hashes that used to be
+    listed under "artifacts" are in the append-only `artifact_index.log`, one
+    per line in the order they entered the tree.
+    """
+    index_data = {
+        "tree_size": tree_size,
+        "merkle_root": merkle_root,
+        "tree": "rfc6962-sha256",
+        "artifacts_log": _log_path(index_path).name,
+    }
+    tmp_path = index_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(index_data, indent=2) + "\n")
+    os.replace(tmp_path, index_path)
+
 
 def strike(ore_path: pathlib.Path, base_path: pathlib.Path, timestamp_override: str = None):
     """Forge an ORE into an ARTIFACT, write a RECEIPT, and update the INDEX."""
@@ -11,57 +451,207 @@ def strike(ore_path: pathlib.Path, base_path: pathlib.Path, timestamp_override:
         sys.exit(1)
 
     # 1. Create Artifact
-    content = ore_path.read_text()
-    artifact_hash = hashlib.sha256(content.encode()).hexdigest()
-    artifact_path = base_path / "archive" / f"{artifact_hash[:16]}.vmf"
-    artifact_path.parent.mkdir(exist_ok=True)
-    artifact_path.write_text(content)
-    print(f"🔥 Artifact forged: {artifact_path.relative_to(base_path)}")
-
-    # 2. Create Receipt
+    store = ContentStore(base_path / "archive")
+    artifact_hash, stored = store.put(ore_path)
+    artifact_path = store.path(artifact_hash).relative_to(base_path)
+    print(f"🔥 Artifact forged: {artifact_path}" if stored else f"🔥 Artifact already archived: {artifact_path}")
+
+    # 2. Append to the Merkle log (once per artifact)
     receipt_path = base_path / "receipts" / f"{artifact_hash[:16]}.json"
     receipt_path.parent.mkdir(exist_ok=True)
-    timestamp = timestamp_override or datetime.now(timezone.utc).isoformat()
-    receipt = {
+    index_path = base_path / "artifact_index.json"
+    merkle_dir = base_path / "merkle"
+    with _Locked(merkle_dir / ".lock"), MerkleLog(merkle_dir) as tree:
+        tree.repair()
+        _seed_legacy(tree, index_path)
+        _ensure_log(index_path)
+        size_before = tree.size
+        leaf_index = _leaf_for(tree, artifact_hash, _read_receipt(receipt_path))
+        if leaf_index >= size_before:
+            with open(_log_path(index_path), "a") as log:
+                log.write(f"{artifact_hash}\n")
+        tree_size = tree.size
+        merkle_root = tree.root().hex()
+
+        # 3. Create Receipt (still under the lock, so it and the index describe this tree)
+        receipt = _receipt(artifact_hash, ore_path, base_path, timestamp_override, leaf_index, tree_size, merkle_root)
+        receipt_path.write_text(json.dumps(receipt, indent=2))
+        print(f"🧾 Receipt created: {receipt_path.relative_to(base_path)}")
+
+        # 4. Update Index
+        _write_index(index_path, tree_size, merkle_root)
+    print(f"🔗 Index updated. New Merkle root: {merkle_root[:16]}...")
+
+
+def batch_inputs(spec: str) -> Iterator[pathlib.Path]:
+    """ORE paths for `--batch`: a directory (its files, sorted), a glob, or a manifest of one path per line."""
+    path = pathlib.Path(spec)
+    if path.is_dir():
+        yield from sorted(p for p in path.iterdir() if p.is_file() and not p.name.startswith("."))
+    elif glob.has_magic(spec):
+        yield from (pathlib.Path(p) for p in sorted(glob.glob(spec, recursive=True)) if os.path.isfile(p))
+    else:
+        with open(path) as manifest:
+            for line in manifest:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield path.parent / line
+
+
+def _bounded_map(fn: Callable, items: Iterable, workers: int) -> Iterator:
+    """`map` over a process pool that keeps only a few tasks in flight and yields in input order."""
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _forge_task(job) -> tuple:
+    """(ore_path, artifact_hash, error); a bad input is reported instead of failing the batch."""
+    ore_path, base_path = job
+    try:
+        ore_path.relative_to(base_path.parent)  # receipts record this; check before archiving
+        return ore_path, forge_artifact(ore_path, base_path)[0], None
+    except FileNotFoundError:
+        return ore_path, None, "ORE not found"
+    except (OSError, ValueError) as exc:
+        return ore_path, None, str(exc)
+
+
+def strike_batch(ore_paths: Iterable[pathlib.Path], base_path: pathlib.Path, timestamp_override: str = None,
+                 workers: Optional[int] = None) -> dict:
+    """Strike many OREs in one process; the result matches striking them one by one in order.
+
+    Reading, hashing and archiving run in a process pool; leaves are appended
+    in input order under a single lock, so every receipt records the same
+    leaf index, tree size and root a sequential run would have, and the index
+    head is rewritten once at the end. Inputs that cannot be read are skipped and
+    listed under "skipped", as a sequential run would have refused them; the
+    index always reflects every leaf that was appended.
+    """
+    (base_path / "archive").mkdir(exist_ok=True)
+    (base_path / "receipts").mkdir(exist_ok=True)
+    jobs = ((ore_path, base_path) for ore_path in ore_paths)
+    index_path = base_path / "artifact_index.json"
+    merkle_dir = base_path / "merkle"
+    written: dict = {}
+    skipped: list = []
+    count = 0
+    with _Locked(merkle_dir / ".lock"), MerkleLog(merkle_dir) as tree:
+        tree.repair()
+        _seed_legacy(tree, index_path)
+        _ensure_log(index_path)
+        log = open(_log_path(index_path), "a")
+        try:
+            for ore_path, artifact_hash, error in _bounded_map(_forge_task, jobs, workers or os.cpu_count() or 1):
+                if error:
+                    print(f"✖ {error}: {ore_path}")
+                    skipped.append({"ore_path": str(ore_path), "error": error})
+                    continue
+                receipt_path = base_path / "receipts" / f"{artifact_hash[:16]}.json"
+                previous = written.get(receipt_path)
+                size_before = tree.size
+                leaf_index = _leaf_for(tree, artifact_hash, previous if previous is not None else _read_receipt(receipt_path))
+                if leaf_index >= size_before:
+                    log.write(f"{artifact_hash}\n")
+                receipt = _receipt(artifact_hash, ore_path, base_path, timestamp_override,
+                                   leaf_index, tree.size, tree.root().hex())
+                receipt_path.write_text(json.dumps(receipt, indent=2))
+                written[receipt_path] = receipt
+                count += 1
+        finally:
+            log.close()
+            tree_size = tree.size
+            merkle_root = tree.root().hex()
+            _write_index(index_path, tree_size, merkle_root)
+    return {"forged": count, "artifacts": len(written), "skipped": skipped, "tree_size": tree_size, "merkle_root": merkle_root}
+
+
+def verify(artifact: str, base_path: pathlib.Path) -> dict:
+    """Check one artifact against the current root using its receipt and an inclusion proof."""
+    receipt_path = base_path / "receipts" / f"{artifact[:16]}.json"
+    receipt = json.loads(receipt_path.read_text())
+    artifact_hash = receipt["artifact_hash"]
+    problems = []
+    if not artifact_hash.startswith(artifact):
+        problems.append("receipt is for a different artifact")
+    archived = ContentStore(base_path / "archive").find(artifact_hash)
+    if archived is None or hash_file(archived) != artifact_hash:
+        problems.append("archived artifact missing or altered")
+    with MerkleLog(base_path / "merkle") as tree:
+        size = tree.size
+        root = tree.root()
+        leaf = leaf_hash(bytes.fromhex(artifact_hash))
+        index = receipt.get("leaf_index")
+        if not (isinstance(index, int) and index < size and tree.leaf(index) == leaf):
+            index = tree.find(leaf)
+        proof = tree.inclusion_proof(index, size) if index is not None and index < size else []
+        if index is None or not verify_inclusion(leaf, index, size, proof, root):
+            problems.append("not included in the current Merkle root")
+        if index is not None and receipt.get("tree_size") and receipt["tree_size"] <= size:
+            old_root = bytes.fromhex(receipt["merkle_root"])
+            consistency = tree.consistency_proof(receipt["tree_size"], size)
+            if not verify_consistency(receipt["tree_size"], size, old_root, root, consistency):
+                problems.append("receipt root is not a prefix of the current tree")
+    return {
         "artifact_hash": artifact_hash,
-        "ore_path": str(ore_path.relative_to(base_path.parent)),
-        "timestamp_utc": timestamp,
-        "signature_simulated": f"signed-by(simulated-key-for-{artifact_hash[:8]})"
+        "leaf_index": index,
+        "tree_size": size,
+        "merkle_root": root.hex(),
+        "proof": [p.hex() for p in proof],
+        "ok": not problems,
+        "problems": problems,
     }
-    receipt_path.write_text(json.dumps(receipt, indent=2))
-    print(f"🧾 Receipt created: {receipt_path.relative_to(base_path)}")
 
-    # 3. Update Index (atomic update)
-    index_path = base_path / "artifact_index.json"
-    try:
-        index_data = json.loads(index_path.read_text())
-        artifacts = set(index_data.get("artifacts", []))
-    except (FileNotFoundError, json.JSONDecodeError):
-        index_data = {"artifacts": []}
-        artifacts = set()
-
-    artifacts.add(artifact_hash)
-    sorted_artifacts = sorted(list(artifacts))
-    
-    # Recalculate Merkle root
-    merkle_root = hashlib.sha256("".join(sorted_artifacts).encode()).hexdigest()
-
-    index_data["artifacts"] = sorted_artifacts
-    index_data["merkle_root"] = merkle_root
-    index_path.write_text(json.dumps(index_data, indent=2) + "\n")
-    print(f"🔗 Index updated. New Merkle root: {merkle_root[:16]}...")
+
+def consistency(old_size: int, new_size: Optional[int], base_path: pathlib.Path) -> dict:
+    with MerkleLog(base_path / "merkle") as tree:
+        new_size = tree.size if new_size is None else new_size
+        proof = tree.consistency_proof(old_size, new_size)
+        return {
+            "old_size": old_size,
+            "new_size": new_size,
+            "old_root": tree.root(old_size).hex(),
+            "new_root": tree.root(new_size).hex(),
+            "proof": [p.hex() for p in proof],
+        }
+
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Forge an ORE into a verifiable artifact.")
-    parser.add_argument("ore_file", type=pathlib.Path, help="Path to the ORE file to forge.")
+    parser.add_argument("ore_file", type=pathlib.Path, nargs="?", help="Path to the ORE file to forge.")
+    parser.add_argument("--batch", metavar="DIR|GLOB|MANIFEST", help="Forge many OREs in one run: a directory, a glob, or a file listing one path per line.")
+    parser.add_argument("--workers", type=int, help="Hashing processes for --batch (default: CPU count).")
     parser.add_argument("--ts", dest="timestamp", help="ISO-8601 timestamp to use for the receipt (for deterministic runs).")
+    parser.add_argument("--base-dir", type=pathlib.Path, help="Catalog directory holding archive/, receipts/ and merkle/.")
+    parser.add_argument("--verify", metavar="ARTIFACT_HASH", help="Verify one artifact (full hash or 16-char prefix) and print its inclusion proof.")
+    parser.add_argument("--consistency", metavar="OLD_SIZE", type=int, help="Print a consistency proof from an earlier tree size.")
+    parser.add_argument("--to", dest="new_size", type=int, help="Target tree size for --consistency (default: current).")
     args = parser.parse_args()
 
+    base_dir = args.base_dir or pathlib.Path(__file__).parent.parent
+    if args.verify:
+        result = verify(args.verify, base_dir)
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result["ok"] else 2)
+    if args.consistency is not None:
+        print(json.dumps(consistency(args.consistency, args.new_size, base_dir), indent=2))
+        sys.exit(0)
+    if args.batch:
+        summary = strike_batch(batch_inputs(args.batch), base_dir, timestamp_override=args.timestamp, workers=args.workers)
+        print(f"🔥 Forged {summary['forged']} ORE(s) into {summary['artifacts']} artifact(s)")
+        print(f"🔗 Index updated. New Merkle root: {summary['merkle_root'][:16]}...")
+        sys.exit(1 if summary["skipped"] else 0)
     if not args.ore_file:
         parser.print_help()
         sys.exit(1)
-    
-    script_dir = pathlib.Path(__file__).parent
-    base_dir = script_dir.parent
-    strike(args.ore_file, base_dir, timestamp_override=args.timestamp)
\ No newline at end of file
+
+    strike(args.ore_file, base_dir, timestamp_override=args.timestamp)
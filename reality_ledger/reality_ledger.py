@@ -5,9 +5,12 @@ import json
 import hashlib
 import datetime
 import os
+import queue
+import struct
 import sys
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 
 # Cross-platform file locking helpers (best-effort).
@@ -44,6 +47,7 @@ class RealityLedger:
         self.operations_file = self.ledger_path / "operations.jsonl"
         self.realities_file = self.ledger_path / "realities.json"
         self.consciousness_file = self.ledger_path / "consciousness_profiles.json"
+        self.profiles = ProfileStore(self.ledger_path)
     
     def record_operation(self, operation: RealityOperation) -> None:
         """Record a reality operation in the ledger"""
@@ -111,39 +115,88 @@ class RealityLedger:
         profile_id = self._generate_operation_id()
         timestamp = datetime.datetime.utcnow().isoformat()
         
-        # Load existing profiles
-        profiles = self._load_consciousness_profiles()
-        profiles[profile_id] = {
+        self.profiles.insert(profile_id, {
             "timestamp": timestamp,
             "profile": profile,
             "hash": hashlib.sha256(json.dumps(profile, sort_keys=True).encode()).hexdigest()
-        }
-        
-        # Save profiles
-        with open(self.consciousness_file, "w") as f:
-            json.dump(profiles, f, indent=2)
+        })
         
         return profile_id
     
-    def get_operation_history(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get recent operations from the ledger"""
-        operations = []
-        
-        if not self.operations_file.exists():
-            return operations
-        
-        with open(self.operations_file, "r") as f:
-            lines = f.readlines()
-            
-        for line in lines[-limit:]:
-            try:
-                operation = json.loads(line.strip())
-                operations.append(operation)
-            except json.JSONDecodeError:
-                continue
-        
-        return operations
+    def get_consciousness_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Look up one consciousness profile by id"""
+        return self.profiles.get(profile_id)
+    
+    def find_consciousness_profiles(self, profile_hash: str) -> Dict[str, Any]:
+        """Look up consciousness profiles by content hash"""
+        return self.profiles.find_by_hash(profile_hash)
     
+    def compact_consciousness_profiles(self) -> None:
+        """Rewrite the consciousness_profiles.json snapshot from the append log"""
+        self.profiles.compact()
+    
+    def get_operation_history(
+        self,
+        limit: int = 100,
+        before: Optional[Union[int, str]] = None,
+        after: Optional[Union[int, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get recent operations from the ledger, oldest first.
+
+        Without cursors this returns the last `limit` operations by reading the
+        file backwards from EOF, so its cost does not depend on ledger size.
+        `before`/`after` page relative to a cursor: a byte offset from
+        `iter_operations*` or an operation_id.
+        """
+        if limit <= 0 or not self.operations_file.exists():
+            return []
+        if after is not None:
+            page = []
+            for _, operation in self.iter_operations(after=self._cursor_offset(after)):
+                page.append(operation)
+                if len(page) >= limit:
+                    break
+            return page
+        page = []
+        for _, operation in self.iter_operations_reverse(before=self._cursor_offset(before)):
+            page.append(operation)
+            if len(page) >= limit:
+                break
+        page.reverse()
+        return page
+
+    def iter_operations(self, after: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Stream (offset, operation) pairs oldest first, starting after the line at `after`."""
+        if not self.operations_file.exists():
+            return
+        with open(self.operations_file, "rb") as f:
+            offset = 0
+            if after is not None:
+                f.seek(after)
+                offset = after + len(f.readline())
+            for line in f:
+                start, offset = offset, offset + len(line)
+                operation = _parse_operation(line)
+                if operation is not None:
+                    yield start, operation
+
+    def iter_operations_reverse(self, before: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Stream (offset, operation) pairs newest first, for lines starting before `before`."""
+        if not self.operations_file.exists():
+            return
+        for start, line in _iter_lines_reverse(self.operations_file, end=before):
+            operation = _parse_operation(line)
+            if operation is not None:
+                yield start, operation
+
+    def _cursor_offset(self, cursor: Optional[Union[int, str]]) -> Optional[int]:
+        if cursor is None or isinstance(cursor, int):
+            return cursor
+        for start, operation in self.iter_operations_reverse():
+            if operation.get("operation_id") == cursor:
+                return start
+        raise KeyError(f"unknown operation_id cursor: {cursor}")
+
     def _generate_operation_id(self) -> str:
         """Generate a unique operation ID"""
         timestamp = datetime.datetime.utcnow().isoformat()
@@ -152,11 +205,242 @@ class RealityLedger:
     
     def _load_consciousness_profiles(self) -> Dict[str, Any]:
         """Load existing consciousness profiles"""
-        if not self.consciousness_file.exists():
-            return {}
-        
-        with open(self.consciousness_file, "r") as f:
-            return json.load(f)
+        return dict(self.profiles.iter_all())
+
+def _parse_operation(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(line.strip())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def _iter_lines_reverse(path: Path, end: Optional[int] = None, block_size: int = 64 * 1024) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, line) for non-empty lines ending at or before `end`, last line first.
+
+    The file is read backwards in `block_size` chunks; only the partial line
+    straddling a block boundary is carried between reads.
+    """
+    with path.open("rb") as fh:
+        pos = fh.seek(0, os.SEEK_END)
+        if end is not None:
+            pos = min(pos, end)
+        carry = b""
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            fh.seek(pos)
+            buf = fh.read(size) + carry
+            lines = buf.split(b"\n")
+            cursor = pos + len(buf)
+            for chunk in reversed(lines[1:]):
+                start = cursor - len(chunk)
+                if chunk.strip():
+                    yield start, chunk
+                cursor = start - 1
+            carry = lines[0]
+        if carry.strip():
+            yield 0, carry
+
+
+class ProfileStore:
+    """Append-only consciousness profile store with an id/hash offset index.
+
+    `consciousness_profiles.jsonl` holds one `{"id": ..., **entry}` line per
+    profile and is the source of truth. `consciousness_profiles.idx` mirrors it
+    as `id<TAB>hash<TAB>offset<TAB>length` lines, which are loaded into memory
+    so lookups read a single log line. Inserts take an exclusive lock on the
+    log. `consciousness_profiles.json` is the compacted snapshot in the
+    historic `{id: entry}` layout; an existing snapshot seeds an empty log.
+    """
+
+    def __init__(self, base: Path) -> None:
+        self.log_path = base / "consciousness_profiles.jsonl"
+        self.idx_path = base / "consciousness_profiles.idx"
+        self.snapshot_path = base / "consciousness_profiles.json"
+        self._by_id: Dict[str, Tuple[int, int]] = {}
+        self._by_hash: Dict[str, List[str]] = {}
+        self._idx_read = 0
+        self._covered = 0
+        self._legacy: Optional[Dict[str, Any]] = None
+
+    def _remember(self, profile_id: str, profile_hash: str, offset: int, length: int) -> None:
+        if profile_id not in self._by_id:
+            self._by_hash.setdefault(profile_hash, []).append(profile_id)
+        self._by_id[profile_id] = (offset, length)
+        self._covered = max(self._covered, offset + length)
+
+    def _refresh(self) -> None:
+        """Fold index lines written since the last call (by any process) into memory."""
+        try:
+            with self.idx_path.open("rb") as idx:
+                idx.seek(self._idx_read)
+                for raw in idx:
+                    if not raw.endswith(b"\n"):
+                        break
+                    self._idx_read += len(raw)
+                    profile_id, profile_hash, offset, length = raw.decode("utf-8").rstrip("\n").split("\t")
+                    self._remember(profile_id, profile_hash, int(offset), int(length))
+        except FileNotFoundError:
+            pass
+
+    def _recover(self, log, size: int) -> List[str]:
+        """Index log lines past the covered prefix (lost or never-written index entries)."""
+        lines: List[str] = []
+        log.seek(self._covered)
+        offset = self._covered
+        for raw in iter(log.readline, b""):
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+                lines.append(f"{record['id']}\t{record.get('hash', '')}\t{offset}\t{len(raw)}\n")
+                self._remember(record["id"], record.get("hash", ""), offset, len(raw))
+            except Exception:
+                pass
+            offset += len(raw)
+            log.seek(offset)
+        self._covered = max(self._covered, offset)
+        return lines
+
+    def _seed_from_snapshot(self) -> List[Tuple[str, str, bytes]]:
+        if not self.snapshot_path.exists():
+            return []
+        with self.snapshot_path.open("r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        return [
+            (pid, entry.get("hash", ""), (json.dumps({"id": pid, **entry}) + "\n").encode("utf-8"))
+            for pid, entry in legacy.items()
+        ]
+
+    def _reset_index(self) -> None:
+        self._by_id.clear()
+        self._by_hash.clear()
+        self._idx_read = 0
+        self._covered = 0
+        self.idx_path.unlink(missing_ok=True)
+
+    def _sync_locked(self, log) -> Tuple[int, List[str]]:
+        """With the log lock held: load new index lines and index any uncovered log tail."""
+        self._refresh()
+        size = log.seek(0, os.SEEK_END)
+        if size < self._covered:
+            self._reset_index()  # log was replaced underneath the index
+        elif self.idx_path.exists() and self.idx_path.stat().st_size != self._idx_read:
+            os.truncate(self.idx_path, self._idx_read)  # drop a torn trailing entry
+        return size, self._recover(log, size)
+
+    def _append_index(self, idx_lines: List[str]) -> None:
+        if not idx_lines:
+            return
+        text = "".join(idx_lines)
+        with self.idx_path.open("a", encoding="utf-8") as idx:
+            idx.write(text)
+        self._idx_read += len(text.encode("utf-8"))
+
+    def insert(self, profile_id: str, entry: Dict[str, Any]) -> None:
+        with self.log_path.open("a+b") as log:
+            _lock_file(log)
+            try:
+                size, idx_lines = self._sync_locked(log)
+                pending = self._seed_from_snapshot() if size == 0 else []
+                pending.append((profile_id, entry["hash"], (json.dumps({"id": profile_id, **entry}) + "\n").encode("utf-8")))
+                log.write(b"".join(raw for _, _, raw in pending))
+                log.flush()
+                try:
+                    os.fsync(log.fileno())
+                except Exception:
+                    pass
+
+                offset = size
+                for pid, phash, raw in pending:
+                    idx_lines.append(f"{pid}\t{phash}\t{offset}\t{len(raw)}\n")
+                    self._remember(pid, phash, offset, len(raw))
+                    offset += len(raw)
+                self._append_index(idx_lines)
+            finally:
+                _unlock_file(log)
+
+    def _read(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        loc = self._by_id.get(profile_id)
+        if loc is None:
+            return None
+        with self.log_path.open("rb") as log:
+            log.seek(loc[0])
+            record = json.loads(log.read(loc[1]))
+        record.pop("id", None)
+        return record
+
+    def _ensure_loaded(self) -> None:
+        self._refresh()
+        self._legacy = None
+        if not self.log_path.exists():
+            if self.snapshot_path.exists():
+                # Legacy ledger that has never been written through the store.
+                with self.snapshot_path.open("r", encoding="utf-8") as f:
+                    self._legacy = json.load(f)
+            return
+        if self.log_path.stat().st_size != self._covered:
+            with self.log_path.open("a+b") as log:
+                _lock_file(log)
+                try:
+                    _, idx_lines = self._sync_locked(log)
+                    self._append_index(idx_lines)
+                finally:
+                    _unlock_file(log)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        self._ensure_loaded()
+        if self._legacy is not None:
+            return self._legacy.get(profile_id)
+        return self._read(profile_id)
+
+    def find_by_hash(self, profile_hash: str) -> Dict[str, Any]:
+        self._ensure_loaded()
+        if self._legacy is not None:
+            return {pid: e for pid, e in self._legacy.items() if e.get("hash") == profile_hash}
+        return {pid: self._read(pid) for pid in self._by_hash.get(profile_hash, [])}
+
+    def iter_all(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream every (profile_id, entry) pair in insertion order."""
+        self._ensure_loaded()
+        if self._legacy is not None:
+            yield from self._legacy.items()
+            return
+        if not self.log_path.exists():
+            return
+        with self.log_path.open("rb") as log:
+            yield from self._records(log)
+
+    @staticmethod
+    def _records(log) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        log.seek(0)
+        for raw in log:
+            try:
+                record = json.loads(raw)
+            except Exception:
+                continue
+            yield record.pop("id"), record
+
+    def compact(self) -> None:
+        """Atomically rewrite the `{id: entry}` snapshot from the log."""
+        if not self.log_path.exists():
+            return
+        tmp = self.snapshot_path.with_suffix(".json.tmp")
+        with self.log_path.open("a+b") as log:
+            _lock_file(log)
+            try:
+                # Catch the index up through this handle: iter_all() would
+                # take the log lock again on a second descriptor and block.
+                _, idx_lines = self._sync_locked(log)
+                self._append_index(idx_lines)
+                with tmp.open("w", encoding="utf-8") as out:
+                    json.dump(dict(self._records(log)), out, indent=2)
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(tmp, self.snapshot_path)
+            finally:
+                _unlock_file(log)
+
 
 LEDGER_DIR = Path(__file__).resolve().parent
 
@@ -195,86 +479,466 @@ def index_path(ts: str) -> Path:
     return LEDGER_DIR / f"events-{day}.idx"
 
 
-def cmd_append() -> int:
-    """Append a reality ledger event provided on stdin as JSON."""
-    raw = sys.stdin.read()
+def hash_index_path(ts: str) -> Path:
+    """Return the hashed event_id index path for the given timestamp shard."""
+    day = ts[:10] if ts else datetime.datetime.utcnow().strftime("%Y-%m-%d")
+    return LEDGER_DIR / f"events-{day}.hidx"
+
+
+class ShardIndex:
+    """On-disk open-addressing hash table of event_id -> shard line offset.
+
+    Layout: a 32-byte header (magic, capacity, count, covered) followed by
+    `capacity` 16-byte slots of (fingerprint, offset). Fingerprints are 64-bit
+    BLAKE2b digests; a match is confirmed by reading the one shard line it
+    points at, so lookups cost O(1) seeks regardless of shard size.
+
+    `covered` is the shard byte length the table reflects. Anything past it
+    (a crash between the shard write and the index write, or a deleted
+    index) is recovered by scanning just that tail of the JSONL.
+    """
+
+    MAGIC = b"RLHIDX1\0"
+    HEADER = struct.Struct("<8sQQQ")
+    SLOT = struct.Struct("<QQ")
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, path: Path, handle, capacity: int, count: int, covered: int) -> None:
+        self.path = path
+        self._fh = handle
+        self.capacity = capacity
+        self.count = count
+        self.covered = covered
+        self.dirty = False
+
+    @classmethod
+    def open(cls, path: Path) -> "ShardIndex":
+        if path.exists():
+            handle = path.open("r+b")
+            raw = handle.read(cls.HEADER.size)
+            if len(raw) == cls.HEADER.size:
+                magic, capacity, count, covered = cls.HEADER.unpack(raw)
+                size = os.fstat(handle.fileno()).st_size
+                if magic == cls.MAGIC and capacity and size == cls.HEADER.size + capacity * cls.SLOT.size:
+                    return cls(path, handle, capacity, count, covered)
+            handle.close()
+        return cls.create(path, cls.INITIAL_CAPACITY)
+
+    @classmethod
+    def create(cls, path: Path, capacity: int) -> "ShardIndex":
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("wb") as out:
+            out.write(cls.HEADER.pack(cls.MAGIC, capacity, 0, 0))
+            out.truncate(cls.HEADER.size + capacity * cls.SLOT.size)
+        os.replace(tmp, path)
+        return cls(path, path.open("r+b"), capacity, 0, 0)
+
+    @staticmethod
+    def fingerprint(event_id: str) -> int:
+        digest = hashlib.blake2b(event_id.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def _slot_pos(self, slot: int) -> int:
+        return self.HEADER.size + slot * self.SLOT.size
+
+    def _read_slot(self, slot: int) -> tuple:
+        self._fh.seek(self._slot_pos(slot))
+        return self.SLOT.unpack(self._fh.read(self.SLOT.size))
+
+    def _probe(self, fp: int):
+        """Yield (slot, stored_fp, offset) along fp's probe sequence up to the first empty slot."""
+        slot = fp % self.capacity
+        for _ in range(self.capacity):
+            stored, offset = self._read_slot(slot)
+            yield slot, stored, offset
+            if stored == 0:
+                return
+            slot = (slot + 1) % self.capacity
+
+    def contains(self, event_id: str, shard) -> bool:
+        fp = self.fingerprint(event_id)
+        for _, stored, offset in self._probe(fp):
+            if stored == 0:
+                return False
+            if stored == fp and _event_id_at(shard, offset) == event_id:
+                return True
+        return False
+
+    def add(self, event_id: str, offset: int) -> None:
+        if (self.count + 1) * 10 > self.capacity * 7:
+            self._grow()
+        fp = self.fingerprint(event_id)
+        for slot, stored, _ in self._probe(fp):
+            if stored == 0:
+                self._fh.seek(self._slot_pos(slot))
+                self._fh.write(self.SLOT.pack(fp, offset))
+                self.count += 1
+                self.dirty = True
+                return
+
+    def _grow(self) -> None:
+        self._fh.seek(self.HEADER.size)
+        slots = self._fh.read(self.capacity * self.SLOT.size)
+        capacity = self.capacity * 2
+        table = bytearray(capacity * self.SLOT.size)
+        for stored, offset in self.SLOT.iter_unpack(slots):
+            if stored == 0:
+                continue
+            slot = stored % capacity
+            while self.SLOT.unpack_from(table, slot * self.SLOT.size)[0]:
+                slot = (slot + 1) % capacity
+            self.SLOT.pack_into(table, slot * self.SLOT.size, stored, offset)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("wb") as out:
+            out.write(self.HEADER.pack(self.MAGIC, capacity, self.count, self.covered))
+            out.write(table)
+        self._fh.close()
+        os.replace(tmp, self.path)
+        self._fh = self.path.open("r+b")
+        self.capacity = capacity
+
+    def catch_up(self, shard, shard_size: int) -> None:
+        """Index shard lines past `covered`; rebuild from scratch if the shard shrank."""
+        if self.covered == shard_size:
+            return
+        if self.covered > shard_size:
+            self._fh.close()
+            fresh = self.create(self.path, self.INITIAL_CAPACITY)
+            self._fh, self.capacity, self.count, self.covered = fresh._fh, fresh.capacity, 0, 0
+        shard.seek(self.covered)
+        offset = self.covered
+        for line in iter(shard.readline, b""):
+            if line.endswith(b"\n"):
+                try:
+                    event_id = json.loads(line).get("event_id")
+                except Exception:
+                    event_id = None
+                if event_id and not self.contains(str(event_id), shard):
+                    self.add(str(event_id), offset)
+            offset += len(line)
+            shard.seek(offset)
+        self.covered = shard_size
+        self.dirty = True
+
+    def refresh(self) -> None:
+        """Pick up changes another process made while this handle stayed open."""
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            current = None
+        if current is None or current.st_ino != os.fstat(self._fh.fileno()).st_ino:
+            self._fh.close()
+            fresh = self.open(self.path)
+            self._fh, self.capacity, self.count, self.covered = fresh._fh, fresh.capacity, fresh.count, fresh.covered
+            return
+        self._fh.seek(0)
+        _, self.capacity, self.count, self.covered = self.HEADER.unpack(self._fh.read(self.HEADER.size))
+
+    def sync(self) -> None:
+        """Persist the header and flush the table to disk."""
+        self._fh.seek(0)
+        self._fh.write(self.HEADER.pack(self.MAGIC, self.capacity, self.count, self.covered))
+        self._fh.flush()
+        try:
+            os.fsync(self._fh.fileno())
+        except Exception:
+            pass
+        self.dirty = False
+
+    def close(self) -> None:
+        if self.dirty:
+            self.sync()
+        self._fh.close()
+
+
+def _event_id_at(shard, offset: int) -> Optional[str]:
+    """Read the event_id of the JSONL line starting at `offset`, as the str key the index uses."""
+    shard.seek(offset)
     try:
-        event = json.loads(raw or "{}")
-    except Exception as exc:  # pragma: no cover - defensive guard
-        print(f"[reality_ledger] invalid json: {exc}", file=sys.stderr)
-        return 2
+        event_id = json.loads(shard.readline()).get("event_id")
+    except Exception:
+        return None
+    return None if event_id is None else str(event_id)
+
 
+COMPACT_KEEP = {
+    "event_id",
+    "ts",
+    "keyword",
+    "profile",
+    "provider",
+    "model",
+    "run_level",
+    "input_hash",
+    "output_hash",
+}
+
+
+def prepare_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Stamp `ts` when missing and apply REALITY_LEDGER_COMPACT filtering."""
     ts = event.get("ts") or datetime.datetime.utcnow().isoformat() + "Z"
     event["ts"] = ts
-
     if os.getenv("REALITY_LEDGER_COMPACT") == "1":
-        keep = {
-            "event_id",
-            "ts",
-            "keyword",
-            "profile",
-            "provider",
-            "model",
-            "run_level",
-            "input_hash",
-            "output_hash",
-        }
-        event = {k: v for k, v in event.items() if k in keep}
+        event = {k: v for k, v in event.items() if k in COMPACT_KEEP}
+    return event
+
+
+class ShardWriter:
+    """Append handle and hash index for one day shard, reusable across batches.
 
-    target = events_path(ts)
-    idx = index_path(ts)
-    target.parent.mkdir(parents=True, exist_ok=True)
+    Each `append_batch` call takes the shard lock once, writes every accepted
+    event, and fsyncs once (group commit). Handles stay open between calls, so
+    a resident process skips the open/scan cost; other processes may still
+    append concurrently because every batch re-syncs with the on-disk index.
+    """
 
-    with target.open("a+", encoding="utf-8") as handle:
+    def __init__(self, ts: str) -> None:
+        self.target = events_path(ts)
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.target.open("a+b")
+        self._idx = index_path(ts)
+        self._index = ShardIndex.open(hash_index_path(ts))
+
+    def append_batch(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        handle, index = self._handle, self._index
         _lock_file(handle)
         try:
-            duplicate = False
-            event_id = event.get("event_id")
-            if event_id and idx.exists():
+            index.refresh()
+            size = handle.seek(0, os.SEEK_END)
+            index.catch_up(handle, size)
+
+            lines: List[bytes] = []
+            accepted: List[tuple] = []
+            seen: set = set()
+            offset = size
+            for event in events:
+                event_id = event.get("event_id")
+                key = str(event_id) if event_id else None
+                if key and (key in seen or index.contains(key, handle)):
+                    results.append({"event_id": event_id, "status": "duplicate", "shard": self.target.name})
+                    continue
+                line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+                lines.append(line)
+                if key:
+                    seen.add(key)
+                    accepted.append((key, offset))
+                offset += len(line)
+                results.append({"event_id": event_id, "status": "accepted", "shard": self.target.name})
+
+            if lines:
+                handle.seek(0, os.SEEK_END)
+                handle.write(b"".join(lines))
+                handle.flush()
                 try:
-                    with idx.open("r", encoding="utf-8") as index_handle:
-                        for line in index_handle:
-                            if line.strip() == event_id:
-                                duplicate = True
-                                break
+                    os.fsync(handle.fileno())
                 except Exception:
                     pass
-
-            if not duplicate and event_id:
+                for key, line_offset in accepted:
+                    index.add(key, line_offset)
+                index.covered = offset
+                index.dirty = True
+            if index.dirty:
+                index.sync()
+
+            if accepted:
                 try:
-                    handle.seek(0)
-                    for line in handle:
-                        try:
-                            if json.loads(line).get("event_id") == event_id:
-                                duplicate = True
-                                break
-                        except Exception:
-                            continue
+                    with self._idx.open("a", encoding="utf-8") as index_handle:
+                        index_handle.write("".join(f"{key}\n" for key, _ in accepted))
                 except Exception:
                     pass
+        finally:
+            _unlock_file(handle)
+        return results
+
+    def close(self) -> None:
+        self._index.close()
+        self._handle.close()
+
+
+class AppendService:
+    """Resident appender: keeps recent shard writers open and group-commits.
+
+    Callers on any thread `submit` a list of events and block until the
+    committer thread has written it; everything queued in the meantime is
+    committed together, with one fsync per touched shard.
+    """
+
+    MAX_OPEN_SHARDS = 4
+
+    def __init__(self) -> None:
+        self._writers: Dict[str, ShardWriter] = {}
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def append_many(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Commit `events` now on the calling thread; results keep input order."""
+        by_day: Dict[str, List[int]] = {}
+        prepared = [prepare_event(e) for e in events]
+        for pos, event in enumerate(prepared):
+            by_day.setdefault(event["ts"][:10], []).append(pos)
+        results: List[Dict[str, Any]] = [{} for _ in prepared]
+        for positions in by_day.values():
+            writer = self._writer(prepared[positions[0]]["ts"])
+            for pos, res in zip(positions, writer.append_batch([prepared[p] for p in positions])):
+                results[pos] = res
+        return results
+
+    def submit(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ledger-commit", daemon=True)
+            self._thread.start()
+        done = threading.Event()
+        slot: Dict[str, Any] = {}
+        self._queue.put((events, slot, done))
+        done.wait()
+        if "error" in slot:
+            raise slot["error"]
+        return slot["results"]
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            flat = [event for events, _, _ in batch for event in events]
+            try:
+                results = self.append_many(flat)
+            except Exception as exc:  # pragma: no cover - surfaced to every caller
+                for _, slot, done in batch:
+                    slot["error"] = exc
+                    done.set()
+                continue
+            pos = 0
+            for events, slot, done in batch:
+                slot["results"] = results[pos : pos + len(events)]
+                pos += len(events)
+                done.set()
+
+    def _writer(self, ts: str) -> ShardWriter:
+        day = ts[:10]
+        writer = self._writers.pop(day, None)
+        if writer is None:
+            writer = ShardWriter(ts)
+            if len(self._writers) >= self.MAX_OPEN_SHARDS:
+                oldest = next(iter(self._writers))
+                self._writers.pop(oldest).close()
+        self._writers[day] = writer
+        return writer
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
 
-            if duplicate:
-                print(f"[reality_ledger] duplicate event_id; skipping ({target.name})", file=sys.stderr)
-                return 0
 
-            handle.seek(0, os.SEEK_END)
-            handle.write(json.dumps(event, ensure_ascii=False) + "\n")
-            handle.flush()
-            try:
-                os.fsync(handle.fileno())
-            except Exception:
-                pass
+def cmd_append() -> int:
+    """Append a reality ledger event provided on stdin as JSON."""
+    raw = sys.stdin.read()
+    try:
+        event = json.loads(raw or "{}")
+    except Exception as exc:  # pragma: no cover - defensive guard
+        print(f"[reality_ledger] invalid json: {exc}", file=sys.stderr)
+        return 2
+
+    event = prepare_event(event)
+    writer = ShardWriter(event["ts"])
+    try:
+        result = writer.append_batch([event])[0]
+    finally:
+        writer.close()
+
+    if result["status"] == "duplicate":
+        print(f"[reality_ledger] duplicate event_id; skipping ({writer.target.name})", file=sys.stderr)
+        return 0
+    print(f"[reality_ledger] appended to {writer.target}", file=sys.stderr)
+    return 0
+
+
+def cmd_append_many(batch_size: int = 1000) -> int:
+    """Append NDJSON events from stdin; print one result per input line to stdout."""
+    service = AppendService()
+    status = 0
+    pending: List[Dict[str, Any]] = []
+    slots: List[Optional[Dict[str, Any]]] = []
 
-            if event_id:
+    def flush() -> None:
+        results = iter(service.append_many(pending))
+        for slot in slots:
+            print(json.dumps(slot if slot is not None else next(results), ensure_ascii=False))
+        pending.clear()
+        slots.clear()
+
+    try:
+        for raw in sys.stdin:
+            if not raw.strip():
+                continue
+            try:
+                event = json.loads(raw)
+                if not isinstance(event, dict):
+                    raise ValueError("event must be a JSON object")
+            except Exception as exc:
+                slots.append({"status": "invalid", "error": str(exc)})
+                status = 2
+                continue
+            pending.append(event)
+            slots.append(None)
+            if len(pending) >= batch_size:
+                flush()
+        flush()
+    finally:
+        service.close()
+    return status
+
+
+def cmd_serve(socket_path: Path) -> int:
+    """Serve appends over a Unix socket: one JSON event (or array) per line in, one result line out."""
+    import socketserver
+
+    service = AppendService()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for raw in self.rfile:
+                if not raw.strip():
+                    continue
                 try:
-                    with idx.open("a", encoding="utf-8") as index_handle:
-                        index_handle.write(event_id + "\n")
-                except Exception:
-                    pass
-        finally:
-            _unlock_file(handle)
+                    payload = json.loads(raw)
+                    events = payload if isinstance(payload, list) else [payload]
+                    if not all(isinstance(e, dict) for e in events):
+                        raise ValueError("events must be JSON objects")
+                    results = service.submit(events)
+                    reply: Any = results if isinstance(payload, list) else results[0]
+                except Exception as exc:
+                    reply = {"status": "invalid", "error": str(exc)}
+                self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+    if socket_path.exists():
+        socket_path.unlink()
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+    server.daemon_threads = True
+    try:
+        import signal
 
-    print(f"[reality_ledger] appended to {target}", file=sys.stderr)
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    except Exception:  # pragma: no cover - platform without SIGTERM handling
+        pass
+    print(f"[reality_ledger] serving appends on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
     return 0
 
 
@@ -321,9 +985,14 @@ def main() -> int:
         command = sys.argv[1].lower()
         if command == "append":
             return cmd_append()
+        if command == "append-many":
+            return cmd_append_many()
+        if command == "serve":
+            default_socket = LEDGER_DIR / "append.sock"
+            return cmd_serve(Path(sys.argv[2]) if len(sys.argv) > 2 else default_socket)
         if command in {"demo", "example"}:
             return cmd_demo()
-        print("[reality_ledger] usage: append | demo", file=sys.stderr)
+        print("[reality_ledger] usage: append | append-many | serve [socket] | demo", file=sys.stderr)
         return 1
 
     # Default to demo for backwards compatibility when no subcommand provided
@@ -1,6 +1,6 @@
 #!/usr/bin/env bash
 # Monthly shard rotation for Reality Ledger
-# Archives events-YYYY-MM-*.{jsonl,idx} into reality_ledger/archive/events-YYYY-MM.tgz
+# Archives events-YYYY-MM-*.{jsonl,idx,hidx,qidx} into reality_ledger/archive/events-YYYY-MM.tgz
 # Usage:
 #   bash scripts/ledger-rotate.sh                 # rotate previous month
 #   bash scripts/ledger-rotate.sh --month 2025-09 # rotate specific month
@@ -50,9 +50,11 @@ fi
 
 JSONL_GLOB="$LEDGER_DIR/events-$MONTH-*.jsonl"
 IDX_GLOB="$LEDGER_DIR/events-$MONTH-*.idx"
+HIDX_GLOB="$LEDGER_DIR/events-$MONTH-*.hidx"
+QIDX_GLOB="$LEDGER_DIR/events-$MONTH-*.qidx"
 
 shopt -s nullglob
-files=( $JSONL_GLOB $IDX_GLOB )
+files=( $JSONL_GLOB $IDX_GLOB $HIDX_GLOB $QIDX_GLOB )
 shopt -u nullglob
 
 if [[ ${#files[@]} -eq 0 ]]; then
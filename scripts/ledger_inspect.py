@@ -6,19 +6,39 @@ Usage examples:
   python3 scripts/ledger_inspect.py --day 2025-09-29 --keyword tem-vision --pretty
   python3 scripts/ledger_inspect.py --from 2025-09-01 --to 2025-09-29 --profile @blue --limit 20
   python3 scripts/ledger_inspect.py --day 2025-09-29 --fields ts,keyword,profile,model --ndjson
+  python3 scripts/ledger_inspect.py --from 2025-09-01 --group-by keyword --jobs 8
 
-Filters: day (repeatable), from/to, keyword/profile/provider/model, free-text contains.
+Filters: day (repeatable), from/to, since/until (ts), keyword/profile/provider/model, free-text contains.
 Outputs NDJSON by default; use --pretty for JSON array; --fields to select specific keys.
+
+Each shard gets an `events-DAY.qidx` sidecar on first query: line offsets per
+distinct keyword/profile/provider/model value plus the shard's ts range. It
+is extended incrementally as the shard grows and rebuilt if the shard was
+rewritten; --no-index forces a plain scan.
+
+--jobs N scans shards in a process pool while still emitting results in date
+order, and stops every worker once --limit is reached. --count/--group-by
+aggregate inside the workers without materialising events.
 """
 
 import argparse
+import hashlib
 import json
+import multiprocessing
+import os
 import sys
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Dict, Any
+from typing import Iterable, Iterator, List, Dict, Any, Optional
 
 LEDGER_DIR = Path(__file__).resolve().parent.parent / "reality_ledger"
+INDEX_VERSION = 2
+INDEXED_FIELDS = ("keyword", "profile", "provider", "model")
+TAIL_BYTES = 64
 
 
 def parse_args() -> argparse.Namespace:
@@ -32,11 +52,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--provider", help="substring match in provider")
     parser.add_argument("--model", help="substring match in model")
     parser.add_argument("--contains", help="substring match anywhere in raw line")
+    parser.add_argument("--since", help="only events with ts >= this ISO timestamp")
+    parser.add_argument("--until", help="only events with ts <= this ISO timestamp")
+    parser.add_argument("--no-index", action="store_true", help="scan shards without the .qidx sidecar index")
     parser.add_argument("--limit", type=int, default=0, help="limit number of results")
     parser.add_argument("--fields", help="comma-separated list of fields to print")
+    parser.add_argument("--jobs", type=int, default=1, help="scan shards in N worker processes")
     out = parser.add_mutually_exclusive_group()
     out.add_argument("--pretty", action="store_true", help="Pretty JSON array output")
     out.add_argument("--ndjson", action="store_true", help="Force NDJSON output (default)")
+    out.add_argument("--count", action="store_true", help="Print only the number of matching events")
+    out.add_argument("--group-by", dest="group_by", help="Print match counts per value of this field")
     return parser.parse_args()
 
 
@@ -65,6 +91,268 @@ def select_fields(obj: Dict[str, Any], fields: List[str] | None) -> Dict[str, An
     return {name: obj.get(name) for name in fields}
 
 
+def field_text(value: Any) -> str:
+    """Text a field filter matches against: strings as-is, other values as JSON, missing as ""."""
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def index_path(shard: Path) -> Path:
+    return shard.with_suffix(".qidx")
+
+
+def _tail_digest(handle, size: int) -> str:
+    start = max(0, size - TAIL_BYTES)
+    handle.seek(start)
+    return hashlib.sha256(handle.read(size - start)).hexdigest()
+
+
+def _empty_index() -> Dict[str, Any]:
+    return {"version": INDEX_VERSION, "size": 0, "tail": "", "ts": [None, None], "fields": {f: {} for f in INDEXED_FIELDS}}
+
+
+def _index_lines(handle, index: Dict[str, Any], start: int, end: int) -> None:
+    """Fold shard lines in [start, end) into `index`; a trailing partial line is left for later."""
+    handle.seek(start)
+    offset = start
+    ts_range = index["ts"]
+    while offset < end:
+        line = handle.readline()
+        if not line or not line.endswith(b"\n"):
+            break
+        try:
+            obj = json.loads(line)
+        except Exception:
+            obj = None
+        if isinstance(obj, dict):
+            for name in INDEXED_FIELDS:
+                value = field_text(obj.get(name))
+                if value:
+                    index["fields"][name].setdefault(value, []).append(offset)
+            ts = obj.get("ts")
+            if isinstance(ts, str):
+                ts_range[0] = ts if ts_range[0] is None or ts < ts_range[0] else ts_range[0]
+                ts_range[1] = ts if ts_range[1] is None or ts > ts_range[1] else ts_range[1]
+        offset += len(line)
+    index["size"] = offset
+
+
+def load_index(shard: Path) -> Optional[Dict[str, Any]]:
+    """Return an up-to-date index for `shard`, building or extending it as needed.
+
+    The sidecar is valid while the shard only grows: its recorded size must not
+    exceed the file and the bytes just before that size must still match.
+    Otherwise it is rebuilt. Returns None if the shard cannot be read.
+    """
+    path = index_path(shard)
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+        if index.get("version") != INDEX_VERSION:
+            index = None
+    except Exception:
+        index = None
+
+    try:
+        with shard.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if index is not None:
+                covered = index.get("size", 0)
+                if covered > size or _tail_digest(handle, covered) != index.get("tail"):
+                    index = None
+            if index is not None and index["size"] == size:
+                return index
+            index = index or _empty_index()
+            _index_lines(handle, index, index["size"], size)
+            index["tail"] = _tail_digest(handle, index["size"])
+    except OSError:
+        return None
+
+    try:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    except OSError:
+        return index  # read-only ledger: the in-memory index still serves this query
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            out.write(json.dumps(index, separators=(",", ":")))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+    return index
+
+
+def candidate_offsets(index: Dict[str, Any], args: argparse.Namespace) -> Optional[List[int]]:
+    """Offsets that can satisfy the field filters, or None when no field filter is set."""
+    result: Optional[set] = None
+    for name in INDEXED_FIELDS:
+        needle = getattr(args, name)
+        if not needle:
+            continue
+        hits: set = set()
+        for value, offsets in index["fields"].get(name, {}).items():
+            if needle in value:
+                hits.update(offsets)
+        result = hits if result is None else result & hits
+        if not result:
+            return []
+    return None if result is None else sorted(result)
+
+
+def ts_overlaps(index: Dict[str, Any], args: argparse.Namespace) -> bool:
+    lo, hi = index.get("ts") or (None, None)
+    if lo is None:
+        return not (args.since or args.until)
+    if args.since and hi < args.since:
+        return False
+    if args.until and lo > args.until:
+        return False
+    return True
+
+
+def matches(line: str, obj: Dict[str, Any], args: argparse.Namespace) -> bool:
+    if args.contains and args.contains not in line:
+        return False
+    for name in INDEXED_FIELDS:
+        needle = getattr(args, name)
+        if needle and needle not in field_text(obj.get(name)):
+            return False
+    if args.since or args.until:
+        ts = obj.get("ts")
+        if not isinstance(ts, str):
+            return False
+        if args.since and ts < args.since:
+            return False
+        if args.until and ts > args.until:
+            return False
+    return True
+
+
+def _scan_lines(handle) -> Iterator[str]:
+    for raw in handle:
+        yield raw.decode("utf-8", errors="replace").rstrip("\n")
+
+
+def _seek_lines(handle, offsets: Iterable[int]) -> Iterator[str]:
+    for offset in offsets:
+        handle.seek(offset)
+        yield handle.readline().decode("utf-8", errors="replace").rstrip("\n")
+
+
+def iter_matches(shard: Path, args: argparse.Namespace) -> Iterator[Dict[str, Any]]:
+    """Yield matching events from one shard, via its index unless disabled or unusable."""
+    offsets: Optional[List[int]] = None
+    if not args.no_index:
+        index = load_index(shard)
+        if index is not None:
+            if not ts_overlaps(index, args):
+                return
+            offsets = candidate_offsets(index, args)
+            if offsets == []:
+                return
+
+    with shard.open("rb") as handle:
+        lines = _scan_lines(handle) if offsets is None else _seek_lines(handle, offsets)
+        for line in lines:
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(obj, dict) and matches(line, obj, args):
+                yield obj
+
+
+_stop = None
+
+
+def _init_worker(stop) -> None:
+    global _stop
+    _stop = stop
+
+
+def _stopped() -> bool:
+    return _stop is not None and _stop.is_set()
+
+
+def render_rows(shard: Path, args: argparse.Namespace, fields: List[str]) -> Iterator[str]:
+    """Serialised output rows for one shard, in the active output format."""
+    indent = 2 if args.pretty else None
+    for obj in iter_matches(shard, args):
+        if _stopped():
+            return
+        yield json.dumps(select_fields(obj, fields), ensure_ascii=False, indent=indent)
+
+
+def group_key(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def aggregate(shard: Path, args: argparse.Namespace) -> Counter:
+    counts: Counter = Counter()
+    for obj in iter_matches(shard, args):
+        if _stopped():
+            break
+        counts[group_key(obj.get(args.group_by)) if args.group_by else ""] += 1
+    return counts
+
+
+def _shard_task(shard: Path, args: argparse.Namespace, fields: List[str]):
+    if args.count or args.group_by:
+        return aggregate(shard, args)
+    return list(islice(render_rows(shard, args, fields), args.limit or None))
+
+
+def shard_results(shards: List[Path], args: argparse.Namespace, fields: List[str]) -> Iterator[Any]:
+    """Per-shard results in shard (date) order.
+
+    With --jobs > 1 shards are scanned by a process pool with a bounded window
+    of work in flight; the ordered deque of futures acts as the reorder
+    buffer. Closing the generator (e.g. when --limit is hit) signals running
+    workers to stop and drops everything still queued.
+    """
+    if args.jobs <= 1 or len(shards) <= 1:
+        for shard in shards:
+            if args.count or args.group_by:
+                yield aggregate(shard, args)
+            else:
+                yield render_rows(shard, args, fields)
+        return
+
+    stop = multiprocessing.Event()
+    pool = ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker, initargs=(stop,))
+    window: deque = deque()
+    todo = iter(shards)
+    try:
+        for shard in islice(todo, args.jobs * 2):
+            window.append(pool.submit(_shard_task, shard, args, fields))
+        while window:
+            result = window.popleft().result()
+            for shard in islice(todo, 1):
+                window.append(pool.submit(_shard_task, shard, args, fields))
+            yield result
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class PrettyArrayWriter:
+    """Stream a JSON array byte-identical to json.dumps(items, indent=2)."""
+
+    def __init__(self, out) -> None:
+        self.out = out
+        self.count = 0
+
+    def write(self, item_json: str) -> None:
+        self.out.write("[\n  " if self.count == 0 else ",\n  ")
+        self.out.write(item_json.replace("\n", "\n  "))
+        self.count += 1
+
+    def close(self) -> None:
+        self.out.write("[]\n" if self.count == 0 else "\n]\n")
+
+
 def main() -> int:
     args = parse_args()
     root = Path(args.dir)
@@ -79,43 +367,36 @@ def main() -> int:
 
     fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else []
 
-    results = []
-    printed = 0
+    if args.count or args.group_by:
+        total: Counter = Counter()
+        for counts in shard_results(shards, args, fields):
+            total.update(counts)
+        if args.count:
+            print(json.dumps({"count": sum(total.values())}))
+        else:
+            ordered = dict(sorted(total.items(), key=lambda kv: (-kv[1], kv[0])))
+            print(json.dumps(ordered, ensure_ascii=False, indent=2))
+        return 0
 
-    for shard in shards:
-        with shard.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.rstrip("\n")
-                if args.contains and args.contains not in line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                except Exception:
-                    continue
-                if args.keyword and (args.keyword not in (obj.get("keyword") or "")):
-                    continue
-                if args.profile and (args.profile not in (obj.get("profile") or "")):
-                    continue
-                if args.provider and (args.provider not in (obj.get("provider") or "")):
-                    continue
-                if args.model and (args.model not in (obj.get("model") or "")):
-                    continue
-
-                payload = select_fields(obj, fields)
-                if args.pretty:
-                    results.append(payload)
+    writer = PrettyArrayWriter(sys.stdout) if args.pretty else None
+    printed = 0
+    results = shard_results(shards, args, fields)
+    try:
+        for rows in results:
+            for row in rows:
+                if writer is not None:
+                    writer.write(row)
                 else:
-                    print(json.dumps(payload, ensure_ascii=False))
-                    printed += 1
-                    if args.limit and printed >= args.limit:
-                        break
-            if not args.pretty and args.limit and printed >= args.limit:
+                    print(row)
+                printed += 1
+                if args.limit and printed >= args.limit:
+                    break
+            if args.limit and printed >= args.limit:
                 break
-
-    if args.pretty:
-        if args.limit:
-            results = results[: args.limit]
-        print(json.dumps(results, ensure_ascii=False, indent=2))
+    finally:
+        results.close()
+        if writer is not None:
+            writer.close()
 
     return 0
 
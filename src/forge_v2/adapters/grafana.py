@@ -1,18 +1,69 @@
+import asyncio
 import json
 import os
 import time
-import httpx
+import weakref
+from typing import List, Optional, Tuple
+from ..http_clients import clients
+
+WINDOW_S = int(os.environ.get("GRAFANA_ANNOTATE_WINDOW_MS", "50")) / 1000
+
+async def _post(url: str, key: str, text: str) -> dict:
+    payload = {"text": text, "time": int(time.time() * 1000)}
+    response = await clients.request(
+        "grafana",
+        "POST",
+        f"{url}/api/annotations",
+        headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
+        content=json.dumps(payload),
+    )
+    return {"ok": response.is_success, "status": response.status_code, "resp": response.text}
+
+class AnnotationBatcher:
+    """Coalesce annotations issued within `window` seconds into one request.
+
+    Distinct texts are joined with newlines (duplicates collapse); every caller
+    gets the shared response plus `batched`, the number of calls it covered.
+    """
+
+    def __init__(self, window: float = WINDOW_S) -> None:
+        self.window = window
+        self._pending: List[Tuple[str, str, str, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def annotate(self, url: str, key: str, text: str) -> dict:
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((url, key, text, fut))
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush())
+        return await fut
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self.window)
+        batch, self._pending, self._flusher = self._pending, [], None
+        groups: dict = {}
+        for url, key, text, fut in batch:
+            groups.setdefault((url, key), []).append((text, fut))
+        for (url, key), items in groups.items():
+            text = "\n".join(dict.fromkeys(t for t, _ in items))
+            try:
+                result = await _post(url, key, text)
+            except Exception as exc:  # noqa: BLE001
+                result = {"ok": False, "error": str(exc)}
+            result["batched"] = len(items)
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_result(dict(result))
+
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AnnotationBatcher]" = weakref.WeakKeyDictionary()
 
 async def annotate(text: str) -> dict:
     url = os.environ.get("GRAFANA_URL")
     key = os.environ.get("GRAFANA_API_KEY")
     if not url or not key:
         return {"ok": False, "error": "GRAFANA_URL/API_KEY missing"}
-    payload = {"text": text, "time": int(time.time() * 1000)}
-    async with httpx.AsyncClient(timeout=5) as client:
-        response = await client.post(
-            f"{url}/api/annotations",
-            headers={"Authorization": f"Bearer {key}"},
-            content=json.dumps(payload),
-        )
-    return {"ok": response.is_success, "status": response.status_code, "resp": response.text}
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _batchers[loop] = AnnotationBatcher()
+    return await batcher.annotate(url, key, text)
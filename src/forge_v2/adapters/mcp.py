@@ -1,14 +1,140 @@
+"""MCP ping over a persistent JSON-RPC connection (stdio, unix or tcp)."""
+
+from __future__ import annotations
 import asyncio
+import itertools
 import json
+import os
+import shlex
 import time
+import weakref
 from pathlib import Path
+from typing import Any, Dict, Optional
+from ..receipts import get_sink
 
 LEDGER_LOCAL = Path("reality_ledger/mcp")
-LEDGER_LOCAL.mkdir(parents=True, exist_ok=True)
-
-async def ping() -> dict:
-    payload = {"type": "mcp.ping", "ts": time.time(), "input": {}, "output": {"pong": True}}
-    fname = LEDGER_LOCAL / f"{int(time.time() * 1000)}_mcp.ping.json"
-    fname.write_text(json.dumps(payload, indent=2))
-    await asyncio.sleep(0.2)
-    return {"ok": True, "path": str(fname)}
+
+class McpClient:
+    """Newline-delimited JSON-RPC 2.0 client, as in the MCP stdio transport.
+
+    `endpoint` is `stdio:<command>`, `unix:<path>` or `tcp:<host>:<port>`.
+    The connection opens on first use and is reused until it breaks.
+    """
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Any = None
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._recv: Optional[asyncio.Task] = None
+        self._connecting = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        scheme, _, target = self.endpoint.partition(":")
+        if scheme == "stdio":
+            argv = shlex.split(target)
+            self._proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            self._reader, self._writer = self._proc.stdout, self._proc.stdin
+        elif scheme == "unix":
+            self._reader, self._writer = await asyncio.open_unix_connection(target)
+        elif scheme == "tcp":
+            host, _, port = target.rpartition(":")
+            self._reader, self._writer = await asyncio.open_connection(host, int(port))
+        else:
+            raise ValueError(f"unsupported MCP endpoint '{self.endpoint}'")
+        self._recv = asyncio.create_task(self._receive(self._reader))
+
+    async def _receive(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                fut = self._pending.pop(msg.get("id"), None) if isinstance(msg, dict) else None
+                if fut is not None and not fut.done():
+                    fut.set_result(msg)
+        finally:
+            self._fail_pending(ConnectionError("MCP connection closed"))
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def request(self, method: str, params: Dict[str, Any] | None = None, timeout: float = 5.0) -> Dict[str, Any]:
+        async with self._connecting:
+            if self._recv is None or self._recv.done():
+                await self.close()
+                await self._connect()
+        msg_id = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = fut
+        msg: Dict[str, Any] = {"jsonrpc": "2.0", "id": msg_id, "method": method}
+        if params is not None:
+            msg["params"] = params
+        try:
+            self._writer.write((json.dumps(msg) + "\n").encode())
+            await self._writer.drain()
+            return await asyncio.wait_for(fut, timeout)
+        finally:
+            self._pending.pop(msg_id, None)
+
+    async def close(self) -> None:
+        recv, self._recv = self._recv, None
+        writer, self._writer = self._writer, None
+        proc, self._proc = self._proc, None
+        if recv is not None:
+            recv.cancel()
+        if writer is not None:
+            writer.close()
+            if hasattr(writer, "wait_closed"):
+                try:
+                    await writer.wait_closed()
+                except (ConnectionError, BrokenPipeError):
+                    pass
+        if proc is not None and proc.returncode is None:
+            proc.terminate()
+            await proc.wait()
+        self._fail_pending(ConnectionError("MCP connection closed"))
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, McpClient]" = weakref.WeakKeyDictionary()
+
+def _client(endpoint: str) -> McpClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.endpoint != endpoint:
+        client = _clients[loop] = McpClient(endpoint)
+    return client
+
+async def close() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+async def ping(timeout: float | None = None) -> dict:
+    endpoint = os.environ.get("MCP_ENDPOINT")
+    if not endpoint:
+        return {"ok": True, "skipped": "MCP_ENDPOINT not set"}
+    timeout = timeout or float(os.environ.get("MCP_PING_TIMEOUT", "5"))
+    start = time.perf_counter()
+    try:
+        resp = await _client(endpoint).request("ping", timeout=timeout)
+        ok, error = "error" not in resp, resp.get("error")
+    except (OSError, ValueError, asyncio.TimeoutError) as exc:
+        ok, error = False, str(exc) or type(exc).__name__
+    rtt_ms = round((time.perf_counter() - start) * 1000, 3)
+    output: Dict[str, Any] = {"pong": ok, "rtt_ms": rtt_ms}
+    if error:
+        output["error"] = error
+    payload = {"type": "mcp.ping", "ts": time.time(), "input": {"endpoint": endpoint}, "output": output}
+    ref = await get_sink(LEDGER_LOCAL).write(payload, domain="mcp.ping")
+    return {"ok": ok, "rtt_ms": rtt_ms, "path": ref, **({"error": error} if error else {})}
@@ -1,8 +1,11 @@
-import subprocess
+from ..utils.process import run_process
 
-async def selftest() -> dict:
+async def selftest(timeout: float | None = None) -> dict:
     try:
-        out = subprocess.run(["bash", "scripts/self_test.sh"], capture_output=True, text=True)
-        return {"ok": out.returncode == 0, "stdout": out.stdout, "stderr": out.stderr}
+        out = await run_process(["bash", "scripts/self_test.sh"], timeout=timeout)
+        result = {"ok": out.ok, "stdout": out.stdout, "stderr": out.stderr}
+        if out.timed_out:
+            result["error"] = f"timed out after {timeout}s"
+        return result
     except FileNotFoundError:
         return {"ok": True, "stdout": "self_test.sh not found (skipping)", "stderr": ""}
@@ -1,15 +1,14 @@
-import asyncio
-import subprocess
+from ..utils.process import run_process
 
-async def rollup() -> dict:
+async def rollup(timeout: float | None = None) -> dict:
     try:
-        out = subprocess.run(
+        out = await run_process(
             ["vaultmesh", "receipts", "rollup", "--date", "today", "--all-domains"],
-            capture_output=True,
-            text=True,
+            timeout=timeout,
         )
-        ok = out.returncode == 0
-        return {"ok": ok, "stdout": out.stdout, "stderr": out.stderr}
+        result = {"ok": out.ok, "stdout": out.stdout, "stderr": out.stderr}
+        if out.timed_out:
+            result["error"] = f"timed out after {timeout}s"
+        return result
     except FileNotFoundError:
-        await asyncio.sleep(0.1)
         return {"ok": False, "stderr": "vaultmesh CLI not found"}
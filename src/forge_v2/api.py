@@ -1,34 +1,135 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import List, Optional, Sequence
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.responses import PlainTextResponse
 from sse_starlette.sse import EventSourceResponse
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from .orchestrator import run_ritual
+from .orchestrator import plans, run_ritual, run_ritual_shared, shutdown
+from .jobs import JobQueue
 from .bus import bus
+from .config import get_settings
+from .metrics import mark_process_dead, render
+from .relay import BusHub
 
-app = FastAPI(title="Forge v2", version="0.1.0")
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    settings = get_settings()
+    if settings.bus_socket is not None:
+        await bus.attach(settings.bus_socket)
+    watcher = asyncio.create_task(plans.watch()) if settings.watch_forgefile else None
+    jobs.start()
+    try:
+        yield
+    finally:
+        await jobs.stop()
+        if watcher is not None:
+            watcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await watcher
+        await shutdown()
+        await bus.detach()
+        mark_process_dead()
+
+jobs = JobQueue(run_ritual, bus=bus)
+
+app = FastAPI(title="Forge v2", version="0.1.0", lifespan=lifespan)
 
 @app.get("/healthz")
 async def healthz() -> dict[str, bool]:
     return {"ok": True}
 
 @app.post("/api/forge/run")
-async def api_run(body: dict) -> dict:
+async def api_run(
+    body: dict,
+    response: Response,
+    run_async: bool = Query(False, alias="async", description="Queue the run and return its id immediately."),
+    priority: int = Query(0, description="Queue priority for async runs; lower runs first."),
+) -> dict:
     name = body.get("name")
     if not name:
         raise HTTPException(400, "Missing ritual name")
-    return await run_ritual(name)
+    if not run_async:
+        return await run_ritual_shared(name)
+    if name not in plans.get().rituals:
+        raise HTTPException(404, f"Ritual '{name}' not found")
+    try:
+        job = jobs.submit(name, priority)
+    except asyncio.QueueFull:
+        raise HTTPException(429, "Run queue is full", headers={"Retry-After": "1"})
+    await jobs.flush()  # other workers know the id before the client can ask them
+    response.status_code = 202
+    return job.view()
+
+@app.get("/api/forge/runs/{run_id}")
+async def api_run_status(run_id: str) -> dict:
+    view = jobs.view(run_id)
+    if view is None:
+        raise HTTPException(404, "Unknown run id")
+    return view
+
+@app.delete("/api/forge/runs/{run_id}")
+async def api_run_cancel(run_id: str) -> dict:
+    view = await jobs.request_cancel(run_id)
+    if view is None:
+        raise HTTPException(404, "Unknown run id")
+    return view
+
+@app.post("/api/forge/admin/reload")
+async def api_reload() -> dict:
+    try:
+        plan = plans.reload()
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(422, f"Forgefile invalid: {exc}")
+    return {"ok": True, "digest": plan.digest, "rituals": sorted(plan.rituals), "unknown": plan.unknown}
 
 @app.get("/api/forge/events")
-async def api_events() -> EventSourceResponse:
+async def api_events(
+    ritual: Optional[List[str]] = Query(None, description="Only stream events for these rituals."),
+    run: Optional[List[str]] = Query(None, description="Only stream events for these run ids."),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> EventSourceResponse:
+    try:
+        resume = int(last_event_id) if last_event_id else None
+    except ValueError:
+        raise HTTPException(400, "Last-Event-ID must be an integer")
+
     async def gen():
-        async for msg in bus.stream():
+        async for msg in bus.stream(topics=ritual, last_event_id=resume, runs=run):
             yield msg
     return EventSourceResponse(gen())
 
 @app.get("/metrics")
 async def metrics() -> PlainTextResponse:
-    return PlainTextResponse(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    body, content_type = render()
+    return PlainTextResponse(body, media_type=content_type)
 
-def main() -> None:
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Serve the API; with `--workers N` also host the event hub and multiprocess metrics."""
+    import argparse
+    import shutil
+    import tempfile
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8787)
+
+    parser = argparse.ArgumentParser(prog="forge-api")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("FORGE_API_WORKERS", "1")))
+    args = parser.parse_args(argv)
+    if args.workers <= 1:
+        uvicorn.run(app, host=args.host, port=args.port)
+        return
+
+    # Workers are fresh interpreters: everything they share goes through env.
+    run_dir = Path(tempfile.mkdtemp(prefix="forge-api-"))
+    prom_dir = Path(os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", str(run_dir / "metrics")))
+    prom_dir.mkdir(parents=True, exist_ok=True)
+    for stale in prom_dir.glob("*.db"):
+        stale.unlink()
+    hub = BusHub(Path(os.environ.setdefault("FORGE_BUS_SOCKET", str(run_dir / "bus.sock")))).start()
+    try:
+        uvicorn.run("forge_v2.api:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        hub.close()
+        shutil.rmtree(run_dir, ignore_errors=True)
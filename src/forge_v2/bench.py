@@ -0,0 +1,288 @@
+"""Benchmarks for the orchestrator, receipts and ledger hot paths.
+
+    forge-bench --output bench.json
+    forge-bench --baseline bench.json --threshold 0.2   # exit 1 on regression
+
+Every benchmark reports one number plus whether higher or lower is better,
+so two result files from different commits can be compared directly. The
+ledger benchmarks need the repository checkout (`--repo`, default: cwd).
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+Result = Dict[str, Any]
+BenchFn = Callable[[argparse.Namespace], Dict[str, Result]]
+
+BENCHES: Dict[str, BenchFn] = {}
+
+def bench(name: str):
+    def deco(fn: BenchFn) -> BenchFn:
+        BENCHES[name] = fn
+        return fn
+    return deco
+
+def rate(count: int, seconds: float, unit: str) -> Result:
+    return {"value": count / seconds if seconds > 0 else float("inf"), "unit": unit, "better": "higher"}
+
+@contextlib.contextmanager
+def scratch_dir() -> Iterator[Path]:
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="forge-bench-") as tmp:
+        os.chdir(tmp)
+        try:
+            yield Path(tmp)
+        finally:
+            os.chdir(cwd)
+
+@bench("ritual")
+def bench_ritual(args: argparse.Namespace) -> Dict[str, Result]:
+    """run_ritual throughput: three parallel stub steps joined by a fourth."""
+    import yaml
+    from . import orchestrator
+    from .plan import PlanCache
+    from .receipts import get_sink
+
+    async def stub(opts: Dict[str, Any]) -> Dict[str, Any]:
+        await asyncio.sleep(0)
+        return {"ok": True}
+
+    runs = 20 if args.quick else 200
+    registry = {"stub": stub}
+    with scratch_dir() as tmp:
+        forgefile = tmp / "Forgefile.yaml"
+        forgefile.write_text(yaml.safe_dump({"rituals": {"bench": {"steps": [
+            {"call": "stub", "id": "a"},
+            {"call": "stub", "id": "b", "parallel": True},
+            {"call": "stub", "id": "c", "parallel": True},
+            {"call": "stub", "id": "join", "needs": ["a", "b", "c"]},
+        ]}}}))
+        saved = orchestrator.REGISTRY, orchestrator.plans
+        orchestrator.REGISTRY, orchestrator.plans = registry, PlanCache(registry, forgefile)
+
+        async def main() -> float:
+            await orchestrator.run_ritual("bench")  # warm-up: plan compile, sink thread
+            start = time.perf_counter()
+            for _ in range(runs):
+                await orchestrator.run_ritual("bench")
+            return time.perf_counter() - start
+
+        try:
+            elapsed = asyncio.run(main())
+        finally:
+            orchestrator.REGISTRY, orchestrator.plans = saved
+            get_sink().close()
+    return {"ritual.throughput": rate(runs, elapsed, "rituals/s")}
+
+@bench("receipts")
+def bench_receipts(args: argparse.Namespace) -> Dict[str, Result]:
+    """Legacy one-file-per-receipt writes versus the batched segment sink."""
+    from .receipts import ReceiptSink, write_receipt
+
+    count = 200 if args.quick else 2000
+    payload = {"type": "forge.step", "ritual": "bench", "step": "stub", "ok": True, "data": {"n": 1}, "hash": None}
+    out: Dict[str, Result] = {}
+    with scratch_dir() as tmp:
+        start = time.perf_counter()
+        for _ in range(count):
+            write_receipt(dict(payload), root=tmp / "files")
+        out["receipts.write_receipt"] = rate(count, time.perf_counter() - start, "receipts/s")
+
+        sink = ReceiptSink(tmp / "segment", mode="segment")
+
+        async def main() -> float:
+            start = time.perf_counter()
+            await asyncio.gather(*(sink.write(dict(payload)) for _ in range(count)))
+            return time.perf_counter() - start
+
+        try:
+            out["receipts.segment_sink"] = rate(count, asyncio.run(main()), "receipts/s")
+        finally:
+            sink.close()
+    return out
+
+def _load_ledger(repo: Path):
+    path = repo / "reality_ledger" / "reality_ledger.py"
+    spec = importlib.util.spec_from_file_location("forge_bench_reality_ledger", path)
+    if spec is None or spec.loader is None:
+        raise FileNotFoundError(path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+DAY = "2025-01-01"
+KEYWORDS = ("tem-recon", "tem-vision", "tem-audit", "tem-guardian")
+
+def _prefill(shard: Path, size: int) -> None:
+    with open(shard, "w") as fh:
+        for i in range(size):
+            fh.write(json.dumps({
+                "event_id": f"pre-{i}",
+                "ts": f"{DAY}T00:00:{i % 60:02d}Z",
+                "keyword": KEYWORDS[i % len(KEYWORDS)],
+                "profile": f"@p{i % 16}",
+                "provider": "bench",
+                "model": "m",
+                "input_hash": f"{i:064x}",
+            }) + "\n")
+
+def ledger_sizes(args: argparse.Namespace) -> List[int]:
+    if args.ledger_sizes:
+        return [int(n) for n in args.ledger_sizes.split(",")]
+    return [1_000, 10_000] if args.quick else [10_000, 100_000, 1_000_000]
+
+def size_label(n: int) -> str:
+    return f"{n // 1_000_000}M" if n >= 1_000_000 and n % 1_000_000 == 0 else f"{n // 1000}k" if n % 1000 == 0 else str(n)
+
+@bench("ledger")
+def bench_ledger(args: argparse.Namespace) -> Dict[str, Result]:
+    """reality_ledger single-event appends and ledger_inspect queries per shard size."""
+    ledger = _load_ledger(args.repo)
+    inspect = args.repo / "scripts" / "ledger_inspect.py"
+    appends = 50 if args.quick else 300
+    out: Dict[str, Result] = {}
+    for size in ledger_sizes(args):
+        label = size_label(size)
+        with scratch_dir() as tmp:
+            ledger.LEDGER_DIR = tmp
+            _prefill(tmp / f"events-{DAY}.jsonl", size)
+            writer = ledger.ShardWriter(DAY)
+            try:
+                writer.append_batch([{"event_id": "warm", "ts": f"{DAY}T01:00:00Z"}])  # builds the hash index
+                start = time.perf_counter()
+                for i in range(appends):
+                    writer.append_batch([{"event_id": f"new-{i}", "ts": f"{DAY}T02:00:00Z", "keyword": "bench"}])
+                out[f"ledger.append[{label}]"] = rate(appends, time.perf_counter() - start, "events/s")
+            finally:
+                writer.close()
+
+            if inspect.exists():
+                query = [sys.executable, str(inspect), "--dir", str(tmp), "--day", DAY]
+                subprocess.run(query + ["--keyword", "tem-audit", "--count"], check=True, capture_output=True)  # builds .qidx
+                timings = []
+                for _ in range(3):
+                    start = time.perf_counter()
+                    subprocess.run(query + ["--keyword", "tem-audit", "--limit", "100"], check=True, capture_output=True)
+                    timings.append(time.perf_counter() - start)
+                out[f"inspect.query[{label}]"] = {"value": statistics.median(timings) * 1000, "unit": "ms", "better": "lower"}
+    return out
+
+@bench("bus")
+def bench_bus(args: argparse.Namespace) -> Dict[str, Result]:
+    """SSE fan-out: events delivered per second across N draining subscribers."""
+    from .bus import EventBus
+
+    events = 100 if args.quick else 1000
+    counts = [int(n) for n in args.subscribers.split(",")]
+    out: Dict[str, Result] = {}
+    for n in counts:
+        bus = EventBus(maxsize=events, history=0)
+
+        async def consume(sub) -> None:
+            seen = 0
+            async for _ in sub:
+                seen += 1
+                if seen == events:
+                    return
+
+        async def main() -> float:
+            subs = [bus.subscribe() for _ in range(n)]
+            consumers = [asyncio.create_task(consume(s)) for s in subs]
+            start = time.perf_counter()
+            for i in range(events):
+                await bus.publish("step", {"i": i}, topic="bench")
+                if i % 50 == 0:
+                    await asyncio.sleep(0)
+            await asyncio.gather(*consumers)
+            return time.perf_counter() - start
+
+        out[f"bus.fanout[{n}]"] = rate(events * n, asyncio.run(main()), "deliveries/s")
+    return out
+
+def regressions(current: Dict[str, Result], baseline: Dict[str, Result], threshold: float) -> List[str]:
+    """Describe every result that is worse than its baseline by more than `threshold` (a fraction)."""
+    out = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base or not base.get("value"):
+            continue
+        change = (cur["value"] - base["value"]) / base["value"]
+        worse = -change if cur.get("better", "higher") == "higher" else change
+        if worse > threshold:
+            out.append(f"{name}: {base['value']:.4g} -> {cur['value']:.4g} {cur['unit']} ({worse:.0%} worse)")
+    return out
+
+def _git_commit(repo: Path) -> Optional[str]:
+    try:
+        proc = subprocess.run(["git", "-C", str(repo), "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip()
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    selected = args.only.split(",") if args.only else list(BENCHES)
+    unknown = [name for name in selected if name not in BENCHES]
+    if unknown:
+        raise SystemExit(f"unknown benchmark(s): {', '.join(unknown)} (choose from {', '.join(BENCHES)})")
+    results: Dict[str, Result] = {}
+    for name in selected:
+        print(f"[forge-bench] {name} ...", file=sys.stderr)
+        results.update(BENCHES[name](args))
+    return {
+        "meta": {
+            "commit": _git_commit(args.repo),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": args.quick,
+            "created": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="forge-bench", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(BENCHES)}")
+    parser.add_argument("--quick", action="store_true", help="small iteration counts and shard sizes (smoke run)")
+    parser.add_argument("--repo", type=Path, default=Path.cwd(), help="repository checkout for the ledger benchmarks")
+    parser.add_argument("--ledger-sizes", help="comma-separated shard sizes (default: 10000,100000,1000000)")
+    parser.add_argument("--subscribers", default="1,10,100", help="comma-separated SSE subscriber counts")
+    parser.add_argument("--output", type=Path, help="write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression as a fraction (default: 0.2)")
+    args = parser.parse_args(argv)
+    args.repo = args.repo.resolve()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        failed = regressions(report["results"], baseline, args.threshold)
+        for line in failed:
+            print(f"[forge-bench] REGRESSION {line}", file=sys.stderr)
+        if failed:
+            return 1
+        print(f"[forge-bench] no regressions beyond {args.threshold:.0%}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,190 @@
+"""Broadcast bus feeding the SSE endpoint, optionally relayed across workers."""
+
+from __future__ import annotations
 import asyncio
-from typing import AsyncIterator
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Optional, Set
+from .config import get_settings
+from .metrics import bus_publish_seconds
+from .relay import BusRelay
 
-class EventBus:
-    def __init__(self) -> None:
-        self._q: asyncio.Queue[str] = asyncio.Queue()
+POLICIES = ("drop_oldest", "disconnect", "coalesce")
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    event: str
+    data: Dict[str, Any]
+    topic: Optional[str] = None
+
+    def coalesce_key(self) -> tuple:
+        d = self.data
+        return (self.event, self.topic, d.get("run_id"), d.get("step"), d.get("status"))
+
+    def sse(self) -> Dict[str, str]:
+        return {"id": str(self.id), "event": self.event, "data": json.dumps(self.data)}
+
+class Subscriber:
+    """Bounded per-client buffer; `policy` decides what happens when it fills up."""
+
+    def __init__(self, topics: Optional[Set[str]], maxsize: int, policy: str, runs: Optional[Set[str]] = None) -> None:
+        self.topics = topics
+        self.runs = runs
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed = False
+        self.dropped = 0
+        self._buf: Deque[Event] = deque()
+        self._wake = asyncio.Event()
 
-    async def publish(self, msg: str) -> None:
-        await self._q.put(msg)
+    def wants(self, ev: Event) -> bool:
+        if self.topics and ev.topic not in self.topics:
+            return False
+        return not self.runs or ev.data.get("run_id") in self.runs
 
-    async def stream(self) -> AsyncIterator[str]:
+    def offer(self, ev: Event) -> None:
+        if self.closed:
+            return
+        if len(self._buf) >= self.maxsize:
+            if self.policy == "disconnect":
+                self.close()
+                return
+            if not (self.policy == "coalesce" and self._coalesce(ev)):
+                self._buf.popleft()
+            self.dropped += 1
+        self._buf.append(ev)
+        self._wake.set()
+
+    def _coalesce(self, ev: Event) -> bool:
+        """Make room by superseding a queued event with the same key, if there is one."""
+        key = ev.coalesce_key()
+        for queued in self._buf:
+            if queued.coalesce_key() == key:
+                self._buf.remove(queued)
+                return True
+        return False
+
+    def close(self) -> None:
+        self.closed = True
+        self._buf.clear()
+        self._wake.set()
+
+    async def __aiter__(self) -> AsyncIterator[Event]:
         while True:
-            data = await self._q.get()
-            yield data
+            while self._buf:
+                yield self._buf.popleft()
+            if self.closed:
+                return
+            self._wake.clear()
+            await self._wake.wait()
+
+class EventBus:
+    """Fan-out bus: every subscriber sees every event it has subscribed to.
+
+    Each subscriber owns a ring buffer of at most `maxsize` events, and a short
+    history lets reconnecting clients resume from `Last-Event-ID`. Memory is
+    bounded whether there are zero subscribers or hundreds. With a relay
+    attached, events make a round trip through the hub so every worker
+    delivers the same events under the same ids. While the hub is unreachable
+    events are numbered locally; on reconnect the hub continues above them.
+    """
+
+    def __init__(self, maxsize: int = 100, history: int = 256, policy: str = "drop_oldest") -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown slow-consumer policy '{policy}' (expected one of {POLICIES})")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._seq = 0
+        self._history: Deque[Event] = deque(maxlen=history)
+        self._subs: Set[Subscriber] = set()
+        self._relay: Optional[BusRelay] = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subs)
+
+    @property
+    def last_id(self) -> int:
+        return self._seq
+
+    @property
+    def relayed(self) -> bool:
+        """Whether events go through a cross-worker hub."""
+        return self._relay is not None
+
+    async def attach(self, path: Path) -> None:
+        """Route events through the hub listening on `path`."""
+        relay = BusRelay(self, path)
+        await relay.connect()
+        self._relay = relay
+
+    async def detach(self) -> None:
+        relay, self._relay = self._relay, None
+        if relay is not None:
+            await relay.close()
+
+    async def publish(self, event: str, data: Dict[str, Any], topic: Optional[str] = None) -> Event:
+        start = time.perf_counter()
+        try:
+            relay = self._relay
+            if relay is not None:
+                try:
+                    return await relay.publish(event, data, topic)
+                except (OSError, asyncio.TimeoutError):
+                    # Hub unreachable: keep serving this worker's own subscribers. Drop
+                    # the connection so a late hub copy of this event is never delivered.
+                    await relay.close()
+            return self.deliver(Event(self._seq + 1, event, data, topic))
+        finally:
+            bus_publish_seconds.observe(time.perf_counter() - start)
+
+    def deliver(self, ev: Event) -> Event:
+        self._seq = max(self._seq, ev.id)
+        self._history.append(ev)
+        for sub in list(self._subs):
+            if sub.wants(ev):
+                sub.offer(ev)
+            if sub.closed:
+                self._subs.discard(sub)
+        return ev
+
+    def subscribe(
+        self,
+        topics: Optional[Iterable[str]] = None,
+        last_event_id: Optional[int] = None,
+        runs: Optional[Iterable[str]] = None,
+    ) -> Subscriber:
+        sub = Subscriber(set(topics) if topics else None, self.maxsize, self.policy, set(runs) if runs else None)
+        if last_event_id is not None:
+            for ev in self._history:
+                if ev.id > last_event_id and sub.wants(ev):
+                    sub.offer(ev)
+        self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self._subs.discard(sub)
+        sub.close()
+
+    async def stream(
+        self,
+        topics: Optional[Iterable[str]] = None,
+        last_event_id: Optional[int] = None,
+        runs: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Dict[str, str]]:
+        sub = self.subscribe(topics, last_event_id, runs)
+        try:
+            async for ev in sub:
+                yield ev.sse()
+        finally:
+            self.unsubscribe(sub)
+
+def _from_settings() -> EventBus:
+    s = get_settings()
+    return EventBus(maxsize=s.bus_buffer, history=s.bus_history, policy=s.bus_policy)
 
-bus = EventBus()
+bus = _from_settings()
@@ -0,0 +1,119 @@
+"""Step result cache with TTL and LRU eviction."""
+
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+from .config import get_settings
+from .utils.hashing import blake3_hex
+
+Entry = Tuple[float, Dict[str, Any]]
+
+def cache_key(call: str, args: Mapping[str, Any], inputs: Mapping[str, Any]) -> str:
+    """Digest of the call, its `with` args and the results of the steps it needs."""
+    input_digest = blake3_hex(json.dumps(inputs, sort_keys=True, default=str).encode())
+    return blake3_hex(json.dumps([call, args, input_digest], sort_keys=True, default=str).encode())
+
+class MemoryBackend:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class DiskBackend:
+    """One JSON file per key under `root`; file mtime doubles as the LRU clock.
+
+    The in-process recency order is seeded from mtimes on first use, so a
+    restarted server keeps evicting the least recently used entries first.
+    """
+
+    def __init__(self, root: Path, max_entries: int) -> None:
+        self.root = root
+        self.max_entries = max_entries
+        self._order: Optional["OrderedDict[str, None]"] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _ensure_order(self) -> "OrderedDict[str, None]":
+        if self._order is None:
+            files = sorted(self.root.glob("*/*.json"), key=lambda p: p.stat().st_mtime_ns) if self.root.exists() else []
+            self._order = OrderedDict((p.stem, None) for p in files)
+        return self._order
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            expires, value = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            order = self._ensure_order()
+            if expires <= time.time():
+                order.pop(key, None)
+                path.unlink(missing_ok=True)
+                return None
+            order[key] = None
+            order.move_to_end(key)
+        os.utime(path)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps([time.time() + ttl, value], default=str))
+        os.replace(tmp, path)
+        with self._lock:
+            order = self._ensure_order()
+            order[key] = None
+            order.move_to_end(key)
+            while len(order) > self.max_entries:
+                old, _ = order.popitem(last=False)
+                self._path(old).unlink(missing_ok=True)
+
+class ResultCache:
+    def __init__(self, root: Path | None = None, max_entries: int | None = None) -> None:
+        settings = get_settings()
+        limit = max_entries or settings.cache_max_entries
+        self.backends = {
+            "memory": MemoryBackend(limit),
+            "disk": DiskBackend(root or settings.cache_dir, limit),
+        }
+
+    def get(self, backend: str, key: str) -> Optional[Dict[str, Any]]:
+        return self.backends[backend].get(key)
+
+    def set(self, backend: str, key: str, value: Dict[str, Any], ttl: float) -> None:
+        self.backends[backend].set(key, value, ttl)
+
+_cache: Optional[ResultCache] = None
+
+def get_cache() -> ResultCache:
+    global _cache
+    if _cache is None:
+        _cache = ResultCache()
+    return _cache
@@ -1,11 +1,87 @@
 """Configuration helpers for Forge v2."""
 
+import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from pydantic import BaseModel, Field
 
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    return int(raw) if raw else default
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    raw = os.environ.get(name)
+    return raw.strip().lower() in {"1", "true", "yes", "on"} if raw else default
+
 class Settings(BaseModel):
     forgefile: Path = Field(default=Path("Forgefile.yaml"), description="Path to the Forge ritual definition file.")
+    watch_forgefile: bool = Field(
+        default_factory=lambda: _env_bool("FORGE_WATCH_FORGEFILE"),
+        description="Recompile the Forgefile in the background as soon as it changes.",
+    )
+    max_concurrency: int = Field(
+        default_factory=lambda: _env_int("FORGE_MAX_CONCURRENCY", 4),
+        ge=1,
+        description="Default number of ritual steps allowed in flight at once.",
+    )
+    max_subprocesses: int = Field(
+        default_factory=lambda: _env_int("FORGE_MAX_SUBPROCESSES", 2),
+        ge=1,
+        description="Upper bound on adapter subprocesses running at the same time.",
+    )
+    receipt_mode: str = Field(
+        default_factory=lambda: os.environ.get("FORGE_RECEIPT_MODE", "segment"),
+        description="Receipt layout: 'segment' (batched append-only daily files) or 'files' (one JSON per receipt).",
+    )
+    bus_buffer: int = Field(
+        default_factory=lambda: _env_int("FORGE_BUS_BUFFER", 100),
+        ge=1,
+        description="Events buffered per SSE subscriber before the slow-consumer policy applies.",
+    )
+    bus_history: int = Field(
+        default_factory=lambda: _env_int("FORGE_BUS_HISTORY", 256),
+        ge=0,
+        description="Recent events kept for Last-Event-ID replay.",
+    )
+    bus_policy: str = Field(
+        default_factory=lambda: os.environ.get("FORGE_BUS_POLICY", "drop_oldest"),
+        description="Slow-consumer policy: drop_oldest, disconnect or coalesce.",
+    )
+
+    bus_socket: Optional[Path] = Field(
+        default_factory=lambda: Path(p) if (p := os.environ.get("FORGE_BUS_SOCKET")) else None,
+        description="Unix socket of the cross-worker event hub; set by `forge-api --workers`.",
+    )
+    cache_dir: Path = Field(
+        default_factory=lambda: Path(os.environ.get("FORGE_CACHE_DIR", ".forge/step-cache")),
+        description="Directory for the on-disk step result cache.",
+    )
+    cache_max_entries: int = Field(
+        default_factory=lambda: _env_int("FORGE_CACHE_MAX_ENTRIES", 256),
+        ge=1,
+        description="Step results kept per cache backend before LRU eviction.",
+    )
+
+    job_workers: int = Field(
+        default_factory=lambda: _env_int("FORGE_JOB_WORKERS", 2),
+        ge=1,
+        description="Workers draining the async run queue, i.e. rituals running at once via ?async=1.",
+    )
+    job_queue_depth: int = Field(
+        default_factory=lambda: _env_int("FORGE_JOB_QUEUE_DEPTH", 100),
+        ge=1,
+        description="Queued async runs accepted before the API answers 429.",
+    )
+
+    trace_exporter: str = Field(
+        default_factory=lambda: os.environ.get("FORGE_TRACE_EXPORTER", "none"),
+        description="Span exporter: 'none' or 'file' (OTLP-JSON lines).",
+    )
+    trace_file: Path = Field(
+        default_factory=lambda: Path(os.environ.get("FORGE_TRACE_FILE", "forge-traces.jsonl")),
+        description="Destination of the 'file' span exporter.",
+    )
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -0,0 +1,126 @@
+"""App-scoped pooled HTTP clients shared by the HTTP-backed adapters."""
+
+from __future__ import annotations
+import asyncio
+import importlib.util
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+import httpx
+
+HTTP2 = importlib.util.find_spec("h2") is not None
+RETRY_STATUS = {429, 502, 503, 504}
+IDEMPOTENT = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Raised before any byte of the request went out, so safe to retry for any method.
+NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+@dataclass(frozen=True)
+class ClientConfig:
+    timeout: float = 5.0
+    max_connections: int = 10
+    max_keepalive: int = 5
+    retries: int = 2
+    backoff: float = 0.2
+
+DEFAULTS: Dict[str, ClientConfig] = {
+    "grafana": ClientConfig(timeout=5.0, max_connections=4, max_keepalive=2),
+}
+
+class HttpClients:
+    """One keep-alive `httpx.AsyncClient` per adapter name.
+
+    Clients are created on first use and closed by `aclose()`, which the API
+    lifespan and `forge-run` call on shutdown. They belong to the event loop
+    that created them; a new loop gets fresh clients, and clients dropped by a
+    loop change or `configure()` are closed on their own loop.
+    """
+
+    def __init__(self) -> None:
+        self._configs: Dict[str, ClientConfig] = dict(DEFAULTS)
+        self._transports: Dict[str, httpx.AsyncBaseTransport] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: Set[asyncio.Task] = set()
+
+    def configure(
+        self,
+        name: str,
+        config: ClientConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        if config is not None:
+            self._configs[name] = config
+        if transport is not None:
+            self._transports[name] = transport
+        client = self._clients.pop(name, None)
+        if client is not None:
+            self._discard(client, self._loop)
+
+    def config(self, name: str) -> ClientConfig:
+        return self._configs.get(name, ClientConfig())
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            stale, self._clients = list(self._clients.values()), {}
+            for client in stale:
+                self._discard(client, self._loop)
+            self._loop = loop
+        client = self._clients.get(name)
+        if client is None:
+            cfg = self.config(name)
+            client = httpx.AsyncClient(
+                timeout=cfg.timeout,
+                limits=httpx.Limits(max_connections=cfg.max_connections, max_keepalive_connections=cfg.max_keepalive),
+                http2=HTTP2,
+                transport=self._transports.get(name),
+            )
+            self._clients[name] = client
+        return client
+
+    def _discard(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close a dropped client on the loop that owns its connections."""
+        if loop is None or loop.is_closed():
+            return  # nothing can run on a closed loop any more
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            task = loop.create_task(client.aclose())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def request(self, name: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send with full-jitter backoff retries.
+
+        Idempotent methods are retried on transport errors and 429/5xx; others
+        (e.g. POST) only when the connection failed before the request was sent.
+        """
+        cfg = self.config(name)
+        client = self.get(name)
+        idempotent = method.upper() in IDEMPOTENT
+        for attempt in range(cfg.retries + 1):
+            last = attempt == cfg.retries
+            try:
+                response = await client.request(method, url, **kwargs)
+            except NOT_SENT:
+                if last:
+                    raise
+            except httpx.TransportError:
+                if last or not idempotent:
+                    raise
+            else:
+                if last or not idempotent or response.status_code not in RETRY_STATUS:
+                    return response
+            await asyncio.sleep(random.uniform(0, cfg.backoff * 2 ** attempt))
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+clients = HttpClients()
@@ -0,0 +1,225 @@
+"""Queued ritual runs drained by a bounded worker pool."""
+
+from __future__ import annotations
+import asyncio
+import itertools
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set
+from .config import get_settings
+from .metrics import jobs_busy_workers, jobs_queue_depth, jobs_wait_seconds, jobs_workers
+from .utils.time import now_iso
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .bus import EventBus
+
+Runner = Callable[[str, str], Awaitable[Dict[str, Any]]]
+FINAL = ("succeeded", "failed", "cancelled", "error")
+JOBS_TOPIC = "forge.jobs"
+
+@dataclass
+class Job:
+    id: str
+    name: str
+    priority: int
+    status: str = "queued"
+    submitted: str = field(default_factory=now_iso)
+    started: Optional[str] = None
+    finished: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic, repr=False)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def view(self) -> Dict[str, Any]:
+        out = {k: getattr(self, k) for k in ("id", "name", "priority", "status", "submitted", "started", "finished")}
+        if self.result is not None:
+            out["result"] = self.result
+        if self.error is not None:
+            out["error"] = self.error
+        return out
+
+class JobQueue:
+    """Priority queue of ritual runs (lower `priority` runs first, FIFO within a level).
+
+    `submit` raises `asyncio.QueueFull` once `max_depth` runs are waiting, which
+    the API turns into 429; cancelled runs stop counting at once, even though
+    their entries leave the heap lazily. Finished jobs stay queryable until
+    `history` newer ones have finished. A job's id doubles as the run id of
+    its ritual, so `/api/forge/events?run=<id>` follows it.
+
+    Behind a relayed `bus` (multi-worker `forge-api`) every state change is
+    broadcast on the `forge.jobs` topic: each worker keeps the latest view of
+    the others' jobs for `view()`, and `request_cancel()` of a job another
+    worker owns is forwarded to it. Admission control stays per worker.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        workers: int | None = None,
+        max_depth: int | None = None,
+        history: int = 1000,
+        bus: Optional["EventBus"] = None,
+    ) -> None:
+        settings = get_settings()
+        self.runner = runner
+        self.workers = workers or settings.job_workers
+        self.max_depth = max_depth or settings.job_queue_depth
+        self.history = history
+        self._seq = itertools.count()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._q: Optional[asyncio.PriorityQueue] = None
+        self._depth = 0
+        self._tasks: List[asyncio.Task] = []
+        self.bus = bus
+        self._remote: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._announcing: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        self._q = asyncio.PriorityQueue()
+        self._depth = 0
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        if self.bus is not None and self.bus.relayed:
+            self._tasks.append(asyncio.create_task(self._follow(self.bus)))
+        jobs_workers.set(self.workers)
+
+    async def stop(self) -> None:
+        await self.flush()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        jobs_workers.set(0)
+
+    def submit(self, name: str, priority: int = 0) -> Job:
+        if self._q is None:
+            raise RuntimeError("job queue not started")
+        if self._depth >= self.max_depth:
+            raise asyncio.QueueFull
+        if self._q.qsize() >= 2 * self.max_depth:
+            self._prune()
+        job = Job(id=uuid.uuid4().hex, name=name, priority=priority)
+        self._q.put_nowait((priority, next(self._seq), job))
+        self._jobs[job.id] = job
+        self._set_depth(self._depth + 1)
+        self._announce(job)
+        return job
+
+    def _prune(self) -> None:
+        """Drop heap entries of runs cancelled while queued."""
+        assert self._q is not None
+        live = []
+        while not self._q.empty():
+            entry = self._q.get_nowait()
+            if entry[2].status == "queued":
+                live.append(entry)
+        for entry in live:
+            self._q.put_nowait(entry)
+
+    def _set_depth(self, depth: int) -> None:
+        self._depth = depth
+        jobs_queue_depth.set(depth)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def view(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """View of a job owned by this worker or, failing that, the last one another worker announced."""
+        job = self._jobs.get(job_id)
+        return job.view() if job is not None else self._remote.get(job_id)
+
+    async def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a job wherever it runs; returns its view as known here, or None if unknown."""
+        job = self.cancel(job_id)
+        if job is not None:
+            await self.flush()
+            return job.view()
+        view = self._remote.get(job_id)
+        if view is not None and view["status"] not in FINAL and self.bus is not None:
+            await self.bus.publish("job.cancel", {"run_id": job_id}, topic=JOBS_TOPIC)
+        return view
+
+    async def flush(self) -> None:
+        """Wait until every state change so far has been handed to the bus."""
+        if self._announcing:
+            await asyncio.gather(*list(self._announcing), return_exceptions=True)
+
+    def _announce(self, job: Job) -> None:
+        if self.bus is None or not self.bus.relayed:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self.bus.publish("job", {"run_id": job.id, **job.view()}, topic=JOBS_TOPIC)
+        )
+        self._announcing.add(task)
+        task.add_done_callback(self._announcing.discard)
+
+    async def _follow(self, bus: "EventBus") -> None:
+        """Track other workers' jobs and act on cancels aimed at ours."""
+        while True:
+            sub = bus.subscribe(topics=[JOBS_TOPIC])
+            try:
+                async for ev in sub:
+                    job_id = ev.data.get("run_id")
+                    if ev.event == "job.cancel":
+                        self.cancel(job_id)
+                    elif ev.event == "job" and job_id not in self._jobs:
+                        self._remote[job_id] = {k: v for k, v in ev.data.items() if k != "run_id"}
+                        self._remote.move_to_end(job_id)
+                        while len(self._remote) > self.history:
+                            self._remote.popitem(last=False)
+            finally:
+                bus.unsubscribe(sub)  # closed as a slow consumer: subscribe again
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINAL:
+            return job
+        if job.status == "queued":
+            self._set_depth(self._depth - 1)
+            self._finish(job, "cancelled")
+        elif job.task is not None:
+            job.task.cancel()
+        return job
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished = now_iso()
+        self._announce(job)
+        self._jobs.move_to_end(job.id)
+        done = [j for j in self._jobs.values() if j.status in FINAL]
+        for old in done[: max(0, len(done) - self.history)]:
+            del self._jobs[old.id]
+
+    async def _work(self) -> None:
+        assert self._q is not None
+        while True:
+            _, _, job = await self._q.get()
+            if job.status != "queued":  # cancelled while waiting
+                continue
+            self._set_depth(self._depth - 1)
+            jobs_wait_seconds.observe(time.monotonic() - job.enqueued_at)
+            job.status = "running"
+            job.started = now_iso()
+            self._announce(job)
+            job.task = asyncio.create_task(self.runner(job.name, job.id))
+            jobs_busy_workers.inc()
+            try:
+                await asyncio.wait({job.task})
+            except asyncio.CancelledError:
+                job.task.cancel()
+                await asyncio.gather(job.task, return_exceptions=True)
+                self._finish(job, "cancelled")
+                raise
+            finally:
+                jobs_busy_workers.dec()
+            if job.task.cancelled():
+                self._finish(job, "cancelled")
+            elif job.task.exception() is not None:
+                job.error = str(job.task.exception())
+                self._finish(job, "error")
+            else:
+                job.result = job.task.result()
+                self._finish(job, "succeeded" if job.result.get("ok") else "failed")
@@ -1,5 +1,43 @@
-from prometheus_client import Counter, Histogram
+import os
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
 
 rituals_total = Counter("forge_rituals_total", "Total rituals executed", ["name", "status"])
 steps_total = Counter("forge_steps_total", "Total ritual steps", ["ritual", "step", "status"])
 latency = Histogram("forge_ritual_latency_seconds", "Ritual execution latency", ["name"])
+
+# Subprocess steps take seconds to minutes; HTTP/RPC steps milliseconds to seconds.
+STEP_BUCKETS = {
+    "subprocess": (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+    "http": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    "local": Histogram.DEFAULT_BUCKETS,
+}
+step_latency = {
+    kind: Histogram(f"forge_step_{kind}_duration_seconds", f"Duration of {kind} ritual steps", ["ritual", "step"], buckets=buckets)
+    for kind, buckets in STEP_BUCKETS.items()
+}
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+step_queue_wait = Histogram("forge_step_queue_wait_seconds", "Time ready steps waited for a concurrency slot", ["ritual"], buckets=FAST_BUCKETS)
+receipt_write_seconds = Histogram("forge_receipt_write_seconds", "Time until a receipt write is durable", ["mode"], buckets=FAST_BUCKETS)
+bus_publish_seconds = Histogram("forge_bus_publish_seconds", "Time to publish one event to the bus", buckets=FAST_BUCKETS)
+cache_hits_total = Counter("forge_step_cache_hits_total", "Step results served from cache", ["ritual", "step"])
+cache_misses_total = Counter("forge_step_cache_misses_total", "Cacheable steps that had to run", ["ritual", "step"])
+singleflight_total = Counter("forge_singleflight_total", "API run requests by single-flight role", ["name", "role"])
+jobs_queue_depth = Gauge("forge_jobs_queue_depth", "Async runs waiting for a worker", multiprocess_mode="livesum")
+jobs_wait_seconds = Histogram("forge_jobs_wait_seconds", "Time async runs spent queued")
+jobs_workers = Gauge("forge_jobs_workers", "Async run workers started", multiprocess_mode="livesum")
+jobs_busy_workers = Gauge("forge_jobs_busy_workers", "Async run workers currently running a ritual", multiprocess_mode="livesum")
+
+def multiprocess_dir() -> str | None:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+def render() -> tuple[bytes, str]:
+    """Exposition for this process, or for every worker when running multiprocess."""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+def mark_process_dead() -> None:
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
@@ -2,21 +2,33 @@ from __future__ import annotations
 import asyncio
 import json
 import time
-from pathlib import Path
-from typing import Any, Awaitable, Callable, Dict
-import yaml
-from .schema import ForgeConfig
-from .receipts import make_receipt, write_receipt
-from .metrics import rituals_total, steps_total, latency
+import uuid
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+from .schema import Step
+from .plan import CompiledRitual, CompiledStep, PlanCache, StepFn
+from .receipts import get_sink, make_receipt
+from .metrics import (
+    rituals_total, steps_total, latency, step_latency, step_queue_wait,
+    cache_hits_total, cache_misses_total, singleflight_total,
+)
+from .cache import cache_key, get_cache
 from .bus import bus
 from .config import get_settings
+from .http_clients import clients
+from .utils.singleflight import SingleFlight
+from .tracing import tracer
 
-StepFn = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
 REGISTRY: Dict[str, StepFn] = {}
+STEP_KINDS: Dict[str, str] = {}
 
-def step(name: str):
+def step(name: str, kind: str = "local"):
+    """Register a step; `kind` (subprocess, http or local) picks its latency buckets."""
+    if kind not in step_latency:
+        raise ValueError(f"unknown step kind '{kind}' (expected one of {sorted(step_latency)})")
     def deco(fn: StepFn) -> StepFn:
         REGISTRY[name] = fn
+        STEP_KINDS[name] = kind
         return fn
     return deco
 
@@ -25,74 +37,190 @@ from .adapters import mcp as mcp_ad
 from .adapters import vaultmesh as vm_ad
 from .adapters import grafana as gf_ad
 
-@step("system.selftest")
+@step("system.selftest", kind="subprocess")
 async def _sys_selftest(opts: Dict[str, Any]) -> Dict[str, Any]:
-    return await sys_ad.selftest()
+    return await sys_ad.selftest(timeout=opts.get("timeout"))
 
-@step("mcp:ping")
+@step("mcp:ping", kind="http")
 async def _mcp_ping(opts: Dict[str, Any]) -> Dict[str, Any]:
-    return await mcp_ad.ping()
+    return await mcp_ad.ping(timeout=opts.get("timeout"))
 
-@step("vaultmesh.rollup")
+@step("vaultmesh.rollup", kind="subprocess")
 async def _vm_rollup(opts: Dict[str, Any]) -> Dict[str, Any]:
-    return await vm_ad.rollup()
+    return await vm_ad.rollup(timeout=opts.get("timeout"))
 
-@step("grafana.annotate")
+@step("grafana.annotate", kind="http")
 async def _gf_annotate(opts: Dict[str, Any]) -> Dict[str, Any]:
     return await gf_ad.annotate(opts.get("text", "Forge ritual"))
 
-def load_config(path: Path | None = None) -> ForgeConfig:
-    settings = get_settings()
-    cfg_path = path or settings.forgefile
-    data = yaml.safe_load(cfg_path.read_text())
-    return ForgeConfig.model_validate(data)
-
-async def run_ritual(name: str) -> Dict[str, Any]:
-    cfg = load_config()
-    if name not in cfg.rituals:
-        raise AssertionError(f"Ritual '{name}' not found")
-    ritual = cfg.rituals[name]
-    start = time.perf_counter()
-    ritual_ok = True
-    out_steps: list[Dict[str, Any]] = []
-
-    await bus.publish(f"event: ritual\ndata: {json.dumps({'name': name, 'status': 'start'})}\n\n")
-
-    for s in ritual.steps:
-        fn = REGISTRY.get(s.call)
+plans = PlanCache(REGISTRY)
+
+async def _call_cached(name: str, s: Step, fn: StepFn, inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """Run `fn`, or serve a fresh-enough earlier result when the step opts into caching."""
+    if s.cache is None:
+        return await fn(s.with_), False
+    cache = get_cache()
+    key = cache_key(s.call, s.with_, inputs)
+    if s.cache.backend == "disk":
+        hit = await asyncio.to_thread(cache.get, "disk", key)
+    else:
+        hit = cache.get("memory", key)
+    if hit is not None:
+        cache_hits_total.labels(ritual=name, step=s.call).inc()
+        return hit, True
+    cache_misses_total.labels(ritual=name, step=s.call).inc()
+    res = await fn(s.with_)
+    if res.get("ok", True):
+        if s.cache.backend == "disk":
+            await asyncio.to_thread(cache.set, "disk", key, res, s.cache.ttl)
+        else:
+            cache.set("memory", key, res, s.cache.ttl)
+    return res, False
+
+async def _step_receipt(name: str, call: str, ok: bool, data: Dict[str, Any], cached: bool = False) -> str:
+    with tracer.span("receipt.build"):
+        payload = make_receipt(type="forge.step", ritual=name, step=call, ok=ok, data=data, cached=cached).model_dump()
+    return await get_sink().write(payload)
+
+async def _run_step(
+    name: str, cs: CompiledStep, inputs: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """Execute one step and emit its receipt, event and metrics.
+
+    `inputs` maps each prerequisite step key to its result data; it feeds the
+    cache key so a cached step reruns when anything upstream changed.
+    """
+    s = cs.step
+    fn = cs.fn or REGISTRY.get(s.call)
+    kind = STEP_KINDS.get(s.call, "local")
+    with tracer.span(f"step {s.call}", ritual=name, step=s.key, run_id=run_id or "", kind=kind) as span:
         if not fn:
-            payload = make_receipt(type="forge.step", ritual=name, step=s.call, ok=False, data={"error": "unknown call"}).model_dump()
-            write_receipt(payload)
+            await _step_receipt(name, s.call, False, {"error": "unknown call"})
             steps_total.labels(ritual=name, step=s.call, status="error").inc()
-            ritual_ok = False
-            break
+            span.set_status(False, "unknown call")
+            return False, None
 
         try:
-            res = await fn(s.with_)
+            start = time.perf_counter()
+            res, cached = await _call_cached(name, s, fn, inputs or {})
+            step_latency[kind].labels(ritual=name, step=s.call).observe(time.perf_counter() - start)
             ok = bool(res.get("ok", True))
-            payload = make_receipt(type="forge.step", ritual=name, step=s.call, ok=ok, data=res).model_dump()
-            path = write_receipt(payload)
-            await bus.publish(f"event: step\ndata: {json.dumps({'ritual': name, 'step': s.call, 'ok': ok, 'path': str(path)})}\n\n")
+            span.set_attribute("cached", cached)
+            span.set_status(ok, None if ok else str(res.get("error", "step reported failure")))
+            path = await _step_receipt(name, s.call, ok, res, cached)
+            await bus.publish("step", {"ritual": name, "run_id": run_id, "step": s.call, "ok": ok, "cached": cached, "path": path}, topic=name)
             steps_total.labels(ritual=name, step=s.call, status="ok" if ok else "fail").inc()
-            out_steps.append({"step": s.call, "ok": ok, "data": res})
-            if not ok:
-                ritual_ok = False
-                break
+            entry = {"step": s.call, "ok": ok, "data": res}
+            if cached:
+                entry["cached"] = True
+            return ok, entry
+        except asyncio.CancelledError:
+            await _step_receipt(name, s.call, False, {"error": "cancelled"})
+            steps_total.labels(ritual=name, step=s.call, status="cancelled").inc()
+            raise
         except Exception as exc:  # noqa: BLE001
-            payload = make_receipt(type="forge.step", ritual=name, step=s.call, ok=False, data={"error": str(exc)}).model_dump()
-            write_receipt(payload)
+            await _step_receipt(name, s.call, False, {"error": str(exc)})
             steps_total.labels(ritual=name, step=s.call, status="error").inc()
-            ritual_ok = False
-            break
+            span.set_status(False, str(exc))
+            return False, None
+
+async def _run_graph(
+    name: str, ritual: CompiledRitual, limit: int, run_id: Optional[str] = None
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    """Run steps as soon as their prerequisites succeed, at most `limit` at a time.
+
+    The first failing step cancels everything still in flight (fail-fast) and
+    nothing new is started. Step results come back in declaration order.
+    """
+    order = {key: i for i, key in enumerate(ritual.steps)}
+    pending = {key: cs.needs for key, cs in ritual.steps.items()}
+    done: set[str] = set()
+    running: Dict[asyncio.Task, str] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+    ready_at: Dict[str, float] = {}
+    ritual_ok = True
 
-    duration = time.perf_counter() - start
-    latency.labels(name=name).observe(duration)
-    rituals_total.labels(name=name, status="ok" if ritual_ok else "fail").inc()
+    try:
+        while pending or running:
+            ready = [k for k, deps in pending.items() if done.issuperset(deps)]
+            now = time.perf_counter()
+            for key in ready:
+                ready_at.setdefault(key, now)
+            for key in ready:
+                if len(running) >= limit:
+                    break
+                del pending[key]
+                step_queue_wait.labels(ritual=name).observe(now - ready_at.pop(key))
+                cs = ritual.steps[key]
+                inputs = {dep: results[dep]["data"] for dep in cs.needs if dep in results}
+                running[asyncio.create_task(_run_step(name, cs, inputs, run_id))] = key
+            if not running:
+                break
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                key = running.pop(task)
+                ok, entry = task.result()
+                if entry is not None:
+                    results[key] = entry
+                if ok:
+                    done.add(key)
+                else:
+                    ritual_ok = False
+            if not ritual_ok:
+                break
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    return ritual_ok, [results[k] for k in sorted(results, key=order.__getitem__)]
+
+async def run_ritual(name: str, run_id: Optional[str] = None) -> Dict[str, Any]:
+    plan = plans.get()
+    if name not in plan.rituals:
+        raise AssertionError(f"Ritual '{name}' not found")
+    ritual = plan.rituals[name]
+    start = time.perf_counter()
 
-    final = make_receipt(type="forge.ritual", ritual=name, ok=ritual_ok, data={"duration_s": duration, "steps": out_steps}).model_dump()
-    final_path = write_receipt(final)
-    await bus.publish(f"event: ritual\ndata: {json.dumps({'name': name, 'status': 'end', 'ok': ritual_ok, 'receipt': str(final_path)})}\n\n")
-    return {"ok": ritual_ok, "duration_s": duration, "receipt": str(final_path)}
+    run_id = run_id or uuid.uuid4().hex
+    with tracer.span(f"ritual {name}", ritual=name, run_id=run_id) as span:
+        await bus.publish("ritual", {"name": name, "run_id": run_id, "status": "start"}, topic=name)
+
+        limit = ritual.ritual.concurrency or get_settings().max_concurrency
+        ritual_ok, out_steps = await _run_graph(name, ritual, limit, run_id)
+        span.set_status(ritual_ok)
+
+        duration = time.perf_counter() - start
+        latency.labels(name=name).observe(duration)
+        rituals_total.labels(name=name, status="ok" if ritual_ok else "fail").inc()
+
+        with tracer.span("receipt.build"):
+            final = make_receipt(type="forge.ritual", ritual=name, ok=ritual_ok, data={"run_id": run_id, "duration_s": duration, "steps": out_steps}).model_dump()
+        final_path = await get_sink().write(final)
+        await bus.publish("ritual", {"name": name, "run_id": run_id, "status": "end", "ok": ritual_ok, "receipt": final_path}, topic=name)
+    return {"ok": ritual_ok, "run_id": run_id, "duration_s": duration, "receipt": final_path}
+
+_flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SingleFlight]" = weakref.WeakKeyDictionary()
+
+async def run_ritual_shared(name: str) -> Dict[str, Any]:
+    """`run_ritual`, but concurrent calls join one run when the ritual opts into single-flight."""
+    ritual = plans.get().rituals.get(name)
+    sf = ritual.ritual.single_flight if ritual is not None else None
+    if sf is None:
+        return await run_ritual(name)
+    loop = asyncio.get_running_loop()
+    flights = _flights.get(loop)
+    if flights is None:
+        flights = _flights[loop] = SingleFlight()
+    result, joined = await flights.do(name, lambda: run_ritual(name), sf.window)
+    singleflight_total.labels(name=name, role="joined" if joined else "leader").inc()
+    return dict(result, joined=True) if joined else result
+
+async def shutdown() -> None:
+    """Close long-lived adapter connections owned by the running loop."""
+    await clients.aclose()
+    await mcp_ad.close()
 
 def cli_run() -> None:
     import argparse
@@ -100,5 +228,11 @@ def cli_run() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("name", help="ritual name (from Forgefile.yaml)")
     args = parser.parse_args()
-    result = asyncio.run(run_ritual(args.name))
+
+    async def main() -> Dict[str, Any]:
+        try:
+            return await run_ritual(args.name)
+        finally:
+            await shutdown()
+    result = asyncio.run(main())
     print(json.dumps(result, indent=2))
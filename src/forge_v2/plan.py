@@ -0,0 +1,118 @@
+"""Compiled, cached view of the Forgefile."""
+
+from __future__ import annotations
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+import yaml
+from .config import get_settings
+from .schema import ForgeConfig, Ritual, Step
+from .utils.hashing import blake3_hex
+
+try:
+    from watchfiles import awatch  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    awatch = None  # type: ignore[assignment]
+
+StepFn = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+@dataclass(frozen=True)
+class CompiledStep:
+    step: Step
+    fn: Optional[StepFn]
+    needs: Tuple[str, ...]
+
+    @property
+    def key(self) -> str:
+        return self.step.key
+
+@dataclass(frozen=True)
+class CompiledRitual:
+    name: str
+    ritual: Ritual
+    steps: Dict[str, CompiledStep]
+    unknown: Tuple[str, ...]
+
+@dataclass(frozen=True)
+class Plan:
+    digest: str
+    rituals: Dict[str, CompiledRitual] = field(default_factory=dict)
+
+    @property
+    def unknown(self) -> Dict[str, List[str]]:
+        return {name: list(r.unknown) for name, r in self.rituals.items() if r.unknown}
+
+def compile_config(cfg: ForgeConfig, registry: Mapping[str, StepFn], digest: str = "") -> Plan:
+    """Resolve step callables and dependency lists once per Forgefile revision."""
+    rituals: Dict[str, CompiledRitual] = {}
+    for name, ritual in cfg.rituals.items():
+        deps = ritual.dependencies()
+        steps = {
+            s.key: CompiledStep(step=s, fn=registry.get(s.call), needs=tuple(deps[s.key]))
+            for s in ritual.steps
+        }
+        unknown = tuple(s.call for s in ritual.steps if s.call not in registry)
+        rituals[name] = CompiledRitual(name=name, ritual=ritual, steps=steps, unknown=unknown)
+    return Plan(digest=digest, rituals=rituals)
+
+class PlanCache:
+    """Serve the compiled Forgefile, recompiling only when the file changes.
+
+    A cheap `stat` (mtime, size) guards every lookup; when it moves, the file
+    is hashed and only a different digest triggers a re-parse. An edit that
+    fails to compile keeps the last good plan in service; `reload` raises it.
+    """
+
+    def __init__(self, registry: Mapping[str, StepFn], path: Path | None = None) -> None:
+        self._registry = registry
+        self._path = path
+        self._stat: Optional[Tuple[int, int]] = None
+        self._plan: Optional[Plan] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path or get_settings().forgefile
+
+    def get(self) -> Plan:
+        st = self.path.stat()
+        sig = (st.st_mtime_ns, st.st_size)
+        if self._plan is not None and sig == self._stat:
+            return self._plan
+        try:
+            return self._load(sig)
+        except Exception:  # noqa: BLE001
+            if self._plan is None:
+                raise
+            self._stat = sig  # don't re-parse the same broken file on every lookup
+            return self._plan
+
+    def reload(self) -> Plan:
+        """Recompile now; an invalid Forgefile raises and the current plan stays."""
+        st = self.path.stat()
+        return self._load((st.st_mtime_ns, st.st_size), force=True)
+
+    def _load(self, sig: Tuple[int, int], force: bool = False) -> Plan:
+        raw = self.path.read_bytes()
+        digest = blake3_hex(raw)
+        if force or self._plan is None or self._plan.digest != digest:
+            cfg = ForgeConfig.model_validate(yaml.safe_load(raw))
+            self._plan = compile_config(cfg, self._registry, digest)
+        self._stat = sig
+        return self._plan
+
+    async def watch(self, interval: float = 1.0) -> None:
+        """Recompile eagerly on change; uses watchfiles when installed, else polls."""
+        if awatch is not None:
+            async for _ in awatch(self.path):
+                self._refresh()
+            return
+        while True:
+            await asyncio.sleep(interval)
+            self._refresh()
+
+    def _refresh(self) -> None:
+        try:
+            self.get()
+        except Exception:  # noqa: BLE001 - keep watching; /admin/reload surfaces the error
+            pass
@@ -1,17 +1,33 @@
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime, timezone
+import asyncio
+import atexit
 import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from blake3 import blake3
 from .schema import Receipt
+from .config import get_settings
+from .metrics import receipt_write_seconds
+from .tracing import Span, tracer
+
+try:
+    import fcntl  # type: ignore[attr-defined]
+except Exception:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
 
 LEDGER_ROOT = Path("reality_ledger/forge")
+MODES = ("segment", "files")
 
 def now_utc() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-def write_receipt(payload: dict, domain: str = "forge") -> Path:
-    date_dir = LEDGER_ROOT / datetime.now(timezone.utc).strftime("%Y-%m-%d")
+def write_receipt(payload: dict, domain: str = "forge", root: Path | None = None) -> Path:
+    date_dir = (root or LEDGER_ROOT) / datetime.now(timezone.utc).strftime("%Y-%m-%d")
     date_dir.mkdir(parents=True, exist_ok=True)
     ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H-%M-%S-%fZ")
     path = date_dir / f"{ts}_{domain}.json"
@@ -23,3 +39,176 @@ def write_receipt(payload: dict, domain: str = "forge") -> Path:
 
 def make_receipt(**kwargs) -> Receipt:
     return Receipt(ts=now_utc(), **kwargs)
+
+def segment_path(root: Path, domain: str, when: datetime | None = None) -> Path:
+    day = (when or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+    return root / day / f"{domain}.segment.jsonl"
+
+def read_receipt(ref: str) -> dict:
+    """Resolve a reference returned by `ReceiptSink.write` back to its receipt."""
+    path, sep, offset = ref.rpartition("#")
+    if not sep:
+        return json.loads(Path(ref).read_text())
+    with open(path, "rb") as fh:
+        fh.seek(int(offset))
+        return json.loads(fh.readline())
+
+def load_index(segment: Path) -> Dict[str, Tuple[int, int]]:
+    """Map receipt hash -> (offset, length) for one segment, from its `.idx` sidecar."""
+    out: Dict[str, Tuple[int, int]] = {}
+    idx = segment.with_suffix(".idx")
+    if not idx.exists():
+        return out
+    for line in idx.read_text().splitlines():
+        h, off, length = line.split("\t")
+        out[h] = (int(off), int(length))
+    return out
+
+class _Pending:
+    __slots__ = ("payload", "domain", "loop", "future", "span")
+
+    def __init__(
+        self, payload: dict, domain: str, loop: asyncio.AbstractEventLoop, future: asyncio.Future, span: Optional[Span] = None
+    ) -> None:
+        self.payload = payload
+        self.domain = domain
+        self.loop = loop
+        self.future = future
+        self.span = span
+
+def _settle(p: _Pending, result: Optional[str], exc: Optional[BaseException]) -> None:
+    def apply() -> None:
+        if p.future.done():
+            return
+        if exc is not None:
+            p.future.set_exception(exc)
+        else:
+            p.future.set_result(result)
+    try:
+        p.loop.call_soon_threadsafe(apply)
+    except RuntimeError:  # loop already closed; nobody is waiting
+        pass
+
+class ReceiptSink:
+    """Queue receipts and commit them in batches from a background thread.
+
+    `segment` mode appends every receipt as one JSON line to a daily
+    `<domain>.segment.jsonl` file. Each batch is fsynced once (group commit) and
+    a `<domain>.segment.idx` sidecar records `hash<TAB>offset<TAB>length`.
+    Callers get `<segment>#<offset>` back once their batch is durable.
+    `files` mode keeps the historic one-JSON-file-per-receipt layout.
+    """
+
+    def __init__(self, root: Path = LEDGER_ROOT, mode: str = "segment", max_batch: int = 256) -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown receipt mode '{mode}' (expected one of {MODES})")
+        self.root = root
+        self.mode = mode
+        self.max_batch = max_batch
+        self._q: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    async def write(self, payload: dict, domain: str = "forge") -> str:
+        start = time.perf_counter()
+        with tracer.span("receipt.write", mode=self.mode, domain=domain) as span:
+            if self.mode == "files":
+                ref = str(await asyncio.to_thread(write_receipt, payload, domain, self.root))
+            else:
+                loop = asyncio.get_running_loop()
+                fut: asyncio.Future = loop.create_future()
+                self._ensure_thread()
+                self._q.put(_Pending(payload, domain, loop, fut, span if isinstance(span, Span) else None))
+                ref = await fut
+        receipt_write_seconds.labels(mode=self.mode).observe(time.perf_counter() - start)
+        return ref
+
+    def close(self) -> None:
+        """Drain everything queued so far and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._q.put(None)
+            thread.join()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="forge-receipts", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._q.get()
+            if first is None:
+                return
+            batch: List[_Pending] = [first]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch: List[_Pending]) -> None:
+        now = datetime.now(timezone.utc)
+        by_segment: Dict[Path, List[Tuple[_Pending, bytes, str]]] = {}
+        for p in batch:
+            try:
+                with tracer.span("receipt.encode", parent=p.span):
+                    body = dict(p.payload)
+                    body["hash"] = blake3(json.dumps(body, sort_keys=True).encode()).hexdigest()
+                    line = (json.dumps(body, sort_keys=True) + "\n").encode()
+            except Exception as exc:  # noqa: BLE001
+                _settle(p, None, exc)
+                continue
+            by_segment.setdefault(segment_path(self.root, p.domain, now), []).append((p, line, body["hash"]))
+
+        for seg, items in by_segment.items():
+            try:
+                seg.parent.mkdir(parents=True, exist_ok=True)
+                refs: List[str] = []
+                index_lines: List[str] = []
+                with tracer.span("receipt.commit", parent=items[0][0].span, batch=len(items)), open(seg, "ab") as fh:
+                    # Other worker processes may share the segment; hold the
+                    # lock until the index is written so offsets stay in order.
+                    if fcntl is not None:
+                        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                    offset = fh.seek(0, os.SEEK_END)
+                    for _, line, h in items:
+                        fh.write(line)
+                        refs.append(f"{seg}#{offset}")
+                        index_lines.append(f"{h}\t{offset}\t{len(line)}\n")
+                        offset += len(line)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                    # The index is derivable from the segment, so it is not fsynced.
+                    with open(seg.with_suffix(".idx"), "a") as idx:
+                        idx.writelines(index_lines)
+            except Exception as exc:  # noqa: BLE001
+                for p, _, _ in items:
+                    _settle(p, None, exc)
+                continue
+            for (p, _, _), ref in zip(items, refs):
+                _settle(p, ref, None)
+
+_sinks: Dict[Path, ReceiptSink] = {}
+
+def get_sink(root: Path = LEDGER_ROOT) -> ReceiptSink:
+    """Process-wide sink for `root`, configured from settings."""
+    sink = _sinks.get(root)
+    if sink is None:
+        sink = _sinks[root] = ReceiptSink(root, mode=get_settings().receipt_mode)
+    return sink
+
+@atexit.register
+def _close_sinks() -> None:
+    for sink in _sinks.values():
+        sink.close()
@@ -0,0 +1,178 @@
+"""Cross-process event relay for multi-worker `forge-api`.
+
+The supervisor runs a `BusHub` on a local Unix socket. Every worker's
+`EventBus` forwards its events to the hub through a `BusRelay`; the hub stamps
+each with a global id and broadcasts it back to all workers, so SSE clients
+on any worker see one ordered stream and `Last-Event-ID` means the same thing
+everywhere. Frames are newline-delimited JSON.
+
+A worker's first frame is `{"hello": <last id>}`: events it numbered
+locally while the hub was unreachable stay below every id the hub hands
+out afterwards, so one worker never sees two events under the same id.
+"""
+
+from __future__ import annotations
+import asyncio
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .bus import Event, EventBus
+
+class BusHub:
+    """Assign global event ids and fan every event out to every connected worker."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._clients: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._seq = 0
+        hub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                last_id = hub._hello(self.rfile.readline())
+                with hub._lock:
+                    hub._seq = max(hub._seq, last_id)
+                    hub._clients.append(self.request)
+                try:
+                    for line in self.rfile:
+                        hub._broadcast(line)
+                finally:
+                    with hub._lock:
+                        if self.request in hub._clients:
+                            hub._clients.remove(self.request)
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        if path.exists():
+            path.unlink()
+        self._server = Server(str(path), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def connected(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    @staticmethod
+    def _hello(line: bytes) -> int:
+        try:
+            return int(json.loads(line).get("hello", 0))
+        except (ValueError, TypeError, AttributeError):
+            return 0
+
+    def _broadcast(self, line: bytes) -> None:
+        try:
+            msg = json.loads(line)
+        except ValueError:
+            return
+        with self._lock:
+            self._seq += 1
+            msg["id"] = self._seq
+            frame = (json.dumps(msg) + "\n").encode()
+            for sock in list(self._clients):
+                try:
+                    sock.sendall(frame)
+                except OSError:
+                    self._clients.remove(sock)
+
+    def start(self) -> "BusHub":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="forge-bus-hub", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for sock in clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+class BusRelay:
+    """Worker side of the hub connection, bound to the loop that connected it."""
+
+    def __init__(self, bus: "EventBus", path: Path, timeout: float = 5.0) -> None:
+        self.bus = bus
+        self.path = path
+        self.timeout = timeout
+        self._origin = uuid.uuid4().hex[:12]
+        self._refs = itertools.count(1)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._reader_task is not None and not self._reader_task.done()
+
+    async def connect(self) -> None:
+        async with self._lock:
+            if self.connected:
+                return
+            reader, self._writer = await asyncio.open_unix_connection(str(self.path))
+            self._writer.write((json.dumps({"hello": self.bus.last_id}) + "\n").encode())
+            await self._writer.drain()
+            self._reader_task = asyncio.create_task(self._read(reader))
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        from .bus import Event
+
+        try:
+            while line := await reader.readline():
+                msg = json.loads(line)
+                ev = Event(msg["id"], msg["event"], msg["data"], msg.get("topic"))
+                self.bus.deliver(ev)
+                fut = self._pending.pop(msg.get("ref", ""), None)
+                if fut is not None and not fut.done():
+                    fut.set_result(ev)
+        finally:
+            pending, self._pending = self._pending, {}
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_exception(ConnectionError("bus hub connection lost"))
+
+    async def publish(self, event: str, data: Dict[str, Any], topic: Optional[str]) -> "Event":
+        """Send through the hub and wait for the broadcast copy, which carries the global id."""
+        if not self.connected:
+            await self.connect()
+        assert self._writer is not None
+        ref = f"{self._origin}:{next(self._refs)}"
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[ref] = fut
+        try:
+            self._writer.write((json.dumps({"ref": ref, "event": event, "data": data, "topic": topic}) + "\n").encode())
+            await self._writer.drain()
+            return await asyncio.wait_for(fut, self.timeout)
+        finally:
+            self._pending.pop(ref, None)
+
+    async def close(self) -> None:
+        task, self._reader_task = self._reader_task, None
+        writer, self._writer = self._writer, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
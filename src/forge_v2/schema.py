@@ -1,12 +1,73 @@
-from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Literal, Optional
+
+class StepCache(BaseModel):
+    ttl: float = Field(gt=0, description="Seconds a successful result may be reused.")
+    backend: Literal["memory", "disk"] = "memory"
+
+class SingleFlight(BaseModel):
+    window: float = Field(default=0.0, ge=0, description="Seconds a finished run still answers identical requests.")
 
 class Step(BaseModel):
     call: str
     with_: Dict[str, Any] = Field(default_factory=dict, alias="with")
+    id: Optional[str] = Field(default=None, description="Step key used by `needs`; defaults to `call`.")
+    needs: Optional[List[str]] = Field(default=None, description="Step keys that must succeed before this step starts.")
+    parallel: bool = Field(default=False, description="Do not implicitly wait for the previous step.")
+    cache: Optional[StepCache] = Field(default=None, description="Reuse results for identical call, args and inputs.")
+
+    @property
+    def key(self) -> str:
+        return self.id or self.call
 
 class Ritual(BaseModel):
     steps: List[Step]
+    concurrency: Optional[int] = Field(default=None, ge=1, description="Max steps in flight; defaults to settings.")
+    single_flight: Optional[SingleFlight] = Field(default=None, description="Concurrent API runs join one execution.")
+
+    @model_validator(mode="after")
+    def _check_graph(self) -> "Ritual":
+        keys = [s.key for s in self.steps]
+        if len(set(keys)) != len(keys):
+            raise ValueError("duplicate step keys; give repeated calls an explicit `id`")
+        for s in self.steps:
+            for dep in s.needs or []:
+                if dep not in keys:
+                    raise ValueError(f"step '{s.key}' needs unknown step '{dep}'")
+        # Kahn's algorithm: every step must become ready eventually.
+        deps = self.dependencies()
+        ready = [k for k in keys if not deps[k]]
+        seen = 0
+        remaining = {k: set(v) for k, v in deps.items()}
+        while ready:
+            done = ready.pop()
+            seen += 1
+            for k, pending in remaining.items():
+                if done in pending:
+                    pending.discard(done)
+                    if not pending:
+                        ready.append(k)
+        if seen != len(keys):
+            raise ValueError("step dependencies form a cycle")
+        return self
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Resolve each step's prerequisites.
+
+        Explicit `needs` wins; a `parallel` step has none; otherwise a step waits
+        for the one declared before it, which keeps plain lists sequential.
+        """
+        out: Dict[str, List[str]] = {}
+        prev: Optional[str] = None
+        for s in self.steps:
+            if s.needs is not None:
+                out[s.key] = list(s.needs)
+            elif s.parallel or prev is None:
+                out[s.key] = []
+            else:
+                out[s.key] = [prev]
+            prev = s.key
+        return out
 
 class ForgeConfig(BaseModel):
     rituals: Dict[str, Ritual]
@@ -18,4 +79,5 @@ class Receipt(BaseModel):
     ok: bool
     ts: str
     data: Dict[str, Any] = Field(default_factory=dict)
+    cached: bool = False
     hash: Optional[str] = None
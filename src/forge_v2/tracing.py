@@ -0,0 +1,200 @@
+"""Minimal OpenTelemetry-compatible spans for rituals, steps and receipts.
+
+Spans follow the OTel data model (trace/span ids, parent, start/end in unix
+nanoseconds, attributes, status) without depending on the SDK. The default
+exporter drops everything; `FORGE_TRACE_EXPORTER=file` appends one
+OTLP-JSON `ExportTraceServiceRequest` per line to `FORGE_TRACE_FILE`, the
+format the OTel collector's file exporter writes and its otlpjsonfile
+receiver reads.
+"""
+
+from __future__ import annotations
+import atexit
+import contextvars
+import json
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+from .config import get_settings
+
+SERVICE_NAME = "forge_v2"
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "ok", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.ok = True
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_status(self, ok: bool, error: Optional[str] = None) -> None:
+        self.ok = ok
+        self.error = error
+
+    def otlp(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_attr(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 1} if self.ok else {"code": 2, "message": self.error or ""},
+        }
+        if self.parent_id:
+            out["parentSpanId"] = self.parent_id
+        return out
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_status(self, ok: bool, error: Optional[str] = None) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+def _attr(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        v: Dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        v = {"intValue": str(value)}
+    elif isinstance(value, float):
+        v = {"doubleValue": value}
+    else:
+        v = {"stringValue": str(value)}
+    return {"key": key, "value": v}
+
+class NoopExporter:
+    enabled = False
+
+    def export(self, span: Span) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+class FileExporter:
+    """Append finished spans as OTLP-JSON lines from a background writer thread.
+
+    `export` only enqueues, so spans ending on the event loop never touch the
+    file; the writer drains up to `batch` queued spans into each line.
+    """
+
+    enabled = True
+
+    def __init__(self, path: Path, batch: int = 64) -> None:
+        self.path = path
+        self.batch = batch
+        self._q: "queue.Queue[Union[Span, threading.Event]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        self._ensure_thread()
+        self._q.put(span)
+
+    def flush(self) -> None:
+        """Block until every span exported so far is on disk."""
+        with self._lock:
+            if self._thread is None:
+                return
+        done = threading.Event()
+        self._q.put(done)
+        done.wait()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="forge-traces", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._q.get()
+            spans: List[Span] = []
+            waiters: List[threading.Event] = []
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    spans.append(item)
+                if len(spans) >= self.batch:
+                    break
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+            if spans:
+                try:
+                    self._write(spans)
+                except Exception:  # noqa: BLE001 - drop the batch, keep the writer
+                    pass
+            for done in waiters:
+                done.set()
+
+    def _write(self, spans: List[Span]) -> None:
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_attr("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": [s.otlp() for s in spans]}],
+            }]
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as fh:
+            fh.write(json.dumps(request) + "\n")
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("forge_span", default=None)
+
+class Tracer:
+    def __init__(self, exporter: Any = None) -> None:
+        self.exporter = exporter or NoopExporter()
+
+    def current(self) -> Optional[Span]:
+        return _current.get()
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Iterator[Any]:
+        """Time a block as a child of `parent`, or of the current span in this context."""
+        if not self.exporter.enabled:
+            yield NOOP_SPAN
+            return
+        span = Span(name, parent if parent is not None else _current.get(), attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set_status(False, f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            self.exporter.export(span)
+
+def _from_settings() -> Tracer:
+    s = get_settings()
+    if s.trace_exporter == "file":
+        return Tracer(FileExporter(s.trace_file))
+    if s.trace_exporter != "none":
+        raise ValueError(f"unknown trace exporter '{s.trace_exporter}' (expected 'none' or 'file')")
+    return Tracer()
+
+tracer = _from_settings()
+
+@atexit.register
+def _flush() -> None:
+    tracer.exporter.flush()
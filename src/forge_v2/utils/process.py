@@ -0,0 +1,99 @@
+"""Async subprocess runner shared by the shell-backed adapters."""
+
+from __future__ import annotations
+import asyncio
+import os
+import signal
+import weakref
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Sequence
+from ..config import get_settings
+
+LineCallback = Callable[[str, str], Optional[Awaitable[None]]]
+
+# One limiter per event loop: asyncio primitives must not cross loops.
+_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+@dataclass
+class ProcessResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _slots.get(loop)
+    if sem is None:
+        sem = _slots[loop] = asyncio.Semaphore(get_settings().max_subprocesses)
+    return sem
+
+async def _pump(stream: asyncio.StreamReader, name: str, sink: list[str], on_line: LineCallback | None) -> None:
+    while True:
+        raw = await stream.readline()
+        if not raw:
+            return
+        line = raw.decode(errors="replace")
+        sink.append(line)
+        if on_line is not None:
+            maybe = on_line(name, line)
+            if maybe is not None:
+                await maybe
+
+async def _reap(proc: asyncio.subprocess.Process) -> None:
+    """Kill the child's whole process group (grandchildren included) and wait for it."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        elif proc.returncode is None:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+    await proc.wait()
+
+async def run_process(
+    argv: Sequence[str],
+    timeout: float | None = None,
+    on_line: LineCallback | None = None,
+) -> ProcessResult:
+    """Run `argv` without blocking the event loop.
+
+    stdout/stderr are read line by line as they arrive (and handed to
+    `on_line` when given). At most `settings.max_subprocesses` children run at
+    once. Each child leads its own process group; on timeout or cancellation
+    the group is killed and the child reaped.
+    Raises FileNotFoundError when the executable is missing.
+    """
+    async with _semaphore():
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=hasattr(os, "killpg"),
+        )
+        out: list[str] = []
+        err: list[str] = []
+        pumps = asyncio.gather(
+            _pump(proc.stdout, "stdout", out, on_line),  # type: ignore[arg-type]
+            _pump(proc.stderr, "stderr", err, on_line),  # type: ignore[arg-type]
+            proc.wait(),
+        )
+        timed_out = False
+        try:
+            await asyncio.wait_for(pumps, timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            await _reap(proc)
+        except asyncio.CancelledError:
+            await _reap(proc)
+            raise
+        return ProcessResult(
+            returncode=proc.returncode if proc.returncode is not None else -1,
+            stdout="".join(out),
+            stderr="".join(err),
+            timed_out=timed_out,
+        )
@@ -0,0 +1,38 @@
+"""Coalesce concurrent identical calls into one execution."""
+
+from __future__ import annotations
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+class SingleFlight:
+    """Share one in-flight task per key among every caller that asks for it.
+
+    After the task finishes successfully its result stays shareable for
+    `window` seconds, so near-simultaneous callers that just missed it still
+    join. Failures are never shared past completion. The shared task is
+    shielded: a caller that goes away does not cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], window: float = 0.0) -> Tuple[Any, bool]:
+        """Return `(result, joined)`; `joined` is True when another caller led."""
+        task = self._calls.get(key)
+        if task is not None:
+            return await asyncio.shield(task), True
+        task = asyncio.create_task(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda t: self._finished(key, t, window))
+        return await asyncio.shield(task), False
+
+    def _finished(self, key: str, task: asyncio.Task, window: float) -> None:
+        failed = task.cancelled() or task.exception() is not None
+        if failed or window <= 0:
+            self._forget(key, task)
+        else:
+            asyncio.get_running_loop().call_later(window, self._forget, key, task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
@@ -0,0 +1,264 @@
+import hashlib
+import importlib.util
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+FORGE_SCRIPT = BASE / "catalog" / "cyber" / "forge.py"
+
+
+def load_forge():
+    spec = importlib.util.spec_from_file_location("cyber_forge_mod", FORGE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # lets the --batch process pool pickle its task function
+    spec.loader.exec_module(module)
+    return module
+
+
+def reference_root(forge, leaves):
+    """RFC 6962 MTH computed directly from the leaf list."""
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return forge.node_hash(reference_root(forge, leaves[:k]), reference_root(forge, leaves[k:]))
+
+
+def test_merkle_log_roots_and_proofs(tmp_path: Path):
+    forge = load_forge()
+    leaves = [forge.leaf_hash(hashlib.sha256(str(i).encode()).digest()) for i in range(21)]
+    roots = {}
+    with forge.MerkleLog(tmp_path / "merkle") as tree:
+        for n, leaf in enumerate(leaves, start=1):
+            assert tree.append(leaf) == n - 1
+            roots[n] = tree.root()
+            assert roots[n] == reference_root(forge, leaves[:n])
+
+        size = tree.size
+        for i, leaf in enumerate(leaves):
+            proof = tree.inclusion_proof(i)
+            assert forge.verify_inclusion(leaf, i, size, proof, roots[size])
+            assert not forge.verify_inclusion(leaves[(i + 1) % size], i, size, proof, roots[size])
+
+        for old in range(1, size + 1):
+            for new in range(old, size + 1):
+                proof = tree.consistency_proof(old, new)
+                assert forge.verify_consistency(old, new, roots[old], roots[new], proof), (old, new)
+                if old < new:
+                    assert not forge.verify_consistency(old, new, roots[new], roots[new], proof)
+
+
+def test_repair_rebuilds_parents_after_torn_append(tmp_path: Path):
+    forge = load_forge()
+    with forge.MerkleLog(tmp_path) as tree:
+        for i in range(8):
+            tree.append(forge.leaf_hash(bytes([i]) * 32))
+        expected = tree.root()
+    (tmp_path / "level-03.bin").unlink()
+    with open(tmp_path / "level-01.bin", "ab") as fh:
+        fh.write(b"torn")
+    with forge.MerkleLog(tmp_path) as tree:
+        tree.repair()
+        assert tree.root() == expected
+
+
+def test_strike_records_leaf_and_verify_cli(tmp_path: Path):
+    forge = load_forge()
+    base = tmp_path / "catalog"
+    base.mkdir()
+    ores = []
+    for i in range(3):
+        ore = base / f"ore{i}.txt"
+        ore.write_text(f"ore {i}")
+        ores.append(ore)
+        forge.strike(ore, base, timestamp_override="2025-01-01T00:00:00Z")
+    forge.strike(ores[0], base, timestamp_override="2025-01-01T00:00:00Z")  # re-strike is not re-appended
+
+    index = json.loads((base / "artifact_index.json").read_text())
+    assert index["tree_size"] == 3
+    first = hashlib.sha256(b"ore 0").hexdigest()
+    receipt = json.loads((base / "receipts" / f"{first[:16]}.json").read_text())
+    assert receipt["leaf_index"] == 0
+
+    result = subprocess.run(
+        [sys.executable, str(FORGE_SCRIPT), "--base-dir", str(base), "--verify", first[:16]],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    report = json.loads(result.stdout)
+    assert report["ok"] and report["merkle_root"] == index["merkle_root"]
+
+    (base / "archive" / first[:2] / first[2:4] / f"{first}.vmf").write_text("tampered")
+    assert forge.verify(first, base)["problems"] == ["archived artifact missing or altered"]
+
+
+def test_batch_strike_matches_sequential_strikes(tmp_path: Path):
+    forge = load_forge()
+    ores = tmp_path / "ores"
+    ores.mkdir()
+    for i in range(7):
+        (ores / f"ore{i}.txt").write_text(f"ore {i % 5}")  # two duplicates re-use their leaves
+    manifest = ores / "manifest.txt"
+    manifest.write_text("\n".join(f"ore{i}.txt" for i in (3, 0, 1, 2, 4, 5, 6, 0)) + "\n")
+    order = list(forge.batch_inputs(str(manifest)))
+
+    outputs = {}
+    for mode in ("sequential", "batch"):
+        base = tmp_path / mode
+        base.mkdir()
+        if mode == "batch":
+            summary = forge.strike_batch(order, base, timestamp_override="2025-01-01T00:00:00Z", workers=2)
+            assert summary["forged"] == 8 and summary["tree_size"] == 5
+        else:
+            for ore in order:
+                forge.strike(ore, base, timestamp_override="2025-01-01T00:00:00Z")
+        outputs[mode] = {
+            str(p.relative_to(base)): p.read_bytes() for p in sorted(base.rglob("*")) if p.is_file() and p.name != ".lock"
+        }
+    assert outputs["batch"] == outputs["sequential"]
+
+
+def test_content_store_dedupes_and_hashes_raw_bytes(tmp_path: Path):
+    forge = load_forge()
+    big = tmp_path / "big.bin"
+    data = bytes(range(256)) * 9000 + b"\r\n tail"  # spans several chunks; CRLF is kept as-is
+    big.write_bytes(data)
+    digest = hashlib.sha256(data).hexdigest()
+    assert forge.hash_file(big, chunk_size=4096) == digest
+
+    store = forge.ContentStore(tmp_path / "archive")
+    assert store.put(big) == (digest, True)
+    blob = store.path(digest)
+    assert blob == tmp_path / "archive" / digest[:2] / digest[2:4] / f"{digest}.vmf"
+    assert blob.read_bytes() == data
+    inode = blob.stat().st_ino
+
+    copy = tmp_path / "copy.bin"
+    copy.write_bytes(data)
+    assert store.put(copy) == (digest, False)
+    assert blob.stat().st_ino == inode
+    assert [p.name for p in blob.parent.iterdir()] == [blob.name]  # no temp files left behind
+
+    legacy = tmp_path / "archive" / "0123456789abcdef.vmf"
+    legacy.write_text("old")
+    assert store.find("0123456789abcdef" + "0" * 48) == legacy
+
+
+def test_batch_skips_missing_ore_and_still_writes_index(tmp_path: Path):
+    forge = load_forge()
+    base = tmp_path / "catalog"
+    base.mkdir()
+    for i in range(3):
+        (tmp_path / f"ore{i}.txt").write_text(f"ore {i}")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("ore0.txt\nmissing.txt\nore1.txt\nore2.txt\n")
+
+    result = subprocess.run(
+        [sys.executable, str(FORGE_SCRIPT), "--base-dir", str(base), "--batch", str(manifest), "--workers", "2"],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 1
+    assert f"✖ ORE not found: {tmp_path / 'missing.txt'}" in result.stdout
+
+    index = json.loads((base / "artifact_index.json").read_text())
+    assert index["tree_size"] == 3
+    for i in range(3):
+        report = forge.verify(hashlib.sha256(f"ore {i}".encode()).hexdigest(), base)
+        assert report["ok"] and report["merkle_root"] == index["merkle_root"]
+
+
+def test_legacy_catalog_migration_backfills_receipts(tmp_path: Path):
+    forge = load_forge()
+    base = tmp_path / "catalog"
+    (base / "receipts").mkdir(parents=True)
+    (base / "archive").mkdir()
+    legacy = []
+    for i in range(3):
+        ore = base / f"legacy{i}.txt"
+        ore.write_text(f"legacy {i}")
+        digest = hashlib.sha256(f"legacy {i}".encode()).hexdigest()
+        legacy.append(digest)
+        (base / "archive" / f"{digest[:16]}.vmf").write_text(f"legacy {i}")
+        (base / "receipts" / f"{digest[:16]}.json").write_text(json.dumps({
+            "artifact_hash": digest,
+            "ore_path": f"catalog/legacy{i}.txt",
+            "timestamp_utc": "2024-01-01T00:00:00Z",
+            "signature_simulated": f"signed-by(simulated-key-for-{digest[:8]})",
+        }))
+    (base / "artifact_index.json").write_text(json.dumps({"artifacts": legacy, "merkle_root": "old"}))
+
+    new = base / "new.txt"
+    new.write_text("new")
+    forge.strike(new, base, timestamp_override="2025-01-01T00:00:00Z")
+    for i, digest in enumerate(sorted(legacy)):
+        receipt = json.loads((base / "receipts" / f"{digest[:16]}.json").read_text())
+        assert (receipt["leaf_index"], receipt["tree_size"]) == (i, 3)
+        assert forge.verify(digest, base)["ok"]
+
+    forge.strike(base / "legacy1.txt", base, timestamp_override="2025-01-01T00:00:00Z")  # no duplicate leaf
+    index = json.loads((base / "artifact_index.json").read_text())
+    assert index["tree_size"] == 4
+    assert "artifacts" not in index
+    log = (base / index["artifacts_log"]).read_text().split()
+    assert log == sorted(legacy) + [hashlib.sha256(b"new").hexdigest()]
+
+    # Receipts from a catalog migrated before backfilling are found by leaf hash.
+    receipt_path = base / "receipts" / f"{legacy[2][:16]}.json"
+    receipt = json.loads(receipt_path.read_text())
+    for key in ("leaf_index", "tree_size", "merkle_root"):
+        receipt.pop(key)
+    receipt_path.write_text(json.dumps(receipt))
+    assert forge.verify(legacy[2], base)["ok"]
+    forge.strike(base / "legacy2.txt", base, timestamp_override="2025-01-01T00:00:00Z")
+    assert json.loads((base / "artifact_index.json").read_text())["tree_size"] == 4
+
+
+def test_concurrent_strikes_keep_a_complete_index(tmp_path: Path):
+    forge = load_forge()
+    base = tmp_path / "catalog"
+    base.mkdir()
+    ores = []
+    for i in range(16):
+        ore = base / f"ore{i}.txt"
+        ore.write_text(f"ore {i}")
+        ores.append(ore)
+
+    def run(ore):
+        return subprocess.run([sys.executable, str(FORGE_SCRIPT), "--base-dir", str(base), str(ore)],
+                              capture_output=True, text=True)
+
+    with ThreadPoolExecutor(len(ores)) as pool:
+        assert all(r.returncode == 0 for r in pool.map(run, ores))
+
+    index = json.loads((base / "artifact_index.json").read_text())
+    log = (base / "artifact_index.log").read_text().split()
+    hashes = {hashlib.sha256(f"ore {i}".encode()).hexdigest() for i in range(16)}
+    assert index["tree_size"] == 16
+    assert len(log) == 16 and set(log) == hashes
+    with forge.MerkleLog(base / "merkle") as tree:
+        assert index["merkle_root"] == tree.root().hex()
+        assert [tree.leaf(i) for i in range(16)] == [forge.leaf_hash(bytes.fromhex(h)) for h in log]
+    for artifact_hash in hashes:
+        assert forge.verify(artifact_hash, base)["ok"]
+
+
+def test_catalog_without_artifact_log_is_migrated_in_leaf_order(tmp_path: Path):
+    forge = load_forge()
+    base = tmp_path / "catalog"
+    base.mkdir()
+    hashes = []
+    for i in range(3):
+        ore = base / f"ore{i}.txt"
+        ore.write_text(f"ore {2 - i}")
+        forge.strike(ore, base)
+        hashes.append(hashlib.sha256(f"ore {2 - i}".encode()).hexdigest())
+    (base / "artifact_index.log").unlink()  # as written before the log existed
+
+    extra = base / "extra.txt"
+    extra.write_text("extra")
+    forge.strike(extra, base)
+    assert (base / "artifact_index.log").read_text().split() == hashes + [hashlib.sha256(b"extra").hexdigest()]
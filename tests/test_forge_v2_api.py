@@ -0,0 +1,199 @@
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import yaml
+from fastapi.testclient import TestClient
+
+from forge_v2 import api, orchestrator
+from forge_v2.jobs import JobQueue
+from forge_v2.plan import PlanCache
+
+
+@pytest.fixture
+def client(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    started: list[str] = []
+
+    def step(tag):
+        async def fn(opts):
+            started.append(tag)
+            await asyncio.sleep(0.2)
+            return {"ok": True}
+        return fn
+
+    registry = {tag: step(tag) for tag in "abc"}
+    Path("Forgefile.yaml").write_text(yaml.safe_dump({"rituals": {
+        tag: {"steps": [{"call": tag}]} for tag in "abc"
+    }}))
+    plans = PlanCache(registry, tmp_path / "Forgefile.yaml")
+    monkeypatch.setattr(orchestrator, "REGISTRY", registry)
+    monkeypatch.setattr(orchestrator, "plans", plans)
+    monkeypatch.setattr(api, "plans", plans)
+    monkeypatch.setattr(api, "jobs", JobQueue(orchestrator.run_ritual, workers=1, max_depth=2))
+    with TestClient(api.app) as c:
+        yield c, started
+
+
+def wait_final(client, run_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        view = client.get(f"/api/forge/runs/{run_id}").json()
+        if view["status"] not in ("queued", "running"):
+            return view
+        time.sleep(0.02)
+    raise AssertionError(f"run {run_id} did not finish")
+
+
+def test_async_runs_are_queued_by_priority_with_admission_control(client):
+    client, started = client
+    first = client.post("/api/forge/run?async=1", json={"name": "a"})
+    assert first.status_code == 202
+    time.sleep(0.05)  # let the single worker pick it up
+    low = client.post("/api/forge/run?async=1&priority=5", json={"name": "b"}).json()
+    high = client.post("/api/forge/run?async=1&priority=0", json={"name": "c"}).json()
+    full = client.post("/api/forge/run?async=1", json={"name": "a"})
+    assert full.status_code == 429
+
+    for run in (first.json(), low, high):
+        assert wait_final(client, run["id"])["status"] == "succeeded"
+    assert started == ["a", "c", "b"]
+    assert wait_final(client, high["id"])["result"]["ok"] is True
+
+
+def test_cancel_queued_and_running_runs(client):
+    client, started = client
+    running = client.post("/api/forge/run?async=1", json={"name": "a"}).json()
+    queued = client.post("/api/forge/run?async=1", json={"name": "b"}).json()
+    time.sleep(0.05)
+
+    assert client.delete(f"/api/forge/runs/{queued['id']}").json()["status"] == "cancelled"
+    client.delete(f"/api/forge/runs/{running['id']}")
+
+    assert wait_final(client, running["id"])["status"] == "cancelled"
+    assert started == ["a"]
+    assert client.get("/api/forge/runs/nope").status_code == 404
+    assert client.post("/api/forge/run?async=1", json={"name": "zzz"}).status_code == 404
+
+
+def test_cancelled_runs_free_their_queue_slot(client):
+    client, started = client
+    running = client.post("/api/forge/run?async=1", json={"name": "a"}).json()
+    time.sleep(0.05)
+    client.post("/api/forge/run?async=1", json={"name": "b"})
+    for _ in range(5):  # churn past max_depth without the worker draining anything
+        queued = client.post("/api/forge/run?async=1", json={"name": "c"})
+        assert queued.status_code == 202
+        assert client.post("/api/forge/run?async=1", json={"name": "c"}).status_code == 429
+        client.delete(f"/api/forge/runs/{queued.json()['id']}")
+    last = client.post("/api/forge/run?async=1", json={"name": "c"}).json()
+
+    assert api.jobs._q.qsize() <= 2 * api.jobs.max_depth
+    assert wait_final(client, last["id"])["status"] == "succeeded"
+    assert wait_final(client, running["id"])["status"] == "succeeded"
+    assert started == ["a", "b", "c"]
+
+
+def test_admin_reload_swaps_in_a_valid_forgefile_and_keeps_the_plan_on_error(client):
+    client, started = client
+    before = api.plans.get()
+    Path("Forgefile.yaml").write_text(yaml.safe_dump({"rituals": {
+        "ab": {"steps": [{"call": "a"}, {"call": "b", "needs": ["a"]}]},
+    }}))
+
+    reloaded = client.post("/api/forge/admin/reload")
+    assert reloaded.status_code == 200
+    body = reloaded.json()
+    assert body["rituals"] == ["ab"] and body["digest"] != before.digest
+    assert api.plans.get().digest == body["digest"]
+    assert client.post("/api/forge/run", json={"name": "ab"}).status_code == 200
+    assert client.post("/api/forge/run?async=1", json={"name": "a"}).status_code == 404
+    assert started == ["a", "b"]
+
+    Path("Forgefile.yaml").write_text(yaml.safe_dump({"rituals": {
+        "loop": {"steps": [{"call": "a", "needs": ["b"]}, {"call": "b", "needs": ["a"]}]},
+    }}))
+    rejected = client.post("/api/forge/admin/reload")
+    assert rejected.status_code == 422
+    assert "Forgefile invalid" in rejected.json()["detail"]
+    assert api.plans.get().digest == body["digest"]
+    assert client.post("/api/forge/run", json={"name": "ab"}).status_code == 200
+    assert started == ["a", "b", "a", "b"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def multi_worker_api(tmp_path: Path):
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "self_test.sh").write_text("sleep 2\n")
+    (tmp_path / "Forgefile.yaml").write_text(yaml.safe_dump({"rituals": {
+        "slow": {"steps": [{"call": "system.selftest"}]},
+    }}))
+    port = free_port()
+    env = {k: v for k, v in os.environ.items() if k not in ("FORGE_BUS_SOCKET", "PROMETHEUS_MULTIPROC_DIR")}
+    server = subprocess.Popen(
+        [sys.executable, "-c", "from forge_v2.api import main; main()",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", "2"],
+        cwd=tmp_path, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"{base}/healthz").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            assert time.monotonic() < deadline and server.poll() is None, "forge-api did not start"
+            time.sleep(0.1)
+        time.sleep(1)  # let the second worker finish starting too
+        yield base
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def poll_final(base: str, run_id: str, timeout: float = 15.0) -> tuple:
+    """Poll over fresh connections so requests land on every worker; returns (final view, status codes)."""
+    codes = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = httpx.get(f"{base}/api/forge/runs/{run_id}", headers={"Connection": "close"})
+        codes.append(response.status_code)
+        if response.status_code == 200 and response.json()["status"] not in ("queued", "running"):
+            return response.json(), codes
+        time.sleep(0.05)
+    raise AssertionError(f"run {run_id} did not finish: {codes[-5:]}")
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="the event hub needs Unix sockets")
+def test_async_runs_are_visible_and_cancellable_from_every_worker(multi_worker_api):
+    base = multi_worker_api
+    done = httpx.post(f"{base}/api/forge/run?async=1", json={"name": "slow"}).json()
+    doomed = httpx.post(f"{base}/api/forge/run?async=1", json={"name": "slow"}).json()
+
+    cancels = [httpx.delete(f"{base}/api/forge/runs/{doomed['id']}", headers={"Connection": "close"}) for _ in range(4)]
+    assert [r.status_code for r in cancels] == [200] * 4
+
+    cancelled, codes = poll_final(base, doomed["id"])
+    assert cancelled["status"] == "cancelled"
+    finished, more = poll_final(base, done["id"])
+    assert finished["status"] == "succeeded"
+    assert set(codes + more) == {200}
+    assert httpx.get(f"{base}/api/forge/runs/nope").status_code == 404
@@ -0,0 +1,31 @@
+import json
+from pathlib import Path
+
+from forge_v2 import bench
+
+
+def test_regression_gate_respects_direction():
+    baseline = {
+        "fast": {"value": 100.0, "unit": "ops/s", "better": "higher"},
+        "slow": {"value": 10.0, "unit": "ms", "better": "lower"},
+    }
+    current = {
+        "fast": {"value": 85.0, "unit": "ops/s", "better": "higher"},
+        "slow": {"value": 13.0, "unit": "ms", "better": "lower"},
+        "new": {"value": 1.0, "unit": "ms", "better": "lower"},
+    }
+
+    assert bench.regressions(current, baseline, 0.2) == ["slow: 10 -> 13 ms (30% worse)"]
+    assert bench.regressions(current, baseline, 0.5) == []
+
+
+def test_cli_writes_results_and_fails_on_regression(tmp_path: Path):
+    out = tmp_path / "bench.json"
+    assert bench.main(["--quick", "--only", "bus", "--subscribers", "2", "--output", str(out)]) == 0
+    report = json.loads(out.read_text())
+    assert set(report["results"]) == {"bus.fanout[2]"}
+
+    inflated = tmp_path / "baseline.json"
+    report["results"]["bus.fanout[2]"]["value"] *= 100
+    inflated.write_text(json.dumps(report))
+    assert bench.main(["--quick", "--only", "bus", "--subscribers", "2", "--baseline", str(inflated)]) == 1
@@ -0,0 +1,160 @@
+import asyncio
+
+from forge_v2.bus import EventBus
+from forge_v2.relay import BusHub
+
+
+async def drain(sub) -> list[int]:
+    seen = []
+    while sub._buf:
+        seen.append(sub._buf.popleft().id)
+    return seen
+
+
+def test_every_subscriber_sees_every_event():
+    async def main():
+        bus = EventBus()
+        a, b = bus.subscribe(), bus.subscribe()
+        for i in range(3):
+            await bus.publish("step", {"i": i}, topic="daily-anchor")
+        return await drain(a), await drain(b)
+
+    assert asyncio.run(main()) == ([1, 2, 3], [1, 2, 3])
+
+
+def test_topic_filter_and_replay():
+    async def main():
+        bus = EventBus(history=10)
+        await bus.publish("ritual", {}, topic="seal-doc")
+        await bus.publish("ritual", {}, topic="daily-anchor")
+        await bus.publish("ritual", {}, topic="daily-anchor")
+        sub = bus.subscribe(topics=["daily-anchor"], last_event_id=2)
+        return await drain(sub)
+
+    assert asyncio.run(main()) == [3]
+
+
+def test_slow_consumer_policies():
+    async def main():
+        out = {}
+        for policy in ("drop_oldest", "disconnect", "coalesce"):
+            bus = EventBus(maxsize=2, policy=policy)
+            sub = bus.subscribe()
+            for i in range(4):
+                await bus.publish("step", {"step": "s" if policy == "coalesce" else i})
+            out[policy] = (await drain(sub), sub.closed, bus.subscribers)
+        return out
+
+    out = asyncio.run(main())
+    assert out["drop_oldest"] == ([3, 4], False, 1)
+    assert out["disconnect"] == ([], True, 0)
+    assert out["coalesce"] == ([3, 4], False, 1)
+
+
+def test_coalesce_only_under_back_pressure_and_per_run_status():
+    async def main():
+        bus = EventBus(maxsize=3, policy="coalesce")
+        sub = bus.subscribe()
+        for run_id, step, status in [
+            ("r1", "a", "running"),
+            ("r1", "a", "running"),  # buffer not full: kept
+            ("r1", "b", "running"),
+            ("r1", "b", "running"),  # full: supersedes event 3
+            ("r2", "a", "running"),  # other run: oldest dropped instead
+            ("r1", "a", "done"),  # other status: oldest dropped instead
+            ("r1", "b", "running"),  # supersedes event 4
+        ]:
+            await bus.publish("step", {"run_id": run_id, "step": step, "status": status})
+        return await drain(sub), sub.dropped
+
+    assert asyncio.run(main()) == ([5, 6, 7], 4)
+
+
+def test_stream_unsubscribes_on_close():
+    async def main():
+        bus = EventBus()
+        agen = bus.stream()
+        pending = asyncio.ensure_future(agen.__anext__())
+        await asyncio.sleep(0)
+        await bus.publish("ritual", {"name": "x"})
+        first = await pending
+        await agen.aclose()
+        return first, bus.subscribers
+
+    first, remaining = asyncio.run(main())
+    assert first["id"] == "1" and first["event"] == "ritual"
+    assert remaining == 0
+
+
+def test_run_filter():
+    async def main():
+        bus = EventBus()
+        sub = bus.subscribe(runs=["r2"])
+        await bus.publish("step", {"run_id": "r1"})
+        await bus.publish("step", {"run_id": "r2"})
+        return await drain(sub)
+
+    assert asyncio.run(main()) == [2]
+
+
+def test_hub_relays_events_across_buses_with_global_ids(tmp_path):
+    hub = BusHub(tmp_path / "bus.sock").start()
+
+    async def main():
+        a, b = EventBus(), EventBus()
+        await a.attach(hub.path)
+        await b.attach(hub.path)
+        while hub.connected < 2:
+            await asyncio.sleep(0.01)
+        sub_a, sub_b = a.subscribe(), b.subscribe()
+        try:
+            first = await a.publish("ritual", {"run_id": "r1"}, topic="t")
+            second = await b.publish("ritual", {"run_id": "r2"}, topic="t")
+            while len(sub_a._buf) < 2 or len(sub_b._buf) < 2:
+                await asyncio.sleep(0.01)
+            return (first.id, second.id), await drain(sub_a), await drain(sub_b)
+        finally:
+            await a.detach()
+            await b.detach()
+
+    try:
+        ids, seen_a, seen_b = asyncio.run(asyncio.wait_for(main(), 5))
+    finally:
+        hub.close()
+    assert ids == (1, 2)
+    assert seen_a == seen_b == [1, 2]
+
+
+def test_local_fallback_ids_never_collide_with_hub_ids(tmp_path):
+    path = tmp_path / "bus.sock"
+    hubs = [BusHub(path).start()]
+
+    async def main():
+        bus = EventBus()
+        sub = bus.subscribe()
+        await bus.attach(path)
+        ids = [(await bus.publish("step", {"i": 0})).id]
+
+        hubs[0].close()
+        while bus._relay.connected:
+            await asyncio.sleep(0.01)
+        ids += [(await bus.publish("step", {"i": i})).id for i in (1, 2)]
+
+        hubs.append(BusHub(path).start())  # restarted hub counts from zero again
+        other = EventBus()
+        await other.attach(path)
+        ids.append((await bus.publish("step", {"i": 3})).id)
+        ids.append((await other.publish("step", {"i": 4})).id)
+        while len(sub._buf) < 5:
+            await asyncio.sleep(0.01)
+        await bus.detach()
+        await other.detach()
+        return ids, await drain(sub)
+
+    try:
+        ids, seen = asyncio.run(asyncio.wait_for(main(), 5))
+    finally:
+        hubs[-1].close()
+    assert ids[:3] == [1, 2, 3]
+    assert ids[3] > 3 and ids[4] > ids[3]
+    assert seen == ids
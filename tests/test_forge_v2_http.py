@@ -0,0 +1,162 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from forge_v2.adapters import grafana
+from forge_v2.http_clients import ClientConfig, HttpClients, clients
+
+
+@pytest.fixture
+def stub_server():
+    state = {"requests": [], "ports": set(), "fail": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            state["requests"].append(json.loads(body))
+            state["ports"].add(self.client_address[1])
+            status = 503 if state["fail"] > 0 else 200
+            state["fail"] -= 1
+            reply = b'{"id": 1}'
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def grafana_env(stub_server, monkeypatch):
+    monkeypatch.setenv("GRAFANA_URL", stub_server["url"])
+    monkeypatch.setenv("GRAFANA_API_KEY", "k")
+    clients.configure("grafana", ClientConfig(timeout=2, retries=2, backoff=0.01))
+    yield stub_server
+    clients.configure("grafana", ClientConfig())
+
+
+def test_annotations_coalesce_into_one_request(grafana_env):
+    async def main():
+        try:
+            return await asyncio.gather(*(grafana.annotate(f"step {i % 3}") for i in range(5)))
+        finally:
+            await clients.aclose()
+
+    results = asyncio.run(main())
+
+    assert [r["ok"] for r in results] == [True] * 5
+    assert {r["batched"] for r in results} == {5}
+    assert len(grafana_env["requests"]) == 1
+    assert grafana_env["requests"][0]["text"] == "step 0\nstep 1\nstep 2"
+
+
+def test_sent_post_is_not_retried_and_keeps_connection(grafana_env):
+    grafana_env["fail"] = 1
+
+    async def main():
+        try:
+            first = await grafana.annotate("a")
+            second = await grafana.annotate("b")
+            return first, second
+        finally:
+            await clients.aclose()
+
+    first, second = asyncio.run(main())
+
+    assert first["status"] == 503 and not first["ok"]
+    assert second["ok"]
+    assert len(grafana_env["requests"]) == 2
+    assert len(grafana_env["ports"]) == 1
+
+
+def flaky_client(errors, status=200):
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if errors:
+            raise errors.pop(0)(f"boom {len(calls)}", request=request)
+        return httpx.Response(status.pop(0) if isinstance(status, list) else status)
+
+    pool = HttpClients()
+    pool.configure("svc", ClientConfig(retries=2, backoff=0), transport=httpx.MockTransport(handler))
+    return pool, calls
+
+
+def test_only_unsent_requests_are_retried_for_post():
+    async def send(pool, method):
+        try:
+            return await pool.request("svc", method, "http://svc/x")
+        finally:
+            await pool.aclose()
+
+    pool, calls = flaky_client([httpx.ConnectError, httpx.ConnectError])
+    assert asyncio.run(send(pool, "POST")).status_code == 200
+    assert calls == ["POST"] * 3
+
+    pool, calls = flaky_client([httpx.ReadError])
+    with pytest.raises(httpx.ReadError):
+        asyncio.run(send(pool, "POST"))
+    assert calls == ["POST"]
+
+    pool, calls = flaky_client([httpx.ReadError])
+    assert asyncio.run(send(pool, "GET")).status_code == 200
+    assert calls == ["GET"] * 2
+
+    pool, calls = flaky_client([], status=[503, 200])
+    assert asyncio.run(send(pool, "GET")).status_code == 200
+    assert calls == ["GET"] * 2
+
+
+def test_dropped_clients_are_closed_on_their_loop():
+    pool = HttpClients()
+
+    async def reconfigure():
+        old = pool.get("svc")
+        pool.configure("svc", ClientConfig(timeout=1))
+        new = pool.get("svc")
+        await asyncio.sleep(0)
+        await pool.aclose()
+        return old, new
+
+    old, new = asyncio.run(reconfigure())
+    assert old.is_closed and new is not old
+
+    owner = asyncio.new_event_loop()
+    thread = threading.Thread(target=owner.run_forever, daemon=True)
+    thread.start()
+    try:
+        async def first_use():
+            return pool.get("svc")
+
+        stale = asyncio.run_coroutine_threadsafe(first_use(), owner).result(5)
+
+        async def switch_loop():
+            fresh = pool.get("svc")
+            for _ in range(100):
+                if stale.is_closed:
+                    break
+                await asyncio.sleep(0.01)
+            await pool.aclose()
+            return fresh
+
+        fresh = asyncio.run(switch_loop())
+        assert stale.is_closed and fresh is not stale
+    finally:
+        owner.call_soon_threadsafe(owner.stop)
+        thread.join(5)
+        owner.close()
@@ -0,0 +1,53 @@
+import asyncio
+import json
+import shlex
+import sys
+from pathlib import Path
+
+from blake3 import blake3
+
+from forge_v2.adapters import mcp
+from forge_v2.receipts import read_receipt
+
+SERVER = """
+import json, os, sys
+for line in sys.stdin:
+    msg = json.loads(line)
+    print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": {"pid": os.getpid()}}), flush=True)
+"""
+
+
+def test_ping_reuses_stdio_connection_and_writes_receipts(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MCP_ENDPOINT", f"stdio:{shlex.quote(sys.executable)} -c {shlex.quote(SERVER)}")
+    connects = []
+    connect = mcp.McpClient._connect
+
+    async def counting_connect(self):
+        connects.append(self.endpoint)
+        await connect(self)
+
+    monkeypatch.setattr(mcp.McpClient, "_connect", counting_connect)
+
+    async def main():
+        try:
+            return [await mcp.ping() for _ in range(3)]
+        finally:
+            await mcp.close()
+
+    results = asyncio.run(main())
+
+    assert all(r["ok"] for r in results)
+    assert all(r["rtt_ms"] >= 0 for r in results)
+    receipt = read_receipt(results[-1]["path"])
+    assert receipt["type"] == "mcp.ping"
+    assert receipt["output"]["pong"] is True
+    body = {k: v for k, v in receipt.items() if k != "hash"}
+    assert receipt["hash"] == blake3(json.dumps(body, sort_keys=True).encode()).hexdigest()
+    assert Path(results[-1]["path"].split("#")[0]).resolve().is_relative_to(tmp_path.resolve())
+    assert len(connects) == 1
+
+
+def test_ping_without_endpoint_is_skipped(monkeypatch):
+    monkeypatch.delenv("MCP_ENDPOINT", raising=False)
+    assert asyncio.run(mcp.ping()) == {"ok": True, "skipped": "MCP_ENDPOINT not set"}
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+from prometheus_client import REGISTRY
+
+from forge_v2 import orchestrator
+from forge_v2.cache import DiskBackend, ResultCache
+from forge_v2.plan import PlanCache
+from forge_v2.receipts import read_receipt
+from forge_v2.tracing import FileExporter, tracer
+from forge_v2.schema import ForgeConfig
+
+
+def make_config(steps: list[dict], **ritual) -> ForgeConfig:
+    return ForgeConfig.model_validate({"rituals": {"t": {"steps": steps, **ritual}}})
+
+
+def write_forgefile(path: Path, steps: list[dict], **ritual) -> None:
+    path.write_text(yaml.safe_dump({"rituals": {"t": {"steps": steps, **ritual}}}))
+
+
+@pytest.fixture
+def sandbox(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry: dict = {}
+    monkeypatch.setattr(orchestrator, "REGISTRY", registry)
+    monkeypatch.setattr(orchestrator, "plans", PlanCache(registry, tmp_path / "Forgefile.yaml"))
+    cache = ResultCache(tmp_path / "cache", max_entries=8)
+    monkeypatch.setattr(orchestrator, "get_cache", lambda: cache)
+    return registry
+
+
+def test_independent_steps_overlap(sandbox, monkeypatch):
+    log: list[str] = []
+
+    def sleeper(tag: str):
+        async def fn(opts):
+            log.append(f"{tag}:start")
+            await asyncio.sleep(0.05)
+            log.append(f"{tag}:end")
+            return {"ok": True}
+        return fn
+
+    for tag in ("a", "b", "c"):
+        sandbox[tag] = sleeper(tag)
+    write_forgefile(Path("Forgefile.yaml"), [
+        {"call": "a"},
+        {"call": "b", "parallel": True},
+        {"call": "c", "needs": ["a", "b"]},
+    ])
+
+    result = asyncio.run(orchestrator.run_ritual("t"))
+
+    assert result["ok"] is True
+    assert log[:2] == ["a:start", "b:start"]
+    assert log[-2:] == ["c:start", "c:end"]
+
+
+def test_failure_cancels_siblings(sandbox, monkeypatch):
+    cancelled: list[str] = []
+
+    async def slow(opts):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+        return {"ok": True}
+
+    async def boom(opts):
+        return {"ok": False}
+
+    async def after(opts):
+        raise AssertionError("dependent step must not run")
+
+    sandbox.update(slow=slow, boom=boom, after=after)
+    write_forgefile(Path("Forgefile.yaml"), [
+        {"call": "slow"},
+        {"call": "boom", "parallel": True},
+        {"call": "after", "needs": ["slow", "boom"]},
+    ])
+
+    result = asyncio.run(asyncio.wait_for(orchestrator.run_ritual("t"), 2))
+
+    assert result["ok"] is False
+    assert cancelled == ["slow"]
+
+
+def test_concurrency_limit(sandbox, monkeypatch):
+    active = 0
+    peak = 0
+
+    async def fn(opts):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"ok": True}
+
+    sandbox["s"] = fn
+    steps = [{"call": "s", "id": f"s{i}", "parallel": True} for i in range(6)]
+    write_forgefile(Path("Forgefile.yaml"), steps, concurrency=2)
+
+    assert asyncio.run(orchestrator.run_ritual("t"))["ok"] is True
+    assert peak == 2
+
+
+def test_plan_recompiles_only_on_content_change(tmp_path: Path):
+    forgefile = tmp_path / "Forgefile.yaml"
+    write_forgefile(forgefile, [{"call": "known"}, {"call": "missing"}])
+    cache = PlanCache({"known": object()}, forgefile)
+
+    first = cache.get()
+    assert cache.get() is first
+    assert first.unknown == {"t": ["missing"]}
+
+    os.utime(forgefile, ns=(0, 0))
+    assert cache.get() is first
+
+    write_forgefile(forgefile, [{"call": "known"}])
+    second = cache.get()
+    assert second is not first
+    assert second.unknown == {}
+
+
+def test_cycles_rejected():
+    with pytest.raises(ValueError):
+        make_config([
+            {"call": "a", "needs": ["b"]},
+            {"call": "b", "needs": ["a"]},
+        ])
+
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_cached_step_reuses_result_until_inputs_change(sandbox, backend):
+    calls: list[str] = []
+    version = {"v": 1}
+
+    async def source(opts):
+        return {"ok": True, "v": version["v"]}
+
+    async def expensive(opts):
+        calls.append(opts["x"])
+        return {"ok": True, "n": len(calls)}
+
+    sandbox.update(source=source, expensive=expensive)
+    write_forgefile(Path("Forgefile.yaml"), [
+        {"call": "source"},
+        {"call": "expensive", "with": {"x": 1}, "cache": {"ttl": 60, "backend": backend}},
+    ])
+
+    first = asyncio.run(orchestrator.run_ritual("t"))
+    second = asyncio.run(orchestrator.run_ritual("t"))
+    version["v"] = 2
+    third = asyncio.run(orchestrator.run_ritual("t"))
+
+    assert calls == [1, 1]
+    steps = [read_receipt(r["receipt"])["data"]["steps"][1] for r in (first, second, third)]
+    assert [s.get("cached", False) for s in steps] == [False, True, False]
+    assert steps[1]["data"] == steps[0]["data"]
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path):
+    backend = DiskBackend(tmp_path, max_entries=2)
+    backend.set("aa1", {"n": 1}, ttl=60)
+    backend.set("bb2", {"n": 2}, ttl=60)
+    assert backend.get("aa1") == {"n": 1}
+    backend.set("cc3", {"n": 3}, ttl=60)
+
+    reopened = DiskBackend(tmp_path, max_entries=2)
+    assert reopened.get("bb2") is None
+    assert reopened.get("aa1") == {"n": 1}
+    assert reopened.get("cc3") == {"n": 3}
+    backend.set("dd4", {"n": 4}, ttl=-1)
+    assert backend.get("dd4") is None
+
+
+def test_single_flight_joins_concurrent_runs(sandbox):
+    calls = 0
+
+    async def slow(opts):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    sandbox["slow"] = slow
+    write_forgefile(Path("Forgefile.yaml"), [{"call": "slow"}], single_flight={"window": 0.05})
+
+    async def main():
+        burst = await asyncio.gather(*(orchestrator.run_ritual_shared("t") for _ in range(4)))
+        late = await orchestrator.run_ritual_shared("t")
+        await asyncio.sleep(0.1)
+        fresh = await orchestrator.run_ritual_shared("t")
+        return burst, late, fresh
+
+    burst, late, fresh = asyncio.run(main())
+
+    assert calls == 2
+    assert len({r["receipt"] for r in burst + [late]}) == 1
+    assert [r.get("joined", False) for r in burst] == [False, True, True, True]
+    assert fresh["receipt"] != late["receipt"]
+
+
+def test_spans_and_step_histograms(sandbox, tmp_path: Path, monkeypatch):
+    exporter = FileExporter(tmp_path / "traces.jsonl")
+    monkeypatch.setattr(tracer, "exporter", exporter)
+
+    async def fn(opts):
+        return {"ok": True}
+
+    sandbox["s"] = fn
+    write_forgefile(Path("Forgefile.yaml"), [{"call": "s"}])
+    before = REGISTRY.get_sample_value("forge_step_local_duration_seconds_count", {"ritual": "t", "step": "s"}) or 0
+
+    asyncio.run(orchestrator.run_ritual("t"))
+    exporter.flush()
+
+    spans = [
+        span
+        for line in (tmp_path / "traces.jsonl").read_text().splitlines()
+        for rs in json.loads(line)["resourceSpans"]
+        for ss in rs["scopeSpans"]
+        for span in ss["spans"]
+    ]
+    by_name = {s["name"]: s for s in spans}
+    ritual, step = by_name["ritual t"], by_name["step s"]
+    assert step["parentSpanId"] == ritual["spanId"]
+    assert {s["traceId"] for s in spans} == {ritual["traceId"]}
+    assert {"receipt.build", "receipt.write", "receipt.encode", "receipt.commit"} <= set(by_name)
+    assert REGISTRY.get_sample_value("forge_step_local_duration_seconds_count", {"ritual": "t", "step": "s"}) == before + 1
+
+
+def test_file_exporter_writes_off_the_calling_thread(tmp_path: Path, monkeypatch):
+    exporter = FileExporter(tmp_path / "traces.jsonl", batch=4)
+    writers = []
+    write = exporter._write
+
+    def recording_write(spans):
+        writers.append(threading.current_thread())
+        write(spans)
+
+    monkeypatch.setattr(exporter, "_write", recording_write)
+    monkeypatch.setattr(tracer, "exporter", exporter)
+
+    async def main():
+        for i in range(10):
+            with tracer.span(f"span {i}"):
+                await asyncio.sleep(0)
+
+    asyncio.run(main())
+    exporter.flush()
+
+    lines = [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text().splitlines()]
+    names = [s["name"] for line in lines for s in line["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+    assert names == [f"span {i}" for i in range(10)]
+    assert all(len(line["resourceSpans"][0]["scopeSpans"][0]["spans"]) <= 4 for line in lines)
+    assert writers and threading.main_thread() not in writers
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from forge_v2.utils import process
+from forge_v2.utils.process import run_process
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "killpg"), reason="process groups are POSIX-only")
+
+
+def group_alive(pgid: int) -> bool:
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def wait_gone(check, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not check():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_timeout_kills_the_whole_process_group():
+    # The shell forks a grandchild that would outlive a plain proc.kill().
+    script = 'echo $$; sleep 30 & wait'
+    pids = []
+
+    async def scenario():
+        return await run_process(["bash", "-c", script], timeout=0.5,
+                                 on_line=lambda name, line: pids.append(int(line)))
+
+    started = time.monotonic()
+    result = asyncio.run(scenario())
+    assert time.monotonic() - started < 10  # an orphaned sleep would hold the pipes open
+    assert result.timed_out and not result.ok
+    assert result.returncode == -9
+    assert pids and wait_gone(lambda: group_alive(pids[0]), timeout=2)
+
+
+def test_cancelled_child_is_reaped():
+    pids = []
+
+    async def scenario():
+        started = asyncio.Event()
+
+        def on_line(name, line):
+            pids.append(int(line))
+            started.set()
+
+        task = asyncio.create_task(run_process(
+            [sys.executable, "-u", "-c", "import os, time; print(os.getpid()); time.sleep(30)"],
+            on_line=on_line,
+        ))
+        await asyncio.wait_for(started.wait(), 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pids[0], 0)  # killed and waited for: not even a zombie remains
+
+
+def test_semaphore_caps_concurrent_children(monkeypatch):
+    monkeypatch.setattr(process, "get_settings", lambda: type("S", (), {"max_subprocesses": 2})())
+    state = {"active": 0, "peak": 0}
+
+    def on_line(name, line):
+        state["active"] += 1 if line.strip() == "start" else -1
+        state["peak"] = max(state["peak"], state["active"])
+
+    async def scenario():
+        argv = [sys.executable, "-u", "-c", "import time; print('start'); time.sleep(0.3); print('end')"]
+        return await asyncio.gather(*(run_process(argv, timeout=10, on_line=on_line) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert all(r.ok for r in results)
+    assert state == {"active": 0, "peak": 2}
+
+
+def test_line_callbacks_see_both_streams_in_order():
+    seen = []
+
+    async def on_line(name, line):
+        await asyncio.sleep(0)
+        seen.append((name, line))
+
+    script = "import sys; print('a'); print('b'); print('oops', file=sys.stderr); sys.stdout.write('tail')"
+    result = asyncio.run(run_process([sys.executable, "-u", "-c", script], on_line=on_line))
+    assert result.ok
+    assert result.stdout == "a\nb\ntail"
+    assert result.stderr == "oops\n"
+    assert [line for name, line in seen if name == "stdout"] == ["a\n", "b\n", "tail"]
+    assert [line for name, line in seen if name == "stderr"] == ["oops\n"]
@@ -0,0 +1,42 @@
+import asyncio
+import json
+from pathlib import Path
+
+from blake3 import blake3
+
+from forge_v2.receipts import ReceiptSink, load_index, read_receipt
+
+
+def test_segment_mode_group_commits_and_resolves(tmp_path: Path):
+    sink = ReceiptSink(tmp_path, mode="segment")
+
+    async def main():
+        return await asyncio.gather(*(sink.write({"n": i, "hash": None}) for i in range(50)))
+
+    try:
+        refs = asyncio.run(main())
+    finally:
+        sink.close()
+
+    segments = list(tmp_path.glob("*/forge.segment.jsonl"))
+    assert len(segments) == 1
+    assert len(segments[0].read_text().splitlines()) == 50
+    index = load_index(segments[0])
+    assert len(index) == 50
+
+    for i, ref in enumerate(refs):
+        receipt = read_receipt(ref)
+        assert receipt["n"] == i
+        unhashed = dict(receipt, hash=None)
+        assert receipt["hash"] == blake3(json.dumps(unhashed, sort_keys=True).encode()).hexdigest()
+        assert index[receipt["hash"]][0] == int(ref.rsplit("#", 1)[1])
+
+
+def test_files_mode_keeps_per_receipt_layout(tmp_path: Path):
+    sink = ReceiptSink(tmp_path, mode="files")
+    ref = asyncio.run(sink.write({"n": 1, "hash": None}))
+
+    path = Path(ref)
+    assert path.parent.parent == tmp_path
+    assert path.name.endswith("_forge.json")
+    assert read_receipt(ref)["n"] == 1
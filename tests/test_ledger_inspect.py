@@ -0,0 +1,177 @@
+import argparse
+import importlib.util
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "ledger_inspect.py"
+
+
+def load_inspect():
+    spec = importlib.util.spec_from_file_location("ledger_inspect", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def query(**overrides):
+    args = dict(
+        keyword=None, profile=None, provider=None, model=None, contains=None,
+        since=None, until=None, no_index=False, limit=0, jobs=1,
+        pretty=False, count=False, group_by=None,
+    )
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def write_events(path: Path, events, mode="w") -> None:
+    with path.open(mode, encoding="utf-8") as handle:
+        for event in events:
+            handle.write(json.dumps(event) + "\n")
+
+
+def run_inspect(ledger: Path, *argv: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--dir", str(ledger), *argv],
+        capture_output=True, text=True, timeout=30,
+    )
+
+
+def test_index_built_on_first_query(tmp_path):
+    module = load_inspect()
+    shard = tmp_path / "events-2025-01-01.jsonl"
+    write_events(shard, [
+        {"ts": "2025-01-01T00:00:00Z", "keyword": "tem-vision", "profile": "@blue"},
+        {"ts": "2025-01-01T01:00:00Z", "keyword": "tem-audit", "profile": "@red"},
+    ])
+
+    index = module.load_index(shard)
+    assert module.index_path(shard).exists()
+    assert index["size"] == shard.stat().st_size
+    assert index["ts"] == ["2025-01-01T00:00:00Z", "2025-01-01T01:00:00Z"]
+    assert sorted(index["fields"]["keyword"]) == ["tem-audit", "tem-vision"]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_index_extends_as_shard_grows(tmp_path):
+    module = load_inspect()
+    shard = tmp_path / "events-2025-01-01.jsonl"
+    write_events(shard, [{"ts": "2025-01-01T00:00:00Z", "keyword": "alpha"}])
+    first = module.load_index(shard)
+    covered = first["size"]
+
+    write_events(shard, [{"ts": "2025-01-01T02:00:00Z", "keyword": "beta"}], mode="a")
+    with shard.open("a", encoding="utf-8") as handle:
+        handle.write('{"keyword": "partial"')  # writer mid-append
+
+    index = module.load_index(shard)
+    assert index["fields"]["keyword"]["alpha"] == [0]
+    assert index["fields"]["keyword"]["beta"] == [covered]
+    assert "partial" not in json.dumps(index["fields"])
+    assert index["ts"][1] == "2025-01-01T02:00:00Z"
+    assert [e["keyword"] for e in module.iter_matches(shard, query(keyword="beta"))] == ["beta"]
+
+
+def test_stale_or_truncated_index_is_rebuilt(tmp_path):
+    module = load_inspect()
+    shard = tmp_path / "events-2025-01-01.jsonl"
+    write_events(shard, [{"keyword": "old-a"}, {"keyword": "old-b"}])
+    module.load_index(shard)
+
+    write_events(shard, [{"keyword": "new"}])  # truncated and rewritten
+    index = module.load_index(shard)
+    assert list(index["fields"]["keyword"]) == ["new"]
+
+    write_events(shard, [{"keyword": "xxx"}])  # same size, different bytes
+    index = module.load_index(shard)
+    assert list(index["fields"]["keyword"]) == ["xxx"]
+
+    module.index_path(shard).write_text("{not json", encoding="utf-8")
+    assert list(module.load_index(shard)["fields"]["keyword"]) == ["xxx"]
+
+
+def test_indexed_query_matches_full_scan(tmp_path):
+    events = [
+        {"ts": "2025-01-01T00:00:00Z", "keyword": "tem-vision", "model": 4, "provider": True},
+        {"ts": "2025-01-01T01:00:00Z", "keyword": "tem-audit", "model": 40, "provider": False},
+        {"ts": "2025-01-01T02:00:00Z", "keyword": "other", "model": "gpt-4o", "provider": None},
+        {"ts": "2025-01-01T03:00:00Z", "profile": "@blue"},
+    ]
+    write_events(tmp_path / "events-2025-01-01.jsonl", events)
+
+    for argv in (["--model", "4"], ["--provider", "true"], ["--provider", "false"],
+                 ["--keyword", "tem", "--model", "40"], ["--profile", "blue"],
+                 ["--since", "2025-01-01T01:00:00Z", "--keyword", "o"]):
+        indexed = run_inspect(tmp_path, *argv)
+        scanned = run_inspect(tmp_path, "--no-index", *argv)
+        assert indexed.returncode == scanned.returncode == 0, indexed.stderr + scanned.stderr
+        assert indexed.stdout == scanned.stdout, argv
+        assert indexed.stdout.strip(), argv
+
+
+def multi_shard_ledger(root: Path):
+    events = []
+    for day in range(1, 7):
+        shard = [
+            {"ts": f"2025-01-0{day}T{hour:02d}:00:00Z", "seq": len(events) + hour,
+             "keyword": "tem-vision" if hour % 2 else "tem-audit", "model": "gpt" if hour < 2 else 3}
+            for hour in range(day)
+        ]
+        write_events(root / f"events-2025-01-0{day}.jsonl", shard)
+        events.extend(shard)
+    return events
+
+
+def test_jobs_keep_date_order_and_stop_at_limit(tmp_path):
+    events = multi_shard_ledger(tmp_path)
+    expected = [json.dumps(e) for e in events]
+
+    serial = run_inspect(tmp_path)
+    parallel = run_inspect(tmp_path, "--jobs", "3")
+    assert parallel.returncode == 0, parallel.stderr
+    assert parallel.stdout.splitlines() == serial.stdout.splitlines() == expected
+
+    for jobs in ("1", "3"):
+        limited = run_inspect(tmp_path, "--jobs", jobs, "--limit", "4", "--keyword", "vision")
+        assert limited.returncode == 0, limited.stderr
+        wanted = [json.dumps(e) for e in events if e["keyword"] == "tem-vision"][:4]
+        assert limited.stdout.splitlines() == wanted
+
+
+def test_count_and_group_by_totals(tmp_path):
+    events = multi_shard_ledger(tmp_path)
+
+    for jobs in ("1", "4"):
+        count = run_inspect(tmp_path, "--jobs", jobs, "--count")
+        assert json.loads(count.stdout) == {"count": len(events)}
+
+        filtered = run_inspect(tmp_path, "--jobs", jobs, "--count", "--keyword", "audit", "--from", "2025-01-03")
+        assert json.loads(filtered.stdout) == {
+            "count": sum(1 for e in events if e["keyword"] == "tem-audit" and e["ts"] >= "2025-01-03")
+        }
+
+        grouped = run_inspect(tmp_path, "--jobs", jobs, "--group-by", "model")
+        assert json.loads(grouped.stdout) == {
+            "3": sum(1 for e in events if e["model"] == 3),
+            "gpt": sum(1 for e in events if e["model"] == "gpt"),
+        }
+
+
+def test_pretty_output_is_byte_identical_to_json_dumps(tmp_path):
+    module = load_inspect()
+    items = [{"a": 1, "nested": {"b": [1, 2, {"c": None}]}, "text": "line\nbreak"}, [], {}, "x"]
+    for count in range(len(items) + 1):
+        out = io.StringIO()
+        writer = module.PrettyArrayWriter(out)
+        for item in items[:count]:
+            writer.write(json.dumps(item, indent=2))
+        writer.close()
+        assert out.getvalue() == json.dumps(items[:count], indent=2) + "\n"
+
+    events = multi_shard_ledger(tmp_path)
+    pretty = run_inspect(tmp_path, "--jobs", "2", "--pretty", "--fields", "ts,keyword")
+    assert pretty.stdout == json.dumps([{"ts": e["ts"], "keyword": e["keyword"]} for e in events], indent=2) + "\n"
@@ -0,0 +1,158 @@
+import base64
+import importlib.util
+import json
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+BASE = Path(__file__).resolve().parent.parent
+VERIFY_SCRIPT = BASE / "unforged_forge_genesis" / "scripts" / "proposal_verify.py"
+
+
+def load_verifier():
+    spec = importlib.util.spec_from_file_location("proposal_verify_mod", VERIFY_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # lets the process pool pickle its task function
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_genesis(keys) -> dict:
+    return {
+        "version": "0.1",
+        "consensus": {
+            "validators": [
+                {"id": f"node-{i}", "pubkey": base64.b64encode(bytes(k.verify_key)).decode()} for i, k in enumerate(keys)
+            ]
+        },
+        "parameters": {"gas": 1},
+    }
+
+
+def make_proposal(verifier, genesis_path: Path, keys, copies: int = 1, change: int = 2) -> dict:
+    genesis = json.loads(genesis_path.read_text())
+    proposal = {
+        "base_genesis_hash": verifier.file_hash(genesis_path),
+        "base_genesis_version": genesis["version"],
+        "changes": {"merge_patch": {"parameters": {"gas": change}}},
+    }
+    challenge = bytes.fromhex(verifier.sha256_hex(verifier.jcs_like(proposal)))
+    signatures = []
+    for i, key in enumerate(keys):
+        entry = {
+            "guardian_id": f"node-{i}",
+            "public_key": base64.b64encode(bytes(key.verify_key)).decode(),
+            "signature": base64.b64encode(key.sign(challenge).signature).decode(),
+        }
+        signatures.extend([entry] * copies)
+    signatures.append(dict(signatures[0], signature=base64.b64encode(b"\0" * 64).decode()))
+    signatures.append(dict(signatures[0], guardian_id="node-unknown"))
+    proposal["signatures"] = signatures
+    return proposal
+
+
+def test_parallel_tally_matches_serial(tmp_path: Path):
+    signing = pytest.importorskip("nacl.signing")
+    verifier = load_verifier()
+    keys = [signing.SigningKey.generate() for _ in range(3)]
+    genesis_path = tmp_path / "genesis.json"
+    genesis_path.write_text(json.dumps(make_genesis(keys)))
+    genesis = json.loads(genesis_path.read_text())
+    genesis_hash = verifier.file_hash(genesis_path)
+    proposal = make_proposal(verifier, genesis_path, keys, copies=100)
+    challenge_hex = verifier.sha256_hex(verifier.jcs_like(verifier.core_of_proposal(proposal)))
+
+    serial = verifier.tally_signatures(proposal, genesis, challenge_hex, genesis_hash=genesis_hash)
+    assert serial == (300, 302, True)
+    assert verifier.guardian_keys(genesis, genesis_hash) is verifier.guardian_keys(genesis, genesis_hash)
+    with ProcessPoolExecutor(2) as pool:
+        parallel = verifier.tally_signatures(
+            proposal, genesis, challenge_hex, genesis_hash=genesis_hash, pool=pool, workers=2
+        )
+    assert parallel == serial
+
+
+def test_many_checks_a_directory(tmp_path: Path):
+    signing = pytest.importorskip("nacl.signing")
+    verifier = load_verifier()
+    keys = [signing.SigningKey.generate() for _ in range(3)]
+    genesis_path = tmp_path / "genesis.json"
+    genesis_path.write_text(json.dumps(make_genesis(keys)))
+    proposals = tmp_path / "proposals"
+    proposals.mkdir()
+    for n in range(3):
+        (proposals / f"p{n}.json").write_text(json.dumps(make_proposal(verifier, genesis_path, keys, change=n)))
+
+    cmd = [sys.executable, str(VERIFY_SCRIPT), "--genesis", str(genesis_path), "--many", str(proposals), "--workers", "1"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    report = json.loads(result.stdout)["proposals"]
+    assert len(report) == 3
+    assert all(r["signatures_ok"] == 3 and r["signatures_total"] == 5 and r["apply_ok"] for r in report.values())
+
+    (proposals / "p9.json").write_text(json.dumps({"changes": {"merge_patch": {"history": []}}}))
+    assert subprocess.run(cmd, capture_output=True).returncode == 2
+
+
+GENESIS = {
+    "version": "0.1",
+    "consensus": {"validators": [{"id": "node-a", "pubkey": "x"}, {"id": "node-b", "pubkey": "y"}], "quorum": ">=2/3"},
+    "parameters": {"gas": 1, "names": ["ä", "b"], "ratio": 0.5, "flags": {"on": True, "off": None}},
+    "ledger": {"a/b": {"~t": 1}},
+}
+
+
+def test_merge_patch_shares_untouched_subtrees():
+    verifier = load_verifier()
+    before = json.dumps(GENESIS, sort_keys=True)
+    patched = verifier.merge_patch_apply(GENESIS, {"parameters": {"gas": 2, "ratio": None}})
+
+    assert json.dumps(GENESIS, sort_keys=True) == before
+    assert patched["parameters"] == {"gas": 2, "names": ["ä", "b"], "flags": {"on": True, "off": None}}
+    assert patched["consensus"] is GENESIS["consensus"]
+    assert patched["parameters"]["flags"] is GENESIS["parameters"]["flags"]
+
+
+def test_json_patch_operations():
+    verifier = load_verifier()
+    before = json.dumps(GENESIS, sort_keys=True)
+    patched = verifier.json_patch_apply(GENESIS, [
+        {"op": "test", "path": "/consensus/quorum", "value": ">=2/3"},
+        {"op": "replace", "path": "/consensus/quorum", "value": ">=3/4"},
+        {"op": "add", "path": "/consensus/validators/-", "value": {"id": "node-c"}},
+        {"op": "remove", "path": "/consensus/validators/0"},
+        {"op": "copy", "from": "/parameters/names/0", "path": "/parameters/names/0"},
+        {"op": "move", "from": "/ledger/a~1b/~0t", "path": "/ledger/moved"},
+    ])
+
+    assert json.dumps(GENESIS, sort_keys=True) == before
+    assert patched["consensus"] == {"validators": [{"id": "node-b", "pubkey": "y"}, {"id": "node-c"}], "quorum": ">=3/4"}
+    assert patched["consensus"]["validators"][0] is GENESIS["consensus"]["validators"][1]
+    assert patched["parameters"]["names"] == ["ä", "ä", "b"]
+    assert patched["ledger"] == {"a/b": {}, "moved": 1}
+    assert patched["parameters"]["flags"] is GENESIS["parameters"]["flags"]
+
+    for bad in (
+        [{"op": "test", "path": "/version", "value": "9"}],
+        [{"op": "remove", "path": "/missing"}],
+        [{"op": "add", "path": "/consensus/validators/7", "value": 1}],
+        [{"op": "move", "from": "/parameters", "path": "/parameters/inner"}],
+        [{"op": "frobnicate", "path": "/version"}],
+    ):
+        with pytest.raises(verifier.PatchError):
+            verifier.json_patch_apply(GENESIS, bad)
+
+
+def test_canonical_cache_hash_matches_full_serialisation():
+    verifier = load_verifier()
+    canonical = verifier.CanonicalCache(GENESIS)
+    assert canonical.canonical(GENESIS) == verifier.jcs_like(GENESIS)
+    for patched in (
+        verifier.merge_patch_apply(GENESIS, {"parameters": {"gas": 10**20, "new": [1.5, None, "☃"]}}),
+        verifier.json_patch_apply(GENESIS, [{"op": "add", "path": "/ledger/a~1b/x", "value": {"z": 1, "a": [{}]}}]),
+        verifier.json_patch_apply(GENESIS, [{"op": "replace", "path": "", "value": [1, {"b": 2, "a": 1}]}]),
+    ):
+        assert canonical.hash(patched) == verifier.sha256_hex(verifier.jcs_like(patched))
@@ -1,8 +1,13 @@
+import importlib.util
 import json
 import os
 import shutil
+import signal
+import socket
 import subprocess
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -33,6 +38,13 @@ def copy_ledger_script(tmp: Path) -> None:
     dst.write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
 
 
+def load_ledger_module():
+    spec = importlib.util.spec_from_file_location("reality_ledger_mod", Path("reality_ledger/reality_ledger.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 def test_shard_dedupe_with_index():
     tmp = Path(tempfile.mkdtemp())
     try:
@@ -83,3 +95,201 @@ def test_compact_mode_omits_artifact():
         assert "artifact" not in obj
     finally:
         shutil.rmtree(tmp)
+
+
+def test_hash_index_is_rebuilt_from_shard():
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        copy_ledger_script(tmp)
+        ts = datetime.utcnow().isoformat() + "Z"
+        for i in range(5):
+            code, _, _ = run_append(tmp, {"event_id": f"rebuild:{i}", "ts": ts})
+            assert code == 0
+
+        hidx = tmp / "reality_ledger" / f"events-{ts[:10]}.hidx"
+        assert hidx.exists()
+        hidx.unlink()
+
+        _, _, err = run_append(tmp, {"event_id": "rebuild:3", "ts": ts})
+        assert "duplicate event_id" in err
+        assert hidx.exists()
+
+        _, _, err = run_append(tmp, {"event_id": "rebuild:new", "ts": ts})
+        assert "duplicate event_id" not in err
+        shard = tmp / "reality_ledger" / f"events-{ts[:10]}.jsonl"
+        assert len(shard.read_text(encoding="utf-8").splitlines()) == 6
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_append_many_reports_per_event_results():
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        copy_ledger_script(tmp)
+        ts = datetime.utcnow().isoformat() + "Z"
+        lines = [
+            json.dumps({"event_id": "many:1", "ts": ts}),
+            json.dumps({"event_id": "many:2", "ts": ts}),
+            json.dumps({"event_id": "many:1", "ts": ts}),
+            "{not json",
+        ]
+        python_cmd = "python" if os.name == "nt" else "python3"
+        proc = subprocess.run(
+            [python_cmd, str(tmp / "reality_ledger" / "reality_ledger.py"), "append-many"],
+            input="\n".join(lines) + "\n",
+            capture_output=True,
+            text=True,
+            cwd=tmp,
+            timeout=5,
+        )
+
+        results = [json.loads(ln) for ln in proc.stdout.splitlines()]
+        assert [r["status"] for r in results] == ["accepted", "accepted", "duplicate", "invalid"]
+        assert proc.returncode == 2
+        shard = tmp / "reality_ledger" / f"events-{ts[:10]}.jsonl"
+        assert len(shard.read_text(encoding="utf-8").splitlines()) == 2
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_serve_dedupes_concurrent_clients_and_shuts_down_cleanly():
+    tmp = Path(tempfile.mkdtemp())  # short path: AF_UNIX caps socket paths near 100 bytes
+    server = None
+    try:
+        copy_ledger_script(tmp)
+        sock_path = tmp / "append.sock"
+        python_cmd = "python" if os.name == "nt" else "python3"
+        server = subprocess.Popen(
+            [python_cmd, str(tmp / "reality_ledger" / "reality_ledger.py"), "serve", str(sock_path)],
+            stderr=subprocess.PIPE,
+            cwd=tmp,
+        )
+        deadline = time.monotonic() + 10
+        while not sock_path.exists():
+            assert server.poll() is None and time.monotonic() < deadline, "server did not start"
+            time.sleep(0.05)
+
+        ts = datetime.utcnow().isoformat() + "Z"
+
+        def client(n: int) -> list:
+            # Every client sends the shared ids plus one of its own, singly and as a batch.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.connect(str(sock_path))
+                stream = conn.makefile("rwb")
+                replies = []
+                for payload in (
+                    {"event_id": "serve:shared-0", "ts": ts},
+                    [{"event_id": f"serve:own-{n}", "ts": ts}, {"event_id": "serve:shared-1", "ts": ts}],
+                    {"event_id": "serve:shared-0", "ts": ts},
+                    ["not an event"],
+                ):
+                    stream.write((json.dumps(payload) + "\n").encode("utf-8"))
+                    stream.flush()
+                    replies.append(json.loads(stream.readline()))
+                return replies
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            replies = list(pool.map(client, range(6)))
+
+        results = [r for reply in replies for r in ([reply[0]] + reply[1] + [reply[2]])]
+        for eid in ("serve:shared-0", "serve:shared-1", *(f"serve:own-{n}" for n in range(6))):
+            statuses = sorted(r["status"] for r in results if r["event_id"] == eid)
+            assert statuses.count("accepted") == 1, (eid, statuses)
+            assert set(statuses) <= {"accepted", "duplicate"}
+        assert all(reply[2]["status"] == "duplicate" for reply in replies)
+        assert all(reply[3]["status"] == "invalid" for reply in replies)
+
+        shard = tmp / "reality_ledger" / f"events-{ts[:10]}.jsonl"
+        ids = [json.loads(ln)["event_id"] for ln in shard.read_text(encoding="utf-8").splitlines()]
+        assert sorted(ids) == sorted({"serve:shared-0", "serve:shared-1", *(f"serve:own-{n}" for n in range(6))})
+
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=10) == 0, server.stderr.read()
+        assert not sock_path.exists()
+    finally:
+        if server is not None and server.poll() is None:
+            server.kill()
+        shutil.rmtree(tmp)
+
+
+def test_operation_history_reads_tail_and_paginates(tmp_path: Path):
+    module = load_ledger_module()
+    ledger = module.RealityLedger(str(tmp_path / "ledger"))
+    with ledger.operations_file.open("w", encoding="utf-8") as handle:
+        for i in range(1000):
+            handle.write(json.dumps({"operation_id": f"op{i}", "n": i}) + "\n")
+
+    assert [op["n"] for op in ledger.get_operation_history(3)] == [997, 998, 999]
+    assert [op["n"] for op in ledger.get_operation_history(2, before="op10")] == [8, 9]
+    assert [op["n"] for op in ledger.get_operation_history(2, after="op10")] == [11, 12]
+
+    offsets = [offset for offset, _ in ledger.iter_operations()]
+    assert [op["n"] for op in ledger.get_operation_history(2, before=offsets[500])] == [498, 499]
+    assert [op["n"] for _, op in ledger.iter_operations_reverse(before=offsets[2])] == [1, 0]
+
+
+def test_consciousness_profiles_append_and_lookup(tmp_path: Path):
+    module = load_ledger_module()
+    base = tmp_path / "ledger"
+    base.mkdir()
+    legacy = {"legacy-id": {"timestamp": "t0", "profile": {"type": "old"}, "hash": "h-old"}}
+    (base / "consciousness_profiles.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    ledger = module.RealityLedger(str(base))
+    pid = ledger.record_consciousness_profile({"type": "guardian"})
+    entry = ledger.get_consciousness_profile(pid)
+
+    assert entry["profile"] == {"type": "guardian"}
+    assert list(ledger.find_consciousness_profiles(entry["hash"])) == [pid]
+    assert ledger.get_consciousness_profile("legacy-id")["profile"] == {"type": "old"}
+
+    (base / "consciousness_profiles.idx").unlink()
+    reopened = module.RealityLedger(str(base))
+    assert reopened.get_consciousness_profile(pid) == entry
+
+    reopened.compact_consciousness_profiles()
+    snapshot = json.loads((base / "consciousness_profiles.json").read_text(encoding="utf-8"))
+    assert set(snapshot) == {"legacy-id", pid}
+
+
+def test_compact_on_cold_store_without_index(tmp_path: Path):
+    import threading
+
+    module = load_ledger_module()
+    base = tmp_path / "ledger"
+    ledger = module.RealityLedger(str(base))
+    pids = [ledger.record_consciousness_profile({"n": i}) for i in range(3)]
+    (base / "consciousness_profiles.idx").unlink()
+
+    cold = module.RealityLedger(str(base))
+    worker = threading.Thread(target=cold.compact_consciousness_profiles, daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive(), "compact blocked on its own log lock"
+
+    snapshot = json.loads((base / "consciousness_profiles.json").read_text(encoding="utf-8"))
+    assert list(snapshot) == pids
+    assert (base / "consciousness_profiles.idx").exists()
+    assert cold.get_consciousness_profile(pids[1])["profile"] == {"n": 1}
+
+
+def test_shard_dedupe_numeric_event_id(tmp_path: Path):
+    module = load_ledger_module()
+    module.LEDGER_DIR = tmp_path
+    ts = "2025-01-01T00:00:00Z"
+    writer = module.ShardWriter(ts)
+    try:
+        first = writer.append_batch([{"event_id": 42, "ts": ts}])
+        second = writer.append_batch([{"event_id": 42, "ts": ts}, {"event_id": "42", "ts": ts}])
+    finally:
+        writer.close()
+    assert first[0]["status"] != "duplicate"
+    assert [r["status"] for r in second] == ["duplicate", "duplicate"]
+
+    (tmp_path / "events-2025-01-01.hidx").unlink()  # rebuilt by catch-up from the shard
+    reopened = module.ShardWriter(ts)
+    try:
+        assert reopened.append_batch([{"event_id": 42, "ts": ts}])[0]["status"] == "duplicate"
+    finally:
+        reopened.close()
+    assert len((tmp_path / "events-2025-01-01.jsonl").read_text().splitlines()) == 1
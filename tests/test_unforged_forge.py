@@ -122,3 +122,168 @@ def test_forge_mint_is_deterministic(tmp_path: Path):
 
     assert f"FORGED: {artifact_id}" in result.stdout
     assert f"ORE:    {ore_id}" in result.stdout
+
+
+def snapshot(root: Path) -> dict:
+    return {str(p.relative_to(root)): p.read_bytes() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def test_batch_mint_matches_sequential_mints(tmp_path: Path):
+    ores = tmp_path / "ores"
+    ores.mkdir()
+    for i in range(5):
+        (ores / f"{i:02d}.txt").write_text(f"ore number {i}\n", encoding="utf-8")
+
+    outputs = {}
+    for mode in ("sequential", "batch"):
+        work = tmp_path / mode
+        shutil.copytree(FORGE_SRC, work)
+        for dirname in ("archive", "receipts", "checkpoints"):
+            shutil.rmtree(work / dirname, ignore_errors=True)
+        cmd = ["python3", str(work / FORGE_SCRIPT), "--base-dir", str(work), "--timestamp", "2025-01-01T00:00:00Z"]
+        if mode == "batch":
+            subprocess.run(cmd + ["--batch", str(ores), "--workers", "2"], capture_output=True, check=True)
+        else:
+            for ore in sorted(ores.iterdir()):
+                subprocess.run(cmd + [str(ore)], capture_output=True, check=True)
+        outputs[mode] = snapshot(work)
+
+    assert len([name for name in outputs["batch"] if name.startswith("archive/")]) == 5
+    assert outputs["batch"] == outputs["sequential"]
+
+
+def test_checkpoint_chain_heights_snapshots_and_verify(tmp_path: Path):
+    work = tmp_path / "forge"
+    shutil.copytree(FORGE_SRC, work)
+    shutil.rmtree(work / "checkpoints")
+    genesis = json.loads((work / "genesis.json").read_text(encoding="utf-8"))
+    genesis["memory"]["checkpoints_every"] = 3
+    (work / "genesis.json").write_text(json.dumps(genesis), encoding="utf-8")
+    ores = tmp_path / "ores"
+    ores.mkdir()
+    for i in range(7):
+        (ores / f"{i}.txt").write_text(f"ore {i}", encoding="utf-8")
+
+    cmd = ["python3", str(work / FORGE_SCRIPT), "--base-dir", str(work), "--timestamp", "1700000000"]
+    subprocess.run(cmd + [str(ores / "0.txt")], capture_output=True, check=True)
+    subprocess.run(cmd + ["--batch", str(ores / "[1-6].txt")], capture_output=True, check=True)
+
+    checkpoints = work / "checkpoints"
+    head = json.loads((checkpoints / "HEAD").read_text())
+    assert (head["height"], head["snapshot"], head["artifact_count"]) == (7, 6, 7)
+    assert sorted(p.name for p in checkpoints.glob("snapshot_*")) == ["snapshot_0003.json", "snapshot_0006.json"]
+
+    state = archive = root = ""
+    for i in range(7):
+        product = sha256_hex(f"ore {i}".encode() + b"|hammer-v1|")
+        artifact_id = f"artifact-{product[:16]}"
+        result = sha256_hex(f"{artifact_id}|quench|1700000000".encode())
+        state = sha256_hex(f"{state}{product}{sha256_hex(b'genesis-lineage')}".encode())
+        archive = sha256_hex(f"{archive}{artifact_id}{result}".encode())
+        root = sha256_hex(f"{root}{artifact_id}".encode())
+        checkpoint = json.loads((checkpoints / f"checkpoint_{i + 1:04d}.json").read_text())
+        assert (checkpoint["height"], checkpoint["state_root"], checkpoint["archive_root"]) == (i + 1, state, archive)
+        assert json.loads((work / "archive" / f"{artifact_id}.json").read_text())["height"] == i + 1
+    index = json.loads((work / "artifact_index.json").read_text())
+    assert index["artifacts"] == [artifact_id]  # only what was minted since snapshot 6
+    assert index["merkle_root"] == root == head["index_root"]
+
+    def verify(height: int) -> dict:
+        out = subprocess.run(cmd + ["--verify", str(height)], capture_output=True, text=True)
+        return json.loads(out.stdout)
+
+    report = verify(5)
+    assert report["ok"] and (report["snapshot"], report["replayed"]) == (3, 2)
+    assert verify(0)["ok"] and verify(0)["height"] == 7
+
+    tampered = json.loads((checkpoints / "checkpoint_0005.json").read_text())
+    tampered["archive_root"] = "0" * 64
+    (checkpoints / "checkpoint_0005.json").write_text(json.dumps(tampered))
+    assert verify(5)["problems"] == ["checkpoint 5 roots do not match the replayed chain"]
+    assert verify(7)["ok"]
+
+
+def test_mint_continues_legacy_checkpoints(tmp_path: Path):
+    work = tmp_path / "forge"
+    shutil.copytree(FORGE_SRC, work)
+    legacy = json.loads((work / "checkpoints" / "checkpoint_0005.json").read_text())
+    ore = tmp_path / "ore.txt"
+    ore.write_text("after the seal", encoding="utf-8")
+
+    cmd = ["python3", str(work / FORGE_SCRIPT), "--base-dir", str(work), "--timestamp", "1700000000"]
+    result = subprocess.run(cmd + [str(ore)], capture_output=True, text=True, check=True)
+    assert "HEIGHT: 6" in result.stdout
+    anchor = json.loads((work / "checkpoints" / "snapshot_0005.json").read_text())
+    assert anchor["archive_root"] == legacy["archive_root"] and anchor["artifact_count"] == 6
+    report = json.loads(subprocess.run(cmd + ["--verify", "6"], capture_output=True, text=True).stdout)
+    assert report["ok"] and report["replayed"] == 1
+
+
+def test_batch_skips_missing_ore_and_commits_head(tmp_path: Path):
+    work = tmp_path / "forge"
+    shutil.copytree(FORGE_SRC, work)
+    shutil.rmtree(work / "checkpoints")
+    for i in range(3):
+        (tmp_path / f"{i}.txt").write_text(f"ore {i}", encoding="utf-8")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("0.txt\nmissing.txt\n1.txt\n2.txt\n", encoding="utf-8")
+
+    cmd = ["python3", str(work / FORGE_SCRIPT), "--base-dir", str(work), "--timestamp", "1700000000"]
+    result = subprocess.run(cmd + ["--batch", str(manifest)], capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "SKIPPED:" in result.stdout and "missing.txt" in result.stdout
+
+    assert json.loads((work / "checkpoints" / "HEAD").read_text())["height"] == 3
+    report = json.loads(subprocess.run(cmd + ["--verify", "0"], capture_output=True, text=True).stdout)
+    assert report["ok"] and report["height"] == 3
+
+
+def test_concurrent_mints_get_distinct_heights(tmp_path: Path):
+    work = tmp_path / "forge"
+    shutil.copytree(FORGE_SRC, work)
+    shutil.rmtree(work / "checkpoints")
+    cmd = ["python3", str(work / FORGE_SCRIPT), "--base-dir", str(work), "--timestamp", "1700000000"]
+    procs = []
+    for i in range(6):
+        ore = tmp_path / f"{i}.txt"
+        ore.write_text(f"concurrent {i}", encoding="utf-8")
+        procs.append(subprocess.Popen(cmd + [str(ore)], stdout=subprocess.DEVNULL))
+    assert [p.wait(timeout=30) for p in procs] == [0] * 6
+
+    head = json.loads((work / "checkpoints" / "HEAD").read_text())
+    assert head["height"] == 6 and head["artifact_count"] == 6
+    for height in range(1, 7):
+        report = json.loads(subprocess.run(cmd + ["--verify", str(height)], capture_output=True, text=True).stdout)
+        assert report["ok"], report
+
+
+def test_stale_or_missing_head_is_recovered_from_the_index(tmp_path: Path):
+    ores = tmp_path / "ores"
+    ores.mkdir()
+    for i in range(6):
+        (ores / f"{i}.txt").write_text(f"ore {i}", encoding="utf-8")
+
+    outputs = {}
+    for mode in ("clean", "stale", "lost"):
+        work = tmp_path / mode
+        shutil.copytree(FORGE_SRC, work)
+        shutil.rmtree(work / "checkpoints")
+        genesis = json.loads((work / "genesis.json").read_text(encoding="utf-8"))
+        genesis["memory"]["checkpoints_every"] = 2
+        (work / "genesis.json").write_text(json.dumps(genesis), encoding="utf-8")
+        cmd = ["python3", str(work / FORGE_SCRIPT), "--base-dir", str(work), "--timestamp", "1700000000"]
+        head = work / "checkpoints" / "HEAD"
+        for i in range(6):
+            if i == 3:
+                stale = head.read_bytes()
+            subprocess.run(cmd + [str(ores / f"{i}.txt")], capture_output=True, check=True)
+            if i == 4 and mode == "stale":
+                head.write_bytes(stale)  # heights 4-5 recorded, HEAD never moved past 3
+            elif i == 4 and mode == "lost":
+                head.unlink()
+        report = json.loads(subprocess.run(cmd + ["--verify", "0"], capture_output=True, text=True).stdout)
+        assert report["ok"] and report["height"] == 6, report
+        outputs[mode] = snapshot(work)
+
+    assert outputs["stale"] == outputs["clean"]
+    assert outputs["lost"] == outputs["clean"]
@@ -4,18 +4,47 @@
 from __future__ import annotations
 
 import argparse
+import glob
 import json
 import hashlib
+import os
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except Exception:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
+
+
+CHUNK_SIZE = 1 << 20
+DEFAULT_SNAPSHOT_EVERY = 1618  # genesis memory.checkpoints_every
 
 
 def sha256_hex(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
 
+def ore_digests(ore_file: Path, chunk_size: int = CHUNK_SIZE) -> Tuple[str, str]:
+    """(ore hash, product hash) from one chunked pass over the ORE's raw bytes."""
+    digest = hashlib.sha256()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(ore_file, "rb") as fh:
+        while True:
+            n = fh.readinto(buf)
+            if not n:
+                break
+            digest.update(view[:n])
+    product = digest.copy()
+    product.update(b"|hammer-v1|")
+    return digest.hexdigest(), product.hexdigest()
+
+
 def load_genesis(base: Path) -> Dict[str, Any]:
     gp = base / "genesis.json"
     if not gp.exists():
@@ -45,23 +74,13 @@ def parse_timestamp_override(raw: str) -> int:
     return int(dt.timestamp())
 
 
-def mint(base: Path, ore_file: Path, timestamp_override: Optional[int] = None) -> None:
-    """Deterministically mint an artifact from ore text."""
-    genesis = load_genesis(base)
-
-    ore_text = ore_file.read_text(encoding="utf-8")
-    ore_bytes = ore_text.encode("utf-8")
-
-    ore_hash = sha256_hex(ore_bytes)
+def forge(ore_file: Path, validators: List[str], epoch: int) -> Tuple[Dict[str, Any], List[str]]:
+    """Artifact record and quorum strikes for one ORE; its height is set when it joins the chain."""
+    ore_hash, product_hash = ore_digests(ore_file)
     ore_id = f"ore-{ore_hash[:16]}"
-
-    product_hash = sha256_hex(ore_bytes + b"|hammer-v1|")
     artifact_id = f"artifact-{product_hash[:16]}"
     lineage_hash = sha256_hex(b"genesis-lineage")
 
-    epoch = int(timestamp_override if timestamp_override is not None else time.time())
-
-    validators: List[str] = [v["id"] for v in genesis.get("consensus", {}).get("validators", [])]
     strikes: List[str] = [
         sha256_hex(f"{ore_id}|strike|{vid}|seed-alpha".encode("utf-8"))
         for vid in validators
@@ -83,37 +102,400 @@ def mint(base: Path, ore_file: Path, timestamp_override: Optional[int] = None) -
                 "time": epoch,
             }
         ],
-        "height": 1,
+        "height": 0,
     }
+    return artifact, strikes
 
-    checkpoint = {
-        "height": 1,
-        "state_root": sha256_hex(f"{product_hash}{lineage_hash}".encode("utf-8")),
-        "archive_root": sha256_hex(f"{artifact_id}{result_hash}".encode("utf-8")),
-        "quorum_signatures": strikes,
-    }
 
-    index = {
-        "mesh": "Unforged-Forge",
-        "artifacts": [artifact_id],
-        "merkle_root": sha256_hex(artifact_id.encode("utf-8")),
-        "created": epoch,
-    }
+def checkpoint_name(height: int) -> str:
+    return f"checkpoint_{height:04d}.json"
+
+
+def snapshot_name(height: int) -> str:
+    return f"snapshot_{height:04d}.json"
+
+
+def _replace_json(path: Path, obj: Any) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    save_json(tmp, obj)
+    tmp.replace(path)
+
+
+class Chain:
+    """Height-indexed checkpoint chain under `checkpoints/`.
+
+    Each height folds one artifact into the previous checkpoint's roots:
+
+        state_root   = sha256(prev_state_root + product_hash + lineage_hash)
+        archive_root = sha256(prev_archive_root + artifact_id + result_hash)
+
+    and the index root likewise folds in the artifact id, so height 1 of a
+    fresh chain has the same roots a standalone mint always had.
+
+    `HEAD` names the newest height and snapshot along with the running index
+    root and artifact count; if a mint died before moving it, the state is
+    replayed from the index records past it. `index.jsonl` holds one fixed-width record per
+    height (checkpoint file, artifact and the hashes folded in), so any
+    height is one seek away and is the full history. Every `snapshot_every`
+    heights `snapshot_NNNN.json` freezes the roots; verifying a height
+    replays only the records since the snapshot below it, and
+    `artifact_index.json` lists only the artifacts minted since the latest
+    snapshot, so no mint reads or writes more than one snapshot interval.
+
+    Use it as a context manager to append: heights are allocated under an
+    exclusive lock on `index.jsonl`, so concurrent mints serialise.
+    """
+
+    RECORD_SIZE = 512
+
+    def __init__(self, base: Path, snapshot_every: int = DEFAULT_SNAPSHOT_EVERY) -> None:
+        self.base = base
+        self.dir = base / "checkpoints"
+        self.snapshot_every = snapshot_every
+        self._lock = None
+        self._load_state()
+
+    def __enter__(self) -> "Chain":
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock = open(self.dir / "index.jsonl", "ab")
+        if fcntl is not None:
+            fcntl.flock(self._lock.fileno(), fcntl.LOCK_EX)
+        self._load_state()  # another mint may have moved HEAD while we waited
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    def _load_state(self) -> None:
+        head = self._load(self.dir / "HEAD")
+        tail = self._tail()
+        self._anchor = False
+        if tail > head.get("height", 0):
+            # Index records are the commit point of a height: a mint that died
+            # before moving HEAD (or a lost HEAD) is recovered from them.
+            self._replay(tail)
+        elif head:
+            self.height, self.snapshot = head["height"], head["snapshot"]
+            self.artifacts: List[str] = list(self._load(self.base / "artifact_index.json").get("artifacts", []))
+            self.index_root = head.get("index_root", "")
+            self.artifact_count = head.get("artifact_count", 0)
+        else:
+            # Checkpoints written by something other than this chain (legacy
+            # mints, seal_checkpoint.mjs) get a snapshot anchored on the
+            # newest one at the next append.
+            heights = [int(p.stem.split("_")[1]) for p in self.dir.glob("checkpoint_*.json") if p.stem.split("_")[1].isdigit()]
+            self.height = self.snapshot = max(heights, default=0)
+            self._anchor = self.height > 0
+            index = self._load(self.base / "artifact_index.json") if self.height else {}
+            self.artifacts = []
+            self.index_root = index.get("merkle_root", "")
+            self.artifact_count = len(index.get("artifacts", []))
+        previous = self.checkpoint(self.height) if self.height else {}
+        self.state_root = previous.get("state_root", "")
+        self.archive_root = previous.get("archive_root", "")
+
+    def _tail(self) -> int:
+        """Highest height with a complete index record, or 0."""
+        try:
+            height = (self.dir / "index.jsonl").stat().st_size // self.RECORD_SIZE
+        except FileNotFoundError:
+            return 0
+        while height and self.record(height) is None:
+            height -= 1
+        return height
+
+    def _replay(self, height: int) -> None:
+        """Rebuild the running index state at `height` from the snapshot below it and the records since."""
+        self.height, self.snapshot = height, self.record(height)["snapshot"]
+        anchor = self._load(self.dir / snapshot_name(self.snapshot)) if self.snapshot else {}
+        self.index_root = anchor.get("index_root", "")
+        self.artifact_count = anchor.get("artifact_count", 0)
+        self.artifacts = []
+        for h in range(self.snapshot + 1, height + 1):
+            artifact_id = self.record(h)["artifact"]
+            self.index_root = sha256_hex(f"{self.index_root}{artifact_id}".encode("utf-8"))
+            self.artifacts.append(artifact_id)
+            self.artifact_count += 1
+
+    @staticmethod
+    def _load(path: Path) -> Dict[str, Any]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def checkpoint(self, height: int) -> Dict[str, Any]:
+        return self._load(self.dir / checkpoint_name(height))
+
+    def record(self, height: int) -> Optional[Dict[str, Any]]:
+        """Index record for `height`, or None for heights this chain did not mint."""
+        if height < 1:
+            return None
+        try:
+            with open(self.dir / "index.jsonl", "rb") as fh:
+                fh.seek((height - 1) * self.RECORD_SIZE)
+                raw = fh.read(self.RECORD_SIZE)
+        except FileNotFoundError:
+            return None
+        if len(raw) < self.RECORD_SIZE or not raw.endswith(b"\n"):
+            return None  # torn by a crash mid-write: never committed
+        raw = raw.strip(b"\0 \n")
+        try:
+            return json.loads(raw) if raw else None
+        except json.JSONDecodeError:
+            return None
+
+    def _write_record(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        if len(line) >= self.RECORD_SIZE:
+            raise ValueError(f"index record for height {record['height']} exceeds {self.RECORD_SIZE} bytes")
+        fd = os.open(self.dir / "index.jsonl", os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            os.pwrite(fd, line.ljust(self.RECORD_SIZE - 1) + b"\n", (record["height"] - 1) * self.RECORD_SIZE)
+        finally:
+            os.close(fd)
+
+    def _save_snapshot(self) -> None:
+        save_json(self.dir / snapshot_name(self.height), {
+            "height": self.height,
+            "state_root": self.state_root,
+            "archive_root": self.archive_root,
+            "index_root": self.index_root,
+            "artifact_count": self.artifact_count,
+        })
 
+    def append(self, artifact: Dict[str, Any], strikes: List[str]) -> Dict[str, Any]:
+        """Fold an artifact in at the next height and write its checkpoint; returns the checkpoint."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        if self._anchor:
+            self._save_snapshot()
+            self._anchor = False
+        artifact_id = artifact["artifact_id"]
+        result_hash = artifact["receipts"][0]["result_hash"]
+        self.height += 1
+        artifact["height"] = self.height
+        self.state_root = sha256_hex(f"{self.state_root}{artifact['product_hash']}{artifact['lineage_hash']}".encode("utf-8"))
+        self.archive_root = sha256_hex(f"{self.archive_root}{artifact_id}{result_hash}".encode("utf-8"))
+        self.index_root = sha256_hex(f"{self.index_root}{artifact_id}".encode("utf-8"))
+        self.artifacts.append(artifact_id)
+        self.artifact_count += 1
+
+        checkpoint = {
+            "height": self.height,
+            "state_root": self.state_root,
+            "archive_root": self.archive_root,
+            "quorum_signatures": strikes,
+        }
+        save_json(self.dir / checkpoint_name(self.height), checkpoint)
+        if self.height % self.snapshot_every == 0:
+            self.snapshot = self.height
+            self._save_snapshot()
+            self.artifacts = []
+        self._write_record({
+            "height": self.height,
+            "checkpoint": checkpoint_name(self.height),
+            "artifact": artifact_id,
+            "product_hash": artifact["product_hash"],
+            "lineage_hash": artifact["lineage_hash"],
+            "result_hash": result_hash,
+            "snapshot": self.snapshot,
+        })
+        return checkpoint
+
+    def commit(self, epoch: int) -> Dict[str, Any]:
+        """Write the artifact index and move HEAD; returns the index."""
+        index = {
+            "mesh": "Unforged-Forge",
+            "artifacts": self.artifacts,
+            "merkle_root": self.index_root,
+            "created": epoch,
+        }
+        save_json(self.base / "artifact_index.json", index)
+        _replace_json(self.dir / "HEAD", {
+            "height": self.height,
+            "snapshot": self.snapshot,
+            "index_root": self.index_root,
+            "artifact_count": self.artifact_count,
+        })
+        return index
+
+    def verify(self, height: int) -> Dict[str, Any]:
+        """Recompute the roots at `height` from the nearest snapshot below it."""
+        problems: List[str] = []
+        record = self.record(height)
+        start = record["snapshot"] if record else height
+        anchor = self._load(self.dir / snapshot_name(start)) if start else {}
+        state = anchor.get("state_root", "")
+        archive = anchor.get("archive_root", "")
+        index_root = anchor.get("index_root", "")
+        if record is None:
+            problems.append(f"height {height} is not in the checkpoint index")
+        elif start and not anchor:
+            problems.append(f"snapshot {start} is missing")
+        else:
+            for h in range(start + 1, height + 1):
+                rec = self.record(h)
+                if rec is None:
+                    problems.append(f"height {h} is not in the checkpoint index")
+                    break
+                state = sha256_hex(f"{state}{rec['product_hash']}{rec['lineage_hash']}".encode("utf-8"))
+                archive = sha256_hex(f"{archive}{rec['artifact']}{rec['result_hash']}".encode("utf-8"))
+                index_root = sha256_hex(f"{index_root}{rec['artifact']}".encode("utf-8"))
+            checkpoint = self.checkpoint(height)
+            if not problems and (checkpoint.get("state_root"), checkpoint.get("archive_root")) != (state, archive):
+                problems.append(f"checkpoint {height} roots do not match the replayed chain")
+            if not problems and height == self.height and self._load(self.base / "artifact_index.json").get("merkle_root") != index_root:
+                problems.append("artifact_index merkle_root does not match the replayed chain")
+        return {
+            "height": height,
+            "snapshot": start,
+            "replayed": max(height - start, 0),
+            "state_root": state,
+            "archive_root": archive,
+            "ok": not problems,
+            "problems": problems,
+        }
+
+
+def _validators(genesis: Dict[str, Any]) -> List[str]:
+    return [v["id"] for v in genesis.get("consensus", {}).get("validators", [])]
+
+
+def _snapshot_every(genesis: Dict[str, Any]) -> int:
+    return int(genesis.get("memory", {}).get("checkpoints_every", DEFAULT_SNAPSHOT_EVERY))
+
+
+def _save_artifact(base: Path, artifact: Dict[str, Any]) -> None:
+    artifact_id = artifact["artifact_id"]
     save_json(base / "archive" / f"{artifact_id}.json", artifact)
     save_json(base / "receipts" / f"{artifact_id}_receipt.json", artifact["receipts"][0])
-    save_json(base / "checkpoints" / "checkpoint_0001.json", checkpoint)
-    save_json(base / "artifact_index.json", index)
 
-    print(f"FORGED: {artifact_id}")
-    print(f"ORE:    {ore_id}")
+
+def mint(base: Path, ore_file: Path, timestamp_override: Optional[int] = None) -> None:
+    """Deterministically mint an artifact from ore text at the next checkpoint height."""
+    genesis = load_genesis(base)
+    epoch = int(timestamp_override if timestamp_override is not None else time.time())
+    artifact, strikes = forge(ore_file, _validators(genesis), epoch)
+
+    with Chain(base, _snapshot_every(genesis)) as chain:
+        checkpoint = chain.append(artifact, strikes)
+        _save_artifact(base, artifact)
+        chain.commit(epoch)
+
+    print(f"FORGED: {artifact['artifact_id']}")
+    print(f"ORE:    {artifact['ore_id']}")
+    print(f"HEIGHT: {checkpoint['height']}")
+    print(f"STATE:  {checkpoint['state_root']}")
+    print(f"ARCH:   {checkpoint['archive_root']}")
+
+
+def batch_inputs(spec: str) -> Iterator[Path]:
+    """ORE paths for --batch: a directory (its files, sorted), a glob, or a manifest of one path per line."""
+    path = Path(spec)
+    if path.is_dir():
+        yield from sorted(p for p in path.iterdir() if p.is_file() and not p.name.startswith("."))
+    elif glob.has_magic(spec):
+        yield from (Path(p) for p in sorted(glob.glob(spec, recursive=True)) if os.path.isfile(p))
+    else:
+        with open(path, encoding="utf-8") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield path.parent / line
+
+
+def _bounded_map(fn: Callable, items: Iterable, workers: int) -> Iterator:
+    """map() over a process pool with a bounded number of tasks in flight; yields in input order."""
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _forge_task(job: Tuple[Path, List[str], int]):
+    """(ore_file, forged records, error); a bad input is reported instead of failing the batch."""
+    try:
+        return job[0], forge(*job), None
+    except FileNotFoundError:
+        return job[0], None, "ore file not found"
+    except OSError as exc:
+        return job[0], None, str(exc)
+
+
+def mint_batch(
+    base: Path,
+    ore_files: Iterable[Path],
+    timestamp_override: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Mint many OREs with one genesis load; output matches minting them one by one in order.
+
+    OREs are read and hashed in a process pool and join the chain in input
+    order, one height each; the artifact index and HEAD are written once, for
+    every height appended even if the batch stops early. Unreadable inputs
+    are skipped and listed under "skipped".
+    """
+    genesis = load_genesis(base)
+    validators = _validators(genesis)
+    epoch = int(timestamp_override if timestamp_override is not None else time.time())
+    for sub in ("archive", "receipts"):
+        (base / sub).mkdir(parents=True, exist_ok=True)
+
+    jobs = ((ore, validators, epoch) for ore in ore_files)
+    checkpoint = None
+    skipped: List[Dict[str, str]] = []
+    with Chain(base, _snapshot_every(genesis)) as chain:
+        start = chain.height
+        try:
+            for ore, forged, error in _bounded_map(_forge_task, jobs, workers or os.cpu_count() or 1):
+                if error:
+                    print(f"SKIPPED: {ore} ({error})")
+                    skipped.append({"ore_file": str(ore), "error": error})
+                    continue
+                artifact, strikes = forged
+                checkpoint = chain.append(artifact, strikes)
+                _save_artifact(base, artifact)
+                print(f"FORGED: {artifact['artifact_id']} @ {checkpoint['height']}")
+        finally:
+            if checkpoint is not None:
+                chain.commit(epoch)
+    if checkpoint is None:
+        return {"minted": 0, "height": chain.height, "skipped": skipped}
+    print(f"HEIGHT: {chain.height}")
     print(f"STATE:  {checkpoint['state_root']}")
     print(f"ARCH:   {checkpoint['archive_root']}")
+    return {"minted": chain.height - start, "height": chain.height, "checkpoint": checkpoint, "skipped": skipped}
 
 
 def main(argv: Optional[List[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Forge artifacts from ORE text inputs.")
-    parser.add_argument("ore_file", type=Path, help="Path to ORE text file")
+    parser.add_argument("ore_file", type=Path, nargs="?", help="Path to ORE text file")
+    parser.add_argument(
+        "--batch",
+        metavar="DIR|GLOB|MANIFEST",
+        help="Mint many OREs in one run: a directory, a glob, or a file listing one path per line",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Hashing processes for --batch (default: CPU count)",
+    )
+    parser.add_argument(
+        "--verify",
+        dest="verify_height",
+        metavar="HEIGHT",
+        type=int,
+        help="Replay the checkpoint chain up to HEIGHT (0 = head) from its nearest snapshot and report",
+    )
     parser.add_argument(
         "--timestamp",
         dest="timestamp",
@@ -129,6 +511,16 @@ def main(argv: Optional[List[str]] = None) -> int:
     args = parser.parse_args(argv)
 
     base = args.base_dir.resolve() if args.base_dir else Path(__file__).resolve().parent.parent
+    if args.verify_height is not None:
+        chain = Chain(base, _snapshot_every(load_genesis(base)))
+        report = chain.verify(args.verify_height or chain.height)
+        print(json.dumps(report, indent=2))
+        return 0 if report["ok"] else 2
+    if args.batch:
+        summary = mint_batch(base, batch_inputs(args.batch), timestamp_override=args.timestamp, workers=args.workers)
+        return 1 if summary["skipped"] else 0
+    if args.ore_file is None:
+        parser.error("an ore file or --batch is required")
     ore = args.ore_file if args.ore_file.is_absolute() else (Path.cwd() / args.ore_file)
     if not ore.exists():
         parser.error(f"ore file not found: {ore}")
@@ -3,17 +3,14 @@
 from __future__ import annotations
 
 import argparse
+import base64
 import json
 import hashlib
+import os
 import sys
-from copy import deepcopy
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Tuple
-
-try:
-    import jsonpatch  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    jsonpatch = None  # type: ignore[assignment]
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from nacl.exceptions import BadSignatureError  # type: ignore
@@ -21,6 +18,9 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     VerifyKey = None  # type: ignore[assignment]
 
+# Below this many signatures a process pool costs more than it saves.
+PARALLEL_MIN_SIGNATURES = 256
+
 ALLOWED_PREFIXES = (
     "/consensus/validators",
     "/consensus/quorum",
@@ -62,22 +62,169 @@ def base_lock_ok(proposal: Dict[str, Any], genesis_hash: str, genesis_version: s
     )
 
 
+class CanonicalCache:
+    """`jcs_like` bytes of every container in one document, keyed by identity.
+
+    Patches below never mutate their input: they copy only the containers
+    on the patched path and share every other subtree with the original.
+    Serialising a patched document therefore re-encodes just those copies
+    and splices in the cached bytes of everything untouched. The result is
+    byte-identical to `jcs_like`, so its SHA-256 is too.
+    """
+
+    def __init__(self, doc: Any) -> None:
+        self._bytes: Dict[int, Tuple[Any, bytes]] = {}
+        self._encode(doc, store=True)
+
+    def _encode(self, obj: Any, store: bool) -> bytes:
+        if isinstance(obj, dict):
+            cached = self._bytes.get(id(obj))
+            if cached is not None:
+                return cached[1]
+            out = b"{" + b",".join(
+                _scalar(key) + b":" + self._encode(obj[key], store) for key in sorted(obj)
+            ) + b"}"
+        elif isinstance(obj, list):
+            cached = self._bytes.get(id(obj))
+            if cached is not None:
+                return cached[1]
+            out = b"[" + b",".join(self._encode(item, store) for item in obj) + b"]"
+        else:
+            return _scalar(obj)
+        if store:
+            self._bytes[id(obj)] = (obj, out)  # holding obj keeps its id from being reused
+        return out
+
+    def canonical(self, obj: Any) -> bytes:
+        return self._encode(obj, store=False)
+
+    def hash(self, obj: Any) -> str:
+        return sha256_hex(self.canonical(obj))
+
+
+def _scalar(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
 def merge_patch_apply(base: Dict[str, Any], patch_obj: Dict[str, Any]) -> Dict[str, Any]:
-    result = deepcopy(base)
-
-    def merge(dst: Dict[str, Any], src: Dict[str, Any]) -> None:
-        for key, value in src.items():
-            if value is None:
-                dst.pop(key, None)
-            elif isinstance(value, dict) and isinstance(dst.get(key), dict):
-                merge(dst[key], value)  # type: ignore[arg-type]
-            else:
-                dst[key] = value
-
-    merge(result, patch_obj)
+    """Apply a merge patch, copying only the objects it changes."""
+    result = dict(base)
+    for key, value in patch_obj.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict) and isinstance(base.get(key), dict):
+            result[key] = merge_patch_apply(base[key], value)
+        else:
+            result[key] = value
     return result
 
 
+class PatchError(ValueError):
+    pass
+
+
+def _pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"invalid JSON pointer: {path!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+def _index(container: List[Any], token: str, insert: bool = False) -> int:
+    if token == "-" and insert:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not insert):
+        raise PatchError(f"array index out of range: {index}")
+    return index
+
+
+def _get(doc: Any, tokens: List[str]) -> Any:
+    for token in tokens:
+        if isinstance(doc, dict):
+            if token not in doc:
+                raise PatchError(f"member not found: {token!r}")
+            doc = doc[token]
+        elif isinstance(doc, list):
+            doc = doc[_index(doc, token)]
+        else:
+            raise PatchError(f"cannot descend into {type(doc).__name__}")
+    return doc
+
+
+def _update(doc: Any, tokens: List[str], op: str, value: Any = None) -> Any:
+    """Copy of `doc` with `op` applied at `tokens`; containers off the path are shared."""
+    token, rest = tokens[0], tokens[1:]
+    if isinstance(doc, dict):
+        copy: Any = dict(doc)
+        if rest:
+            if token not in doc:
+                raise PatchError(f"member not found: {token!r}")
+            copy[token] = _update(doc[token], rest, op, value)
+        elif op == "add":
+            copy[token] = value
+        elif token not in doc:
+            raise PatchError(f"member not found: {token!r}")
+        elif op == "remove":
+            del copy[token]
+        else:
+            copy[token] = value
+        return copy
+    if isinstance(doc, list):
+        copy = list(doc)
+        if rest:
+            index = _index(doc, token)
+            copy[index] = _update(doc[index], rest, op, value)
+        elif op == "add":
+            copy.insert(_index(doc, token, insert=True), value)
+        elif op == "remove":
+            del copy[_index(doc, token)]
+        else:
+            copy[_index(doc, token)] = value
+        return copy
+    raise PatchError(f"cannot descend into {type(doc).__name__}")
+
+
+def json_patch_apply(base: Any, operations: List[Dict[str, Any]]) -> Any:
+    """Apply an RFC 6902 patch without mutating `base`, copying only the containers it touches."""
+    doc = base
+    for operation in operations:
+        op = operation.get("op")
+        tokens = _pointer(operation.get("path", ""))
+        if op in ("move", "copy"):
+            source = _pointer(operation.get("from", ""))
+            value = _get(doc, source)
+            if op == "move":
+                if tokens[: len(source)] == source and tokens != source:
+                    raise PatchError("cannot move a value into one of its children")
+                if tokens == source:
+                    continue
+                doc = _update(doc, source, "remove")
+            op = "add"
+        elif op == "test":
+            if _get(doc, tokens) != operation.get("value"):
+                raise PatchError(f"test failed at {operation.get('path')!r}")
+            continue
+        elif op in ("add", "replace"):
+            if "value" not in operation:
+                raise PatchError(f"{op} needs a value")
+            value = operation["value"]
+        elif op == "remove":
+            value = None
+        else:
+            raise PatchError(f"unknown operation: {op!r}")
+        if not tokens:
+            if op == "remove":
+                raise PatchError("cannot remove the document root")
+            doc = value
+        else:
+            doc = _update(doc, tokens, op, value)
+    return doc
+
+
 def paths_ok(changes: Dict[str, Any]) -> bool:
     if "json_patch" in changes:
         for op in changes["json_patch"]:
@@ -98,59 +245,104 @@ def paths_ok(changes: Dict[str, Any]) -> bool:
 
 def dry_run_apply(genesis: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
     if "json_patch" in changes:
-        if jsonpatch is None:
-            raise RuntimeError("jsonpatch not installed; run `pip install jsonpatch`." )
-        patch = jsonpatch.JsonPatch(changes["json_patch"])  # type: ignore[arg-type]
-        return patch.apply(genesis, in_place=False)
+        return json_patch_apply(genesis, changes["json_patch"])
     if "merge_patch" in changes:
         return merge_patch_apply(genesis, changes["merge_patch"])
     raise ValueError("Unsupported change set (expected json_patch or merge_patch)")
 
 
+_GUARDIAN_KEYS: Dict[str, Dict[str, Tuple[Any, Any]]] = {}
+
+
+def guardian_keys(genesis: Dict[str, Any], genesis_hash: str) -> Dict[str, Tuple[Any, Any]]:
+    """guardian id -> (registered pubkey, parsed VerifyKey or None), parsed once per genesis hash."""
+    keys = _GUARDIAN_KEYS.get(genesis_hash)
+    if keys is None:
+        keys = {}
+        for guardian in genesis.get("consensus", {}).get("validators", []):
+            pubkey_b64 = guardian.get("pubkey")
+            try:
+                verify_key = VerifyKey(base64.b64decode(pubkey_b64))
+            except (TypeError, ValueError):
+                verify_key = None
+            keys[guardian.get("id")] = (pubkey_b64, verify_key)
+        _GUARDIAN_KEYS[genesis_hash] = keys
+    return keys
+
+
+_WORKER_KEYS: Dict[bytes, Any] = {}
+
+
+def _verify_chunk(challenge: bytes, items: List[Tuple[bytes, bytes]]) -> int:
+    """Count valid (public key, signature) pairs over `challenge`; runs in pool workers."""
+    ok = 0
+    for pk_bytes, sig_bytes in items:
+        verify_key = _WORKER_KEYS.get(pk_bytes)
+        if verify_key is None:
+            verify_key = _WORKER_KEYS[pk_bytes] = VerifyKey(pk_bytes)
+        try:
+            verify_key.verify(challenge, sig_bytes)
+            ok += 1
+        except (ValueError, BadSignatureError):
+            continue
+    return ok
+
+
 def tally_signatures(
-    proposal: Dict[str, Any], genesis: Dict[str, Any], challenge_hex: str
+    proposal: Dict[str, Any],
+    genesis: Dict[str, Any],
+    challenge_hex: str,
+    genesis_hash: Optional[str] = None,
+    pool: Optional[Executor] = None,
+    workers: int = 1,
 ) -> Tuple[int, int, bool]:
     if VerifyKey is None:
         return (0, 0, False)
 
-    guardians = {
-        guardian.get("id"): guardian.get("pubkey")
-        for guardian in genesis.get("consensus", {}).get("validators", [])
-    }
-    ok = 0
+    keys = guardian_keys(genesis, genesis_hash or sha256_hex(jcs_like(genesis)))
+    challenge = bytes.fromhex(challenge_hex)
+    pending: List[Tuple[Any, bytes]] = []
     total = 0
     for entry in proposal.get("signatures", []):
         total += 1
-        guardian_id = entry.get("guardian_id")
-        pubkey_b64 = entry.get("public_key")
-        signature_b64 = entry.get("signature")
-        if guardian_id not in guardians or guardians[guardian_id] != pubkey_b64:
+        pubkey_b64, verify_key = keys.get(entry.get("guardian_id"), (None, None))
+        if verify_key is None or pubkey_b64 != entry.get("public_key"):
             continue
         try:
-            import base64
+            pending.append((verify_key, base64.b64decode(entry.get("signature"))))
+        except (TypeError, ValueError):
+            continue
+
+    if pool is not None and workers > 1 and len(pending) >= PARALLEL_MIN_SIGNATURES:
+        size = -(-len(pending) // workers)
+        chunks = [
+            [(bytes(vk), sig) for vk, sig in pending[i:i + size]]
+            for i in range(0, len(pending), size)
+        ]
+        ok = sum(pool.map(_verify_chunk, [challenge] * len(chunks), chunks))
+        return (ok, total, True)
 
-            pk_bytes = base64.b64decode(pubkey_b64)
-            sig_bytes = base64.b64decode(signature_b64)
-            VerifyKey(pk_bytes).verify(bytes.fromhex(challenge_hex), sig_bytes)
+    ok = 0
+    for verify_key, sig_bytes in pending:
+        try:
+            verify_key.verify(challenge, sig_bytes)
             ok += 1
         except (ValueError, BadSignatureError):
             continue
     return (ok, total, True)
 
 
-def main(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="Verify protocol evolution proposals against genesis.")
-    parser.add_argument("--proposal", required=True, type=Path, help="Path to the proposal JSON")
-    parser.add_argument("--genesis", required=True, type=Path, help="Path to the base genesis JSON")
-    args = parser.parse_args(argv)
-
-    proposal = json.loads(args.proposal.read_text(encoding="utf-8"))
-    genesis = json.loads(args.genesis.read_text(encoding="utf-8"))
-
+def verify_proposal(
+    proposal: Dict[str, Any],
+    genesis: Dict[str, Any],
+    genesis_hash: str,
+    pool: Optional[Executor] = None,
+    workers: int = 1,
+    canonical: Optional[CanonicalCache] = None,
+) -> Dict[str, Any]:
     core = core_of_proposal(proposal)
     challenge_hex = sha256_hex(jcs_like(core))
 
-    genesis_hash = file_hash(args.genesis)
     genesis_version = genesis.get("version", "1.0.0")
     base_ok = base_lock_ok(proposal, genesis_hash, genesis_version)
 
@@ -159,15 +351,17 @@ def main(argv: list[str] | None = None) -> int:
 
     try:
         new_genesis = dry_run_apply(genesis, change_set)
-        new_genesis_hash = sha256_hex(jcs_like(new_genesis))
+        new_genesis_hash = canonical.hash(new_genesis) if canonical else sha256_hex(jcs_like(new_genesis))
         apply_ok = True
     except Exception:
         new_genesis_hash = None
         apply_ok = False
 
-    signatures_ok, signatures_total, sigs_supported = tally_signatures(proposal, genesis, challenge_hex)
+    signatures_ok, signatures_total, sigs_supported = tally_signatures(
+        proposal, genesis, challenge_hex, genesis_hash=genesis_hash, pool=pool, workers=workers
+    )
 
-    result = {
+    return {
         "challenge_hex": challenge_hex,
         "base_genesis_hash": genesis_hash,
         "base_genesis_version": genesis_version,
@@ -180,11 +374,54 @@ def main(argv: list[str] | None = None) -> int:
         "signature_verification_supported": sigs_supported,
     }
 
-    print(json.dumps(result, ensure_ascii=False, indent=2))
 
-    if base_ok and paths_valid and apply_ok:
-        return 0
-    return 2
+def passed(result: Dict[str, Any]) -> bool:
+    return bool(result["base_lock_ok"] and result["paths_ok"] and result["apply_ok"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify protocol evolution proposals against genesis.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--proposal", type=Path, help="Path to the proposal JSON")
+    target.add_argument("--many", type=Path, metavar="DIR", help="Verify every *.json proposal in DIR")
+    parser.add_argument("--genesis", required=True, type=Path, help="Path to the base genesis JSON")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes for verifying large signature sets (default: CPU count)",
+    )
+    args = parser.parse_args(argv)
+
+    genesis_bytes = args.genesis.read_bytes()
+    genesis = json.loads(genesis_bytes)
+    genesis_hash = sha256_hex(genesis_bytes)
+    canonical = CanonicalCache(genesis)
+
+    paths = sorted(args.many.glob("*.json")) if args.many else [args.proposal]
+    pool = ProcessPoolExecutor(args.workers) if args.workers > 1 and VerifyKey is not None else None
+    try:
+        results = {
+            str(path): verify_proposal(
+                json.loads(path.read_text(encoding="utf-8")),
+                genesis,
+                genesis_hash,
+                pool=pool,
+                workers=args.workers,
+                canonical=canonical,
+            )
+            for path in paths
+        }
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if args.many:
+        print(json.dumps({"genesis": str(args.genesis), "proposals": results}, ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(results[str(args.proposal)], ensure_ascii=False, indent=2))
+
+    return 0 if all(passed(result) for result in results.values()) else 2
 
 
 if __name__ == "__main__":